@@ -1,19 +1,58 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.modules.models import Play, PlayCriticalityResponse
 from app.modules.scoring import (
-    calculate_play_criticality_score, 
     categorize_criticality, 
     is_key_play
 )
-from app.modules.key_moment_detector import process_streams_for_key_moments
+from app.modules.play_score_cache import score_play_cached
+from app.modules.batch_scoring import score_plays_batch
+from app.modules.key_moment_detector import DEFAULT_JOIN_MAX_WAIT, process_streams_for_key_moments
+from app.modules import audio_sentiment
+from app.modules.game_sessions import get_session_manager
+from app.modules.moment_broadcast import get_broadcast_hub
+from app.modules.stream import UnknownStreamServerError, stream_server_for
+from app.modules.inference_pool import get_inference_pool, is_inference_ready, shutdown_inference_pool
 import json
 import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Load the audio model and run a dummy inference at startup
+WARMUP_AUDIO_MODEL = os.getenv("WARMUP_AUDIO_MODEL", "false").lower() in ("1", "true", "yes")
+
+
+async def warmup_audio_model():
+    """Warm up the audio model on the inference pool so startup isn't blocked."""
+    try:
+        await get_inference_pool().warmup()
+        logger.info(f"Audio model {audio_sentiment.MODEL_ID} is warm")
+    except Exception as e:
+        logger.error(f"Audio model warmup failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_task = None
+    if WARMUP_AUDIO_MODEL:
+        warmup_task = asyncio.create_task(warmup_audio_model())
+    get_session_manager().resume_all()
+    yield
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+    await get_session_manager().shutdown()
+    await get_broadcast_hub().shutdown()
+    shutdown_inference_pool(wait=False)
+
 
 app = FastAPI(
     title="HypeZone's API",
-    description="Backend Documentation"
+    description="Backend Documentation",
+    lifespan=lifespan
 )
 
 
@@ -36,10 +75,26 @@ def read_root():
     return {"message": f"Welcome to HypeZone API!"}
 
 
+@app.get("/ready", summary="Readiness Probe")
+def ready():
+    """
+    Report whether the audio model is loaded and has run an inference.
+    Returns 503 until the model is hot.
+    """
+    status = {
+        "ready": is_inference_ready(),
+        "model": audio_sentiment.MODEL_ID,
+        "backend": audio_sentiment.AUDIO_BACKEND,
+        "model_loaded": audio_sentiment.is_model_loaded(),
+        "warmup_enabled": WARMUP_AUDIO_MODEL,
+    }
+    return JSONResponse(content=status, status_code=200 if status["ready"] else 503)
+
+
 
 @app.post("/score-play", response_model=PlayCriticalityResponse)
 def score_play(play: Play):
-    score, play_category, breakdown = calculate_play_criticality_score(play)
+    score, play_category, breakdown = score_play_cached(play)
     category = categorize_criticality(score)
     key_play = is_key_play(score, category)
     
@@ -59,101 +114,52 @@ async def get_key_moments_realtime(
     audio_weight: float = 0.3,
     play_weight: float = 0.7,
     key_moment_threshold: float = 50.0,
-    context_segments: int = 2
+    context_segments: int = 2,
+    eager_scoring: bool = False,
+    join_max_wait: float = DEFAULT_JOIN_MAX_WAIT,
+    game_id: str | None = None
 ):
     """
     Stream key moments in real-time as they are detected.
+    
+    With `eager_scoring`, audio segments are scored in the background as they
+    arrive instead of when a play needs them. Each play waits for the audio
+    around it for as long as that audio takes to stream at `speed`, plus
+    `join_max_wait` seconds. `game_id`
+    picks the game's stream server from STREAM_SERVERS (400 if it isn't
+    configured); without it the stream comes from STREAM_API_URI.
+    
+    Clients asking for the same game and parameters share one detection run:
+    late joiners first get the key moments found so far, and the run stops
+    when the last client disconnects.
     """
+    try:
+        base_url = stream_server_for(game_id)
+    except UnknownStreamServerError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    key = (game_id, speed, audio_weight, play_weight, key_moment_threshold,
+           context_segments, eager_scoring, join_max_wait)
+    
+    def start_detection(key_moment_callback):
+        return process_streams_for_key_moments(
+            speed=speed,
+            audio_weight=audio_weight,
+            play_weight=play_weight,
+            key_moment_threshold=key_moment_threshold,
+            context_segments=context_segments,
+            eager_scoring=eager_scoring,
+            join_max_wait=join_max_wait,
+            key_moment_callback=key_moment_callback,
+            base_url=base_url
+        )
+    
     async def stream_key_moments():
-        import asyncio
-        import queue
-        
-        # Create a queue to receive real-time key moments
-        moment_queue = asyncio.Queue()
-        
-        def key_moment_callback(moment):
-            """Called immediately when a key moment is detected"""
-            asyncio.create_task(moment_queue.put(moment))
-        
         yield f"data: {json.dumps({'status': 'connected', 'message': 'Starting key moment detection...'})}\n\n"
         
-        # Start the detection process with real-time callback
-        detection_task = asyncio.create_task(
-            process_streams_for_key_moments(
-                speed=speed,
-                audio_weight=audio_weight,
-                play_weight=play_weight,
-                key_moment_threshold=key_moment_threshold,
-                context_segments=context_segments,
-                key_moment_callback=key_moment_callback
-            )
-        )
-        
-        key_moment_count = 0
-        
-        try:
-            while not detection_task.done():
-                try:
-                    # Wait for either a key moment or timeout
-                    moment = await asyncio.wait_for(moment_queue.get(), timeout=1.0)
-                    
-                    # Stream this key moment immediately!
-                    key_moment_count += 1
-                    moment_data = {
-                        'timestamp': moment.timestamp,
-                        'combined_score': round(moment.combined_score, 2),
-                        'play_score': round(moment.play_score, 2),
-                        'audio_score': round(moment.audio_score, 2),
-                        'play_category': moment.play_category,
-                        'description': moment.play_data.get('Description', 'N/A'),
-                        'play_type': moment.play_data.get('Type', 'N/A'),
-                        'quarter': moment.play_data.get('quarter'),
-                        'down': moment.play_data.get('Down'),
-                        'distance': moment.play_data.get('Distance'),
-                        'yard_line': moment.play_data.get('YardLine'),
-                        'detected_at': key_moment_count
-                    }
-                    yield f"data: {json.dumps(moment_data)}\n\n"
-                    
-                except asyncio.TimeoutError:
-                    # No key moment in the last second, continue waiting
-                    pass
-            
-            # Process completed - get final results
-            all_moments = await detection_task
-            
-            # Send any remaining key moments that might have been missed
-            while not moment_queue.empty():
-                moment = await moment_queue.get()
-                key_moment_count += 1
-                moment_data = {
-                    'timestamp': moment.timestamp,
-                    'combined_score': round(moment.combined_score, 2),
-                    'play_score': round(moment.play_score, 2),
-                    'audio_score': round(moment.audio_score, 2),
-                    'play_category': moment.play_category,
-                    'description': moment.play_data.get('Description', 'N/A'),
-                    'play_type': moment.play_data.get('Type', 'N/A'),
-                    'quarter': moment.play_data.get('quarter'),
-                    'down': moment.play_data.get('Down'),
-                    'distance': moment.play_data.get('Distance'),
-                    'yard_line': moment.play_data.get('YardLine'),
-                    'detected_at': key_moment_count
-                }
-                yield f"data: {json.dumps(moment_data)}\n\n"
-            
-            # Send completion message
-            completion_data = {
-                'status': 'completed',
-                'total_moments_analyzed': len(all_moments),
-                'key_moments_detected': key_moment_count,
-                'message': f'Analysis complete! Streamed {key_moment_count} key moments in real-time.'
-            }
-            yield f"data: {json.dumps(completion_data)}\n\n"
-            
-        except Exception as e:
-            error_data = {'status': 'error', 'message': str(e)}
-            yield f"data: {json.dumps(error_data)}\n\n"
+        async with get_broadcast_hub().subscribe(key, start_detection) as events:
+            # Shared events are already SSE-formatted; None ends the stream
+            while (event := await events.get()) is not None:
+                yield event
     
     return StreamingResponse(
         stream_key_moments(),
@@ -166,23 +172,114 @@ async def get_key_moments_realtime(
     )
 
 
+@app.post("/games/{game_id}/start", summary="Start a Game Session")
+async def start_game(
+    game_id: str,
+    base_url: str | None = None,
+    speed: float = 1.0,
+    audio_weight: float = 0.3,
+    play_weight: float = 0.7,
+    key_moment_threshold: float = 50.0,
+    context_segments: int = 2,
+    eager_scoring: bool = False,
+    join_max_wait: float = DEFAULT_JOIN_MAX_WAIT,
+    resume: bool = True
+):
+    """
+    Start key moment detection for a game in the background.
+    
+    The game's stream server comes from STREAM_SERVERS (else STREAM_API_URI);
+    a `base_url` must be one of the configured servers (400 otherwise). All
+    games share one loaded audio model and inference pool. With `resume`, a
+    game that has an unfinished checkpoint continues from it.
+    """
+    try:
+        session = get_session_manager().start_game(
+            game_id,
+            base_url=base_url,
+            speed=speed,
+            audio_weight=audio_weight,
+            play_weight=play_weight,
+            key_moment_threshold=key_moment_threshold,
+            context_segments=context_segments,
+            eager_scoring=eager_scoring,
+            join_max_wait=join_max_wait,
+            resume=resume
+        )
+    except UnknownStreamServerError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return session.summary()
+
+
+@app.get("/games", summary="List Game Sessions")
+def list_games():
+    return {"games": [session.summary() for session in get_session_manager().list_sessions()]}
+
+
+@app.get("/games/{game_id}", summary="Game Session Status")
+def get_game(game_id: str):
+    """Status of a game plus the key moments detected so far."""
+    session = get_session_manager().get(game_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown game {game_id}")
+    return {
+        **session.summary(),
+        "moments": [m.to_dict() for m in session.moments.key_moments],
+    }
+
+
+@app.get("/games/{game_id}/top", summary="Live Leaderboard")
+def get_game_leaderboard(game_id: str, n: int = Query(10, ge=1)):
+    """
+    Current top `n` moments for a game, best first. Served from a leaderboard
+    kept up to date as plays are scored, so polling it is cheap. The
+    leaderboard only holds KEY_MOMENT_LEADERBOARD_SIZE moments, so a larger
+    `n` returns that many.
+    """
+    session = get_session_manager().get(game_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown game {game_id}")
+    leaderboard = session.moments.leaderboard
+    return {
+        "game_id": game_id,
+        "status": session.status,
+        "plays_processed": session.moments.total_count,
+        "top": [
+            {"rank": rank, **moment.to_dict()}
+            for rank, moment in enumerate(leaderboard.top(min(n, leaderboard.size)), 1)
+        ],
+    }
+
+
+@app.delete("/games/{game_id}", summary="Stop a Game Session")
+async def stop_game(game_id: str):
+    """Stop a game (if running) and forget it."""
+    manager = get_session_manager()
+    session = await manager.stop_game(game_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Unknown game {game_id}")
+    manager.remove_game(game_id)
+    return session.summary()
+
+
 @app.post("/key-moments")
 def get_key_moments(plays: list[Play]):
     """
     Given a list of plays, return the key moments based on criticality scores.
     """
-    key_moments = []
-    for play in plays:
-        score, play_category, _ = calculate_play_criticality_score(play)
-        category = categorize_criticality(score)
-        if is_key_play(score, category):
-            key_moments.append({
-                "play": play,
-                "score": score,
-                "category": category,
-                "play_category": play_category
-            })
-    
+    scored = score_plays_batch(plays)
+    key_moments = [
+        {
+            "play": plays[i],
+            "score": float(row.score),
+            "category": row.category,
+            "play_category": row.play_category
+        }
+        for i, row in enumerate(scored.itertuples(index=False)) if row.is_key_play
+    ]
+
     return {"key_moments": key_moments}
 
 
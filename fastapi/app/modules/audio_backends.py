@@ -0,0 +1,198 @@
+"""
+Emotion Model Backends
+
+Pluggable runtimes for the audio emotion model, selected with AUDIO_BACKEND:
+
+- `torch`: fp32 PyTorch (reference)
+- `torch-int8`: PyTorch with dynamic int8 quantization of Linear layers
+- `onnx`: ONNX Runtime on CPU, exporting the model to ONNX once
+- `onnx-int8`: ONNX Runtime with a dynamically quantized int8 export
+
+All backends share the HuggingFace feature extractor and return the same
+{label: probability} dicts, so they are interchangeable behind
+`audio_sentiment.predict_emotions`.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+AUDIO_BACKEND = os.getenv("AUDIO_BACKEND", "torch")
+# Where ONNX exports are written and reused across restarts
+AUDIO_ONNX_DIR = os.getenv(
+    "AUDIO_ONNX_DIR",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "onnx")
+)
+
+
+def _hf_login():
+    """Log into Hugging Face if a token is configured."""
+    from huggingface_hub import login
+
+    # Only login if token is available
+    hf_token = os.getenv("HUGGINGFACE_API_KEY")
+    if hf_token:
+        login(token=hf_token)
+    else:
+        print("Warning: HUGGINGFACE_API_KEY not found in environment variables")
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class EmotionBackend:
+    """Base backend: feature extraction, label mapping and softmax."""
+
+    name = "base"
+
+    def __init__(self, model_id: str, sample_rate: int):
+        from transformers import AutoConfig, AutoFeatureExtractor
+
+        _hf_login()
+        self.model_id = model_id
+        self.sample_rate = sample_rate
+        self.feature_extractor = AutoFeatureExtractor.from_pretrained(model_id)
+        self.id2label = AutoConfig.from_pretrained(model_id).id2label
+
+    def extract(self, audios, return_tensors: str) -> dict:
+        return self.feature_extractor(
+            audios,
+            sampling_rate=self.sample_rate,
+            padding=True,
+            return_tensors=return_tensors
+        )
+
+    def logits(self, audios) -> np.ndarray:
+        raise NotImplementedError
+
+    def predict(self, audios) -> list[dict]:
+        """Emotion probabilities for a batch of 16k mono clips."""
+        probs = _softmax(self.logits(audios).astype(np.float32))
+        return [
+            {self.id2label[i]: float(row[i]) for i in range(len(row))}
+            for row in probs
+        ]
+
+
+class TorchBackend(EmotionBackend):
+    """fp32 PyTorch, optionally with dynamic int8 quantization."""
+
+    name = "torch"
+
+    def __init__(self, model_id: str, sample_rate: int, quantize: bool = False):
+        super().__init__(model_id, sample_rate)
+        import torch
+        from transformers import AutoModelForAudioClassification
+
+        model = AutoModelForAudioClassification.from_pretrained(model_id).eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.name = "torch-int8"
+        self.model = model
+
+    def logits(self, audios) -> np.ndarray:
+        import torch
+
+        inputs = self.extract(audios, return_tensors="pt")
+        with torch.inference_mode():
+            return self.model(**inputs).logits.float().numpy()
+
+
+class OnnxBackend(EmotionBackend):
+    """ONNX Runtime on CPU. Exports (and optionally quantizes) the model once."""
+
+    name = "onnx"
+
+    def __init__(self, model_id: str, sample_rate: int, quantize: bool = False):
+        super().__init__(model_id, sample_rate)
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError(
+                "AUDIO_BACKEND=onnx requires onnxruntime (poetry install -E onnx)"
+            ) from e
+
+        path = self.export(model_id, quantize=quantize)
+        if quantize:
+            self.name = "onnx-int8"
+
+        options = ort.SessionOptions()
+        torch_threads = int(os.getenv("AUDIO_TORCH_THREADS", "0"))
+        if torch_threads > 0:
+            options.intra_op_num_threads = torch_threads
+        self.session = ort.InferenceSession(
+            str(path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+    @staticmethod
+    def export(model_id: str, quantize: bool = False) -> Path:
+        """Export the model to ONNX (and int8) under AUDIO_ONNX_DIR if missing."""
+        out_dir = Path(AUDIO_ONNX_DIR)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        fp32_path = out_dir / f"{model_id.replace('/', '--')}.onnx"
+        int8_path = fp32_path.with_suffix(".int8.onnx")
+
+        if not fp32_path.exists():
+            import torch
+            from transformers import AutoModelForAudioClassification
+
+            logger.info(f"Exporting {model_id} to {fp32_path}")
+            model = AutoModelForAudioClassification.from_pretrained(model_id).eval()
+            dummy = torch.zeros(1, 16000)
+            torch.onnx.export(
+                model,
+                (dummy,),
+                str(fp32_path),
+                input_names=["input_values"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_values": {0: "batch", 1: "samples"},
+                    "logits": {0: "batch"},
+                },
+                opset_version=17,
+                dynamo=False
+            )
+
+        if not quantize:
+            return fp32_path
+
+        if not int8_path.exists():
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            logger.info(f"Quantizing {fp32_path} to {int8_path}")
+            quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+        return int8_path
+
+    def logits(self, audios) -> np.ndarray:
+        inputs = self.extract(audios, return_tensors="np")
+        input_values = inputs["input_values"].astype(np.float32)
+        return self.session.run(["logits"], {"input_values": input_values})[0]
+
+
+BACKENDS = {
+    "torch": lambda model_id, sr: TorchBackend(model_id, sr),
+    "torch-int8": lambda model_id, sr: TorchBackend(model_id, sr, quantize=True),
+    "onnx": lambda model_id, sr: OnnxBackend(model_id, sr),
+    "onnx-int8": lambda model_id, sr: OnnxBackend(model_id, sr, quantize=True),
+}
+
+
+def create_backend(name: str, model_id: str, sample_rate: int) -> EmotionBackend:
+    """Build the named backend for `model_id`."""
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown audio backend: {name!r} (expected one of {', '.join(BACKENDS)})"
+        )
+    logger.info(f"Loading audio emotion model {model_id} with {name} backend")
+    return factory(model_id, sample_rate)
@@ -0,0 +1,100 @@
+"""
+Timestamp-Indexed Audio Ring Buffer
+
+Fixed-capacity ring of audio segments with a parallel NumPy array of their
+timestamps. Appends overwrite the oldest segment once full; nearest-timestamp
+lookup is a binary search over the (rotated) sorted timestamps and neighbour
+access is plain index arithmetic, so cost stays flat as capacity grows.
+"""
+
+from typing import Generic, Iterator, List, Optional, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class AudioRingBuffer(Generic[T]):
+    """Ring buffer of items ordered by non-decreasing timestamp."""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._items: List[Optional[T]] = [None] * capacity
+        self._start = 0  # physical slot of the oldest item
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def _slot(self, i: int) -> int:
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("ring buffer index out of range")
+        return (self._start + i) % self.capacity
+
+    def __getitem__(self, i: int) -> T:
+        return self._items[self._slot(i)]
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(self._size):
+            yield self._items[(self._start + i) % self.capacity]
+
+    def timestamp(self, i: int) -> float:
+        return float(self._timestamps[self._slot(i)])
+
+    def append(self, item: T, timestamp: float):
+        """Add the newest item, evicting the oldest when full."""
+        if self._size and timestamp < self._timestamps[self._slot(-1)]:
+            raise ValueError(
+                f"Timestamps must be non-decreasing: {timestamp} < {self.timestamp(-1)}"
+            )
+
+        if self._size < self.capacity:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._items[slot] = item
+        self._timestamps[slot] = timestamp
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._size = 0
+
+    def bisect_left(self, timestamp: float) -> int:
+        """Logical index of the first item with timestamp >= `timestamp`."""
+        head_len = min(self._size, self.capacity - self._start)
+        head = self._timestamps[self._start:self._start + head_len]
+        if head_len == self._size or timestamp <= head[-1]:
+            return int(np.searchsorted(head, timestamp))
+        tail = self._timestamps[:self._size - head_len]
+        return head_len + int(np.searchsorted(tail, timestamp))
+
+    def nearest_index(self, timestamp: float) -> Optional[int]:
+        """Logical index of the item closest in time (earlier wins ties)."""
+        if not self._size:
+            return None
+        i = self.bisect_left(timestamp)
+        if i == 0:
+            return 0
+        if i == self._size:
+            return i - 1
+        before = timestamp - self.timestamp(i - 1)
+        after = self.timestamp(i) - timestamp
+        return i - 1 if before <= after else i
+
+    def window(self, center: int, radius: int) -> List[T]:
+        """Items within `radius` positions of logical index `center`."""
+        start = max(0, center - radius)
+        end = min(self._size - 1, center + radius)
+        return [self._items[(self._start + i) % self.capacity] for i in range(start, end + 1)]
@@ -0,0 +1,193 @@
+"""
+Audio Score Cache
+
+Content-addressed cache for audio clip scores. Clips are keyed by a hash of
+their bytes plus the model id, so replaying a game never re-runs inference on
+audio that has already been scored.
+
+Two tiers:
+1. In-memory LRU for the hot working set
+2. On-disk SQLite that survives restarts, evicting least recently used rows
+   once it grows past a size limit
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+AUDIO_CACHE_ENABLED = os.getenv("AUDIO_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Empty path keeps the cache in memory only
+AUDIO_CACHE_PATH = os.getenv(
+    "AUDIO_CACHE_PATH",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "audio_scores.sqlite3")
+)
+AUDIO_CACHE_MEMORY_ITEMS = int(os.getenv("AUDIO_CACHE_MEMORY_ITEMS", "4096"))
+AUDIO_CACHE_MAX_MB = float(os.getenv("AUDIO_CACHE_MAX_MB", "256"))
+
+
+def clip_key(clip, sr=None, model_id: str = "") -> str:
+    """
+    Stable content hash for a clip (WAV bytes, file path or audio array).
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(model_id.encode())
+    h.update(b"\0")
+
+    if isinstance(clip, (bytes, bytearray, memoryview)):
+        h.update(b"wav:")
+        h.update(clip)
+    elif isinstance(clip, str):
+        h.update(b"file:")
+        with open(clip, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    else:
+        audio = np.ascontiguousarray(clip)
+        h.update(f"array:{audio.dtype.str}:{audio.shape}:{sr}:".encode())
+        h.update(audio.data)
+
+    return h.hexdigest()
+
+
+class AudioScoreCache:
+    """Two-tier (memory LRU + SQLite) cache of clip score dicts."""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = AUDIO_CACHE_PATH,
+        memory_items: int = AUDIO_CACHE_MEMORY_ITEMS,
+        max_disk_mb: float = AUDIO_CACHE_MAX_MB
+    ):
+        self.memory = LRUCache(memory_items)
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self.disk_hits = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._disk_bytes = 0
+
+        if db_path:
+            try:
+                self._open(db_path)
+            except sqlite3.Error as e:
+                logger.error(f"Audio cache disabled on disk ({db_path}): {e}")
+                self._conn = None
+
+    def _open(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS clip_scores (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_clip_scores_access ON clip_scores(last_access)"
+        )
+        self._conn.commit()
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM clip_scores").fetchone()
+        self._disk_bytes = row[0]
+        logger.info(f"Audio cache opened: {db_path} ({self._disk_bytes / 1024:.1f} KB)")
+
+    def get(self, key: str) -> Optional[dict]:
+        result = self.memory.get(key)
+        if result is not None or self._conn is None:
+            return result
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM clip_scores WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE clip_scores SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        self.disk_hits += 1
+        result = json.loads(row[0])
+        self.memory.put(key, result)
+        return result
+
+    def put(self, key: str, result: dict):
+        self.memory.put(key, result)
+        if self._conn is None:
+            return
+
+        payload = json.dumps(result, separators=(",", ":"))
+        size = len(key) + len(payload)
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM clip_scores WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO clip_scores (key, result, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, size, time.time())
+            )
+            self._disk_bytes += size - (old[0] if old else 0)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used rows until the table is under 90% of its budget."""
+        target = int(self.max_disk_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM clip_scores ORDER BY last_access"
+        )
+        doomed = []
+        for key, size in rows:
+            if self._disk_bytes <= target:
+                break
+            doomed.append((key,))
+            self._disk_bytes -= size
+        self._conn.executemany("DELETE FROM clip_scores WHERE key = ?", doomed)
+        logger.debug(f"Audio cache evicted {len(doomed)} entries")
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "disk_bytes": self._disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes if self._conn else 0,
+        }
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+_cache: Optional[AudioScoreCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_audio_cache() -> Optional[AudioScoreCache]:
+    """Return the process-wide score cache, or None if caching is disabled."""
+    global _cache
+    if not AUDIO_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AudioScoreCache()
+    return _cache
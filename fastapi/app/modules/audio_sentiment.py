@@ -1,79 +1,88 @@
+"""
+Audio sentiment scoring with a HuggingFace emotion recognizer.
+
+The model (and torch/transformers/librosa) is loaded lazily on first use via
+`get_backend()`, so importing this module is cheap for workers that never
+score audio. Call `warmup()` to load it ahead of time. The runtime is chosen
+with AUDIO_BACKEND (see `audio_backends.py`).
+"""
 import os
-from glob import glob
+import threading
 
 import numpy as np
-import pandas as pd
-from tqdm import tqdm
-import librosa
 from dotenv import load_dotenv
 
+from .audio_backends import AUDIO_BACKEND, create_backend
+from .audio_cache import clip_key, get_audio_cache
+from .audio_features import (
+    AUDIO_AROUSAL_GATE,
+    AUDIO_CASCADE_ENABLED,
+    compute_features,
+    estimated_emotions,
+)
+from .wav_decode import decode_wav, resample
+
 # Load environment variables
 load_dotenv()
 
-from huggingface_hub import login
+# Pre-trained emotion recognizer
+MODEL_ID = os.getenv("AUDIO_EMOTION_MODEL", "superb/hubert-base-superb-er")
 
-# Only login if token is available
-hf_token = os.getenv("HUGGINGFACE_API_KEY")
-if hf_token:
-    login(token=hf_token)
-else:
-    print("Warning: HUGGINGFACE_API_KEY not found in environment variables")
+SAMPLE_RATE = 16000
 
-from transformers import pipeline
-import torch
+# Upper bound on clips stacked into a single forward pass
+MAX_BATCH_SIZE = int(os.getenv("AUDIO_MAX_BATCH_SIZE", "8"))
 
-# Check if running on Mac with MPS (Metal Performance Shaders)
-device = "mps" if torch.backends.mps.is_available() else "cpu"
+# Cache entries are only valid for the model and runtime that produced them
+CACHE_MODEL_KEY = f"{MODEL_ID}:{AUDIO_BACKEND}"
 
-emotion_pipe = pipeline(
-    "audio-classification",
-    model="superb/hubert-base-superb-er"  # pre-trained emotion recognizer
-)
+_backend = None
+_backend_lock = threading.Lock()
+_model_ready = False
 
-SAMPLE_RATE = 16000
 
-def score_clip(path_or_audio, sr=None):
+def get_backend():
+    """Return the shared emotion model backend, loading it on first call."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(AUDIO_BACKEND, MODEL_ID, SAMPLE_RATE)
+    return _backend
+
+
+def is_model_loaded() -> bool:
+    """True once the emotion model backend has been built."""
+    return _backend is not None
+
+
+def is_model_ready() -> bool:
+    """True once the model has completed at least one inference."""
+    return _model_ready
+
+
+def warmup():
+    """Load the model and run one dummy inference so the first real clip is fast."""
+    predict_emotions([np.zeros(SAMPLE_RATE, dtype=np.float32)])
+
+
+def load_audio(path_or_audio, sr=None):
     """
-    Score audio clip from either file path or raw audio array.
-    
-    Args:
-        path_or_audio: Either a file path (str) or audio array (numpy array or bytes)
-        sr: Sample rate (required if passing raw audio)
+    Load audio at 16k mono from a file path, WAV bytes or a raw audio array.
     
     Returns:
-        Dict with emotion scores and energy
+        Tuple of (audio array, path label)
     """
-    # 1) Load audio at 16k mono
     if isinstance(path_or_audio, str):
+        import librosa
+        
         # Load from file
         audio, sr = librosa.load(path_or_audio, sr=SAMPLE_RATE, mono=True)
         path = path_or_audio
-    elif isinstance(path_or_audio, (bytes, bytearray)):
-        # Convert bytes to numpy array (assuming WAV format)
-        import io
-        import wave
-        
-        # Read WAV from bytes
-        with wave.open(io.BytesIO(bytes(path_or_audio)), 'rb') as wav_file:
-            sr = wav_file.getframerate()
-            n_frames = wav_file.getnframes()
-            audio_bytes = wav_file.readframes(n_frames)
-            
-            # Convert to numpy array
-            if wav_file.getsampwidth() == 2:  # 16-bit
-                audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-            elif wav_file.getsampwidth() == 4:  # 32-bit
-                audio = np.frombuffer(audio_bytes, dtype=np.int32).astype(np.float32) / 2147483648.0
-            else:
-                audio = np.frombuffer(audio_bytes, dtype=np.uint8).astype(np.float32) / 128.0 - 1.0
-            
-            # Convert stereo to mono if needed
-            if wav_file.getnchannels() == 2:
-                audio = audio.reshape(-1, 2).mean(axis=1)
-        
-        # Resample if needed
-        if sr != SAMPLE_RATE:
-            audio = librosa.resample(audio, orig_sr=sr, target_sr=SAMPLE_RATE)
+    elif isinstance(path_or_audio, (bytes, bytearray, memoryview)):
+        # Parse the WAV header in place and convert/downmix in one pass
+        audio, sr = decode_wav(path_or_audio)
+        audio = resample(audio, sr, SAMPLE_RATE)
         path = "stream_audio"
     else:
         # Assume numpy array
@@ -82,15 +91,32 @@ def score_clip(path_or_audio, sr=None):
             audio = np.mean(audio, axis=1)  # Convert to mono
         # Resample if needed
         if sr and sr != SAMPLE_RATE:
-            audio = librosa.resample(audio, orig_sr=sr, target_sr=SAMPLE_RATE)
+            audio = resample(audio, sr, SAMPLE_RATE)
         path = "raw_audio"
     
-    inp = {"array": audio, "sampling_rate": SAMPLE_RATE}
+    return audio, path
+
+
+def predict_emotions(audios):
+    """
+    Run the emotion model over a batch of 16k mono clips in one forward pass.
+    
+    Clips of different lengths would be zero-padded without an attention
+    mask, and the model would pool over the padding, so callers batch only
+    clips of equal length (see `_score_uncached`).
+    
+    Returns:
+        List of {label: probability} dicts, one per clip
+    """
+    global _model_ready
+    
+    preds = get_backend().predict(audios)
+    _model_ready = True
+    return preds
 
-    # 2) Audio → emotion
-    emo_preds = emotion_pipe(inp, top_k=None)
-    emo_scores = {p["label"]: p["score"] for p in emo_preds}
 
+def summarize_clip(audio, path, emo_scores, estimated=False):
+    """Turn raw emotion probabilities for a clip into the score dict."""
     happy = emo_scores.get("hap", 0.0)
     angry = emo_scores.get("ang", 0.0)
     neutral = emo_scores.get("neu", 0.0)
@@ -99,7 +125,7 @@ def score_clip(path_or_audio, sr=None):
     excited_audio = happy + angry   # high-arousal emotions
     calm_audio = neutral + sad
 
-    # 3) Loudness (RMS energy)
+    # Loudness (RMS energy)
     energy = float(np.sqrt(np.mean(audio**2)) + 1e-9)
 
     return {
@@ -112,4 +138,113 @@ def score_clip(path_or_audio, sr=None):
         "excited_audio": excited_audio,
         "calm_audio": calm_audio,
         "energy": energy,
+        "estimated": estimated,  # True if the cascade skipped the model
     }
+
+
+def _score_uncached(clips, sr, max_batch_size, arousal_gate=None):
+    """
+    Decode clips and run them through the model in batches.
+    
+    With an `arousal_gate`, clips whose cheap-feature arousal falls below it
+    get an estimated score instead of a forward pass.
+    """
+    # 1) Load audio at 16k mono
+    loaded = [load_audio(clip, sr) for clip in clips]
+    emo_scores = [None] * len(loaded)
+    estimated = [False] * len(loaded)
+    
+    # 2) Cascade: gate low-arousal clips on fast NumPy features
+    if arousal_gate is not None:
+        for i, (audio, _) in enumerate(loaded):
+            features = compute_features(audio, SAMPLE_RATE)
+            if features.arousal < arousal_gate:
+                emo_scores[i] = estimated_emotions(features)
+                estimated[i] = True
+    
+    # 3) Audio → emotion, one forward pass per batch of equal-length clips, so
+    #    nothing is padded and each clip scores exactly as it would alone
+    by_length = {}
+    for i, scores in enumerate(emo_scores):
+        if scores is None:
+            by_length.setdefault(len(loaded[i][0]), []).append(i)
+    
+    for group in by_length.values():
+        for start in range(0, len(group), max_batch_size):
+            batch = group[start:start + max_batch_size]
+            preds = predict_emotions([loaded[i][0] for i in batch])
+            for i, pred in zip(batch, preds):
+                emo_scores[i] = pred
+    
+    # 4) Emotion + loudness summary per clip
+    return [
+        summarize_clip(audio, path, scores, gated)
+        for (audio, path), scores, gated in zip(loaded, emo_scores, estimated)
+    ]
+
+
+def score_clips(clips, sr=None, max_batch_size=None, use_cache=True, cascade=None):
+    """
+    Score several audio clips, batching them through the emotion model.
+    
+    Clips of the same length are stacked into batches of at most
+    `max_batch_size` (stream segments are mostly equal length); clips of
+    other lengths get their own forward passes, so no clip is padded and the
+    per-clip dicts match `score_clip`. Clips already in the score cache
+    (keyed by content hash and model id) skip inference entirely, and in
+    cascade mode clips below AUDIO_AROUSAL_GATE get a cheap estimated score
+    instead.
+    
+    Args:
+        clips: List of file paths, WAV bytes or audio arrays
+        sr: Sample rate (required if passing raw audio arrays)
+        max_batch_size: Clips per forward pass (defaults to AUDIO_MAX_BATCH_SIZE)
+        use_cache: Look up and store results in the audio score cache
+        cascade: Gate low-arousal clips before the model (defaults to AUDIO_CASCADE_ENABLED)
+    
+    Returns:
+        List of dicts with emotion scores and energy, in the same order as `clips`
+    """
+    if max_batch_size is None:
+        max_batch_size = MAX_BATCH_SIZE
+    max_batch_size = max(1, max_batch_size)
+    if cascade is None:
+        cascade = AUDIO_CASCADE_ENABLED
+    arousal_gate = AUDIO_AROUSAL_GATE if cascade else None
+    
+    cache = get_audio_cache() if use_cache else None
+    if cache is None:
+        return _score_uncached(clips, sr, max_batch_size, arousal_gate)
+    
+    # Gated results depend on the gate, so they get their own cache entries
+    model_key = CACHE_MODEL_KEY if arousal_gate is None else f"{CACHE_MODEL_KEY}:gate={arousal_gate}"
+    keys = [clip_key(clip, sr, model_key) for clip in clips]
+    results = [cache.get(key) for key in keys]
+    misses = [i for i, result in enumerate(results) if result is None]
+    
+    if misses:
+        scored = _score_uncached([clips[i] for i in misses], sr, max_batch_size, arousal_gate)
+        for i, result in zip(misses, scored):
+            cache.put(keys[i], result)
+            results[i] = result
+    
+    for i, clip in enumerate(clips):
+        if isinstance(clip, str):
+            # Same content may live at a different path than the cached entry
+            results[i] = {**results[i], "path": clip, "filename": os.path.basename(clip)}
+    
+    return results
+
+
+def score_clip(path_or_audio, sr=None):
+    """
+    Score audio clip from either file path or raw audio array.
+    
+    Args:
+        path_or_audio: Either a file path (str) or audio array (numpy array or bytes)
+        sr: Sample rate (required if passing raw audio)
+    
+    Returns:
+        Dict with emotion scores and energy
+    """
+    return score_clips([path_or_audio], sr=sr)[0]
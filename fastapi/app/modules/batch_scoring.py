@@ -0,0 +1,146 @@
+"""
+Batch Play Scoring
+
+Columnar version of scoring.calculate_play_criticality_score for bulk work
+(POST /key-moments, season backfills). Plays are turned into one pandas
+frame, keyword flags come from one regex scan over all play texts, and
+the rule table (scoring_rules) is evaluated over all plays at once,
+giving the same score, criticality category and play category as the
+scalar path (see test_batch_scoring.py for the parity check).
+"""
+
+from typing import TYPE_CHECKING, Iterable, Union
+
+import numpy as np
+
+from .leverage import leverage_points_batch
+from .models import Play
+from .play_features import parse_clock, parse_yard_line
+from .play_keywords import DEFENSIVE, SPECIAL_TEAMS, Keyword, match_play_keywords_batch
+from .scoring_rules import get_scoring_rules, situation_flags_batch
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported where used so app startup doesn't load pandas
+
+NUMERIC_COLUMNS = ['Quarter', 'Down', 'Distance', 'YardsGained', 'ScoreHome', 'ScoreAway']
+TEXT_COLUMNS = ['PlayType', 'Description', 'Time', 'YardLine']
+
+
+def _numeric(values: list) -> np.ndarray:
+    if set(map(type, values)) <= {int, float, type(None)}:
+        return np.array(values, dtype=float)  # None -> NaN
+    # Only real numbers count; the scalar path never matches "3" == 3
+    return np.array([v if isinstance(v, (int, float)) else np.nan for v in values], dtype=float)
+
+
+def plays_to_frame(plays: Union["pd.DataFrame", Iterable]) -> "pd.DataFrame":
+    """
+    Normalize plays (a DataFrame, dicts or `Play` models) to one frame with
+    float numeric columns (NaN for missing) and object text columns.
+
+    Follows the scalar path's defaults: a missing YardsGained is 0 (also a
+    None on a `Play`), and missing PlayType/Description/Time are empty.
+    """
+    import pandas as pd
+
+    if isinstance(plays, pd.DataFrame):
+        columns = {
+            column: plays[column].tolist() if column in plays else [None] * len(plays)
+            for column in NUMERIC_COLUMNS + TEXT_COLUMNS
+        }
+        if 'YardsGained' not in plays:
+            columns['YardsGained'] = [0] * len(plays)
+    else:
+        plays = list(plays)
+        is_model = [isinstance(play, Play) for play in plays]
+        records = [play.__dict__ if model else play for play, model in zip(plays, is_model)]
+        columns = {column: [record.get(column) for record in records] for column in NUMERIC_COLUMNS + TEXT_COLUMNS}
+        columns['YardsGained'] = [record.get('YardsGained', 0) for record in records]
+        if any(is_model):
+            columns['YardsGained'] = [
+                0 if model and yards is None else yards
+                for yards, model in zip(columns['YardsGained'], is_model)
+            ]
+
+    frame = {column: _numeric(columns[column]) for column in NUMERIC_COLUMNS}
+    frame.update({column: pd.Series(columns[column], dtype=object) for column in TEXT_COLUMNS})
+    return pd.DataFrame(frame)
+
+
+def _strings(series: "pd.Series") -> list:
+    return [value if isinstance(value, str) else None for value in series]
+
+
+def _map_unique(series: "pd.Series", func, missing) -> np.ndarray:
+    """Apply a scalar function once per distinct value (yard lines and clocks repeat a lot)."""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapped = np.array([func(value) for value in uniques] + [missing], dtype=float)
+    return mapped[codes]  # Sentinel -1 picks `missing`
+
+
+def _or_nan(value):
+    return np.nan if value is None else value
+
+
+def score_plays_batch(plays: Union["pd.DataFrame", Iterable]) -> "pd.DataFrame":
+    """
+    Score many plays at once.
+
+    Args:
+        plays: DataFrame, list of dicts or list of `Play` models (scalar-path field names)
+
+    Returns:
+        DataFrame aligned with the input order with columns
+        score, category, play_category, is_key_play
+    """
+    import pandas as pd
+
+    frame = plays_to_frame(plays)
+
+    down = frame['Down'].to_numpy()
+    distance = frame['Distance'].to_numpy()
+    quarter = frame['Quarter'].to_numpy()
+    yards = frame['YardsGained'].to_numpy()
+    score_diff = np.abs(frame['ScoreHome'].to_numpy() - frame['ScoreAway'].to_numpy())
+    clock = _map_unique(frame['Time'], lambda t: _or_nan(parse_clock(t)), np.nan)
+    # Time only counts in Q4
+    time_remaining = np.where(quarter == 4, clock, np.nan)
+
+    keywords = match_play_keywords_batch(_strings(frame['PlayType']), _strings(frame['Description']))
+    redzone = _map_unique(frame['YardLine'], lambda y: parse_yard_line(y)[1], False).astype(bool)
+    features = keywords | situation_flags_batch(down, distance, quarter, yards, redzone, score_diff, time_remaining)
+
+    # Play category: first matching keyword group wins
+    defensive = (keywords & DEFENSIVE) != 0
+    special = ~defensive & ((keywords & SPECIAL_TEAMS) != 0)
+
+    rules = get_scoring_rules()
+    offensive_score = rules.offensive.evaluate_batch(features)
+    defensive_score = rules.defensive.evaluate_batch(features)
+
+    # Special teams only score field goals
+    score = np.where(
+        defensive, defensive_score,
+        np.where(special, np.where(keywords & Keyword.FIELD_GOAL, offensive_score, 0.0), offensive_score)
+    )
+
+    yards_to_goal = _map_unique(frame['YardLine'], lambda y: _or_nan(parse_yard_line(y)[0]), np.nan)
+    leverage = leverage_points_batch(quarter, clock, score_diff, down, distance, yards_to_goal)
+    if leverage is not None:
+        score = score + leverage
+
+    category = np.select(
+        [score >= 70, score >= 45, score >= 25, score >= 10],
+        ["CRITICAL", "HIGH", "MEDIUM", "LOW"],
+        default="ROUTINE"
+    )
+    play_category = np.where(defensive, "defensive", np.where(special, "special_teams", "offensive"))
+
+    return pd.DataFrame({
+        'score': score,
+        'category': category,
+        'play_category': play_category,
+        'is_key_play': (score >= 25) | np.isin(category, ["CRITICAL", "HIGH"]),
+    })
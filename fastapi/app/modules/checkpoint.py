@@ -0,0 +1,56 @@
+"""
+Detector Checkpoints
+
+Gzipped JSON snapshots of detector state, written atomically, so a restarted
+process can resume a game from where it left off instead of replaying it.
+A checkpoint holds the detector snapshot plus the stream settings needed to
+reconnect.
+"""
+
+import gzip
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Directory for per-game checkpoints (unset = checkpointing off)
+KEY_MOMENT_CHECKPOINT_DIR = os.getenv("KEY_MOMENT_CHECKPOINT_DIR", "")
+# Seconds between periodic checkpoints of a running game
+KEY_MOMENT_CHECKPOINT_SECONDS = float(os.getenv("KEY_MOMENT_CHECKPOINT_SECONDS", "30"))
+
+
+def checkpoint_path_for(name: str) -> Optional[Path]:
+    """Checkpoint file for a game under KEY_MOMENT_CHECKPOINT_DIR, or None if off."""
+    if not KEY_MOMENT_CHECKPOINT_DIR:
+        return None
+    return Path(KEY_MOMENT_CHECKPOINT_DIR) / f"{name}.json.gz"
+
+
+def save_checkpoint(state: dict, path: Union[str, Path]):
+    """Write a checkpoint atomically (temp file + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=5) as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: Union[str, Path, None]) -> Optional[dict]:
+    """Read a checkpoint; None if there isn't a usable one."""
+    if path is None or not Path(path).exists():
+        return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Ignoring unreadable checkpoint {path}: {e}")
+        return None
+
+
+def delete_checkpoint(path: Union[str, Path, None]):
+    if path is not None:
+        Path(path).unlink(missing_ok=True)
@@ -0,0 +1,269 @@
+"""
+Multi-Game Sessions
+
+Runs key moment detection for many games in one process. Each game gets its
+own detector (audio buffer, moments, join state) and its own stream server,
+while all games share the process-wide emotion model, inference pool and
+clip score cache.
+
+Size the shared pool for the slate with AUDIO_INFERENCE_WORKERS.
+
+With KEY_MOMENT_CHECKPOINT_DIR set, each game checkpoints its detector
+periodically and unfinished games are resumed from their checkpoints after a
+restart.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .checkpoint import KEY_MOMENT_CHECKPOINT_DIR, checkpoint_path_for, delete_checkpoint, load_checkpoint
+from .inference_pool import InferencePool, get_inference_pool
+from .key_moment_detector import (
+    DEFAULT_JOIN_MAX_WAIT,
+    KeyMomentDetector,
+    process_streams_for_key_moments,
+)
+from .moment_store import MomentStore, delete_spill, spill_path_for
+from .stream import STREAM_SERVERS, check_stream_server
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on games running at once in this process
+MAX_CONCURRENT_GAMES = int(os.getenv("MAX_CONCURRENT_GAMES", "16"))
+
+
+@dataclass
+class GameSession:
+    """One game's detection run."""
+    game_id: str
+    base_url: Optional[str]
+    speed: float
+    detector: KeyMomentDetector
+    resumed: bool = False
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    status: str = "running"  # running | completed | stopped | failed
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def moments(self) -> MomentStore:
+        return self.detector.detected_moments
+
+    @property
+    def is_running(self) -> bool:
+        return self.status == "running"
+
+    def summary(self) -> dict:
+        """JSON-serializable status for the API."""
+        return {
+            'game_id': self.game_id,
+            'status': self.status,
+            'base_url': self.base_url,
+            'speed': self.speed,
+            'resumed': self.resumed,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'plays_processed': self.moments.total_count,
+            'key_moments': self.moments.key_count,
+            'audio_segments': self.detector.segment_count,
+            'audio_watermark': round(self.detector.audio_watermark, 2),
+            'error': self.error,
+        }
+
+
+class GameSessionManager:
+    """
+    Starts, tracks and stops concurrent game sessions.
+
+    Example:
+        manager = get_session_manager()
+        manager.start_game("KC-BUF", speed=10.0)  # Stream server from STREAM_SERVERS
+        ...
+        await manager.stop_game("KC-BUF")
+    """
+
+    def __init__(
+        self,
+        inference_pool: Optional[InferencePool] = None,
+        max_games: int = MAX_CONCURRENT_GAMES
+    ):
+        self.inference_pool = inference_pool
+        self.max_games = max_games
+        self.sessions: Dict[str, GameSession] = {}
+
+    @property
+    def running_count(self) -> int:
+        return sum(1 for s in self.sessions.values() if s.is_running)
+
+    def get(self, game_id: str) -> Optional[GameSession]:
+        return self.sessions.get(game_id)
+
+    def list_sessions(self) -> List[GameSession]:
+        return list(self.sessions.values())
+
+    def start_game(
+        self,
+        game_id: str,
+        base_url: Optional[str] = None,
+        speed: float = 1.0,
+        audio_weight: float = 0.3,
+        play_weight: float = 0.7,
+        key_moment_threshold: float = 50.0,
+        context_segments: int = 2,
+        max_buffer_segments: int = 50,
+        eager_scoring: bool = False,
+        join_max_wait: float = DEFAULT_JOIN_MAX_WAIT,
+        key_moment_callback=None,
+        resume: bool = True
+    ) -> GameSession:
+        """
+        Start detection for a game in the background.
+
+        A finished session with the same id is replaced. With `resume` and an
+        unfinished checkpoint for the game, detection continues from it (its
+        scoring parameters win over the ones passed here).
+
+        Without `base_url` the game's server comes from STREAM_SERVERS, else
+        STREAM_API_URI. A given `base_url` must be a configured server.
+
+        Raises:
+            UnknownStreamServerError: If `base_url` isn't a configured server
+            ValueError: If the game is already running or the process is at
+                `max_games` running sessions
+        """
+        if base_url is None:
+            base_url = STREAM_SERVERS.get(game_id)  # None = STREAM_API_URI
+        else:
+            check_stream_server(base_url)
+
+        existing = self.sessions.get(game_id)
+        if existing and existing.is_running:
+            raise ValueError(f"Game {game_id} is already running")
+        if self.running_count >= self.max_games:
+            raise ValueError(f"Already running the maximum of {self.max_games} games")
+
+        checkpoint_path = checkpoint_path_for(game_id)
+        state = load_checkpoint(checkpoint_path) if resume else None
+        if state is not None and state.get('completed'):
+            logger.info(f"Checkpoint for {game_id} is from a finished run, starting fresh")
+            state = None
+
+        detector_kwargs = dict(
+            inference_pool=self.inference_pool or get_inference_pool(),
+            eager_scoring=eager_scoring,
+            moment_store=MomentStore(spill_path=spill_path_for(game_id))
+        )
+        detector = None
+        if state is not None:
+            try:
+                detector = KeyMomentDetector.from_snapshot(state['detector'], **detector_kwargs)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Could not resume {game_id} from checkpoint, starting fresh: {e}")
+        if detector is None:
+            delete_spill(spill_path_for(game_id))  # Fresh run: drop the last run's history
+            detector = KeyMomentDetector(
+                play_weight=play_weight,
+                audio_weight=audio_weight,
+                key_moment_threshold=key_moment_threshold,
+                context_segments=context_segments,
+                max_buffer_segments=max_buffer_segments,
+                **detector_kwargs
+            )
+        session = GameSession(
+            game_id=game_id, base_url=base_url, speed=speed, detector=detector,
+            resumed=detector.segment_count > 0 or detector.detected_moments.total_count > 0
+        )
+        session.task = asyncio.create_task(
+            process_streams_for_key_moments(
+                speed=speed,
+                join_max_wait=join_max_wait,
+                key_moment_callback=key_moment_callback,
+                base_url=base_url,
+                detector=detector,
+                checkpoint_path=checkpoint_path
+            ),
+            name=f"game-{game_id}"
+        )
+        session.task.add_done_callback(lambda task: self._on_done(session, task))
+        self.sessions[game_id] = session
+
+        logger.info(f"Started game {game_id} ({self.running_count}/{self.max_games} running)")
+        return session
+
+    def _on_done(self, session: GameSession, task: asyncio.Task):
+        session.finished_at = time.time()
+        if task.cancelled():
+            session.status = "stopped"
+        elif task.exception() is not None:
+            session.status = "failed"
+            session.error = str(task.exception())
+            logger.error(f"Game {session.game_id} failed: {session.error}")
+        else:
+            session.status = "completed"
+        logger.info(
+            f"Game {session.game_id} {session.status}: {session.moments.total_count} plays processed"
+        )
+
+    async def stop_game(self, game_id: str) -> Optional[GameSession]:
+        """Cancel a running game and wait for it to wind down."""
+        session = self.sessions.get(game_id)
+        if session is None:
+            return None
+        if session.task and not session.task.done():
+            session.task.cancel()
+            await asyncio.gather(session.task, return_exceptions=True)
+        return session
+
+    def remove_game(self, game_id: str) -> Optional[GameSession]:
+        """Forget a finished game, its checkpoint and spill file. Running games must be stopped first."""
+        session = self.sessions.get(game_id)
+        if session is not None and session.is_running:
+            raise ValueError(f"Game {game_id} is still running")
+        delete_checkpoint(checkpoint_path_for(game_id))
+        delete_spill(spill_path_for(game_id))
+        return self.sessions.pop(game_id, None)
+
+    def resume_all(self) -> List[GameSession]:
+        """Restart every game with an unfinished checkpoint (e.g. after a deploy)."""
+        if not KEY_MOMENT_CHECKPOINT_DIR:
+            return []
+
+        resumed = []
+        for path in sorted(Path(KEY_MOMENT_CHECKPOINT_DIR).glob("*.json.gz")):
+            game_id = path.name[:-len(".json.gz")]
+            state = load_checkpoint(path)
+            if state is None or state.get('completed') or game_id in self.sessions:
+                continue
+            stream = state.get('stream', {})
+            try:
+                resumed.append(self.start_game(
+                    game_id,
+                    base_url=stream.get('base_url'),
+                    speed=stream.get('speed', 1.0),
+                    join_max_wait=stream.get('join_max_wait', DEFAULT_JOIN_MAX_WAIT),
+                    eager_scoring=stream.get('eager_scoring', False)
+                ))
+            except ValueError as e:
+                logger.error(f"Could not resume {game_id}: {e}")
+        return resumed
+
+    async def shutdown(self):
+        """Stop every running game."""
+        await asyncio.gather(*(self.stop_game(game_id) for game_id in list(self.sessions)))
+
+
+_manager: Optional[GameSessionManager] = None
+
+
+def get_session_manager() -> GameSessionManager:
+    """Process-wide session manager (shares the process-wide inference pool)."""
+    global _manager
+    if _manager is None:
+        _manager = GameSessionManager()
+    return _manager
@@ -0,0 +1,180 @@
+"""
+Game State Tracking
+
+Running game context built up one play at a time: quarter and clock, score,
+which team has the ball, the current drive's length, and how many drives in
+a row the offense has been stopped. Each update only compares the play with
+the previous state, so it costs the same on the first play as on the last.
+
+The scorer takes the state as extra context: it fills in the clock and score
+a play doesn't carry itself (stream plays have neither) and adds the
+`Situation.LONG_DRIVE` / `Situation.STOP_STREAK` bits the rule table can
+score.
+"""
+
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+
+from .models import Play
+from .play_features import PlayFeatures, parse_clock
+from .scoring_rules import Situation, situation_flags
+
+# Plays in a drive before it counts as a long drive
+LONG_DRIVE_PLAYS = 8
+# Drives in a row an offense must be stopped for a stop streak
+STOP_STREAK_DRIVES = 3
+
+
+def _as_int(value) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class GameState:
+    quarter: Optional[int] = None
+    clock_seconds: Optional[int] = None  # Left in the quarter
+    score_home: Optional[int] = None
+    score_away: Optional[int] = None
+    possession: Optional[str] = None  # Team with the ball
+    possession_changes: int = 0
+    drive_number: int = 0
+    drive_plays: int = 0
+    drive_yards: int = 0
+    consecutive_stops: int = 0  # Drives in a row the offense has ended without points
+
+    @property
+    def score_diff(self) -> Optional[int]:
+        if self.score_home is None or self.score_away is None:
+            return None
+        return abs(self.score_home - self.score_away)
+
+    @property
+    def time_remaining(self) -> Optional[int]:
+        """Clock seconds in the 4th quarter (the only quarter scoring uses it)."""
+        return self.clock_seconds if self.quarter == 4 else None
+
+    @property
+    def flags(self) -> int:
+        """`Situation` bits that come from the game state rather than the play."""
+        flags = 0
+        if self.drive_plays >= LONG_DRIVE_PLAYS:
+            flags |= Situation.LONG_DRIVE
+        if self.consecutive_stops >= STOP_STREAK_DRIVES:
+            flags |= Situation.STOP_STREAK
+        return flags
+
+    def apply(self, features: PlayFeatures) -> PlayFeatures:
+        """
+        `features` with the quarter, clock and score filled in from the game
+        state where the play didn't have them, and the state's bits added.
+        """
+        quarter = features.quarter if features.quarter is not None else self.quarter
+        clock_seconds = features.clock_seconds if features.clock_seconds is not None else self.clock_seconds
+        score_diff = features.score_diff if features.score_diff is not None else self.score_diff
+        time_remaining = clock_seconds if quarter == 4 else None
+
+        flags = features.keywords | self.flags | situation_flags(
+            features.down, features.distance, quarter, features.yards_gained,
+            features.redzone, score_diff, time_remaining
+        )
+        return replace(
+            features, quarter=quarter, clock_seconds=clock_seconds, score_diff=score_diff, flags=flags
+        )
+
+
+class GameStateTracker:
+    """
+    Keeps a `GameState` current as plays arrive in game order.
+
+    Plays may be stream events ('Team', 'quarter', 'TimeRemainingMinutes' /
+    'TimeRemainingSeconds'), scoring dicts or `Play` models ('PossessionTeam',
+    'Quarter', 'Time'). Fields a play doesn't have keep their last value.
+
+    A drive ends when another team has the ball; the team that had it is
+    stopped if the score didn't change during the drive. This is an
+    approximation - kickoffs count toward the kicking team's drive, and
+    a defensive score still counts as points on the drive.
+    """
+
+    def __init__(self):
+        self.state = GameState()
+        self._drive_scored = False
+        self._stops = {}  # Team -> drives in a row it was stopped
+
+    def update(self, play) -> GameState:
+        """
+        Apply one play and return the state after it. The same `GameState`
+        object is updated in place by later plays.
+        """
+        if isinstance(play, Play):
+            play = play.__dict__
+        state = self.state
+
+        quarter = _as_int(play.get('quarter', play.get('Quarter', play.get('QuarterName'))))
+        if quarter is not None:
+            state.quarter = quarter
+
+        clock_seconds = self._clock(play)
+        if clock_seconds is not None:
+            state.clock_seconds = clock_seconds
+
+        team = play.get('Team') or play.get('PossessionTeam')
+        if team and team != state.possession:
+            if state.possession is not None:
+                self._end_drive()
+                state.possession_changes += 1
+            state.possession = team
+            state.drive_number += 1
+            state.drive_plays = 0
+            state.drive_yards = 0
+            self._drive_scored = False
+        state.consecutive_stops = self._stops.get(state.possession, 0)
+
+        self._update_score(play)  # After any drive change - the points belong to this play's drive
+
+        state.drive_plays += 1
+        state.drive_yards += _as_int(play.get('YardsGained')) or 0
+        return state
+
+    def _clock(self, play) -> Optional[int]:
+        minutes = _as_int(play.get('TimeRemainingMinutes'))
+        seconds = _as_int(play.get('TimeRemainingSeconds'))
+        if minutes is not None and seconds is not None:
+            return minutes * 60 + seconds
+        return parse_clock(play.get('Time'))
+
+    def _update_score(self, play):
+        home, away = play.get('ScoreHome'), play.get('ScoreAway')
+        scoring_play = play.get('ScoringPlay')
+        if (home is None or away is None) and isinstance(scoring_play, dict):
+            home, away = scoring_play.get('HomeScore'), scoring_play.get('AwayScore')
+        home, away = _as_int(home), _as_int(away)
+        if home is None or away is None:
+            return
+
+        state = self.state
+        # Games start 0-0, so the first score seen counts as a change too
+        if (home, away) != (state.score_home or 0, state.score_away or 0):
+            self._drive_scored = True
+        state.score_home, state.score_away = home, away
+
+    def _end_drive(self):
+        team = self.state.possession
+        self._stops[team] = 0 if self._drive_scored else self._stops.get(team, 0) + 1
+
+    def snapshot(self) -> dict:
+        """Tracker state as a JSON-serializable dict, for checkpoints."""
+        return {'state': asdict(self.state), 'drive_scored': self._drive_scored, 'stops': dict(self._stops)}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "GameStateTracker":
+        tracker = cls()
+        tracker.state = GameState(**snapshot['state'])
+        tracker._drive_scored = snapshot['drive_scored']
+        tracker._stops = dict(snapshot['stops'])
+        return tracker
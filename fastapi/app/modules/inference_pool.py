@@ -0,0 +1,136 @@
+"""
+Inference Worker Pool
+
+Runs audio sentiment inference off the asyncio event loop so stream readers
+and other SSE clients keep flowing while clips are being scored.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from . import audio_sentiment
+
+logger = logging.getLogger(__name__)
+
+# "thread" shares one model in-process; "process" loads one model per worker
+INFERENCE_EXECUTOR = os.getenv("AUDIO_INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("AUDIO_INFERENCE_WORKERS", "1"))
+# torch intra-op threads per worker (0 = leave torch's default)
+TORCH_THREADS = int(os.getenv("AUDIO_TORCH_THREADS", "0"))
+
+
+def _init_worker(torch_threads: int):
+    """Executor initializer: cap torch intra-op threads in this worker."""
+    if torch_threads > 0:
+        import torch
+        torch.set_num_threads(torch_threads)
+
+
+def _call_in_worker(fn, *args):
+    """Run `fn` in a worker; also report whether the model there has run a forward pass."""
+    return fn(*args), audio_sentiment.is_model_ready()
+
+
+class InferencePool:
+    """
+    Thread or process pool for audio inference, awaited from async code.
+
+    Thread workers share the lazily loaded model in this process (torch
+    releases the GIL during the forward pass). Process workers each load
+    their own copy of the model, trading memory for isolation.
+    """
+
+    def __init__(
+        self,
+        executor: str = INFERENCE_EXECUTOR,
+        workers: int = INFERENCE_WORKERS,
+        torch_threads: int = TORCH_THREADS
+    ):
+        self.kind = executor
+        self.workers = max(1, workers)
+        self.torch_threads = torch_threads
+        self.ready = False
+
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(torch_threads,)
+            )
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="audio-inference",
+                initializer=_init_worker,
+                initargs=(torch_threads,)
+            )
+        else:
+            raise ValueError(f"Unknown inference executor: {executor!r} (expected 'thread' or 'process')")
+
+        logger.info(
+            f"Inference pool started: executor={executor}, workers={self.workers}, "
+            f"torch_threads={torch_threads or 'default'}"
+        )
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        result, model_ready = await loop.run_in_executor(self._executor, _call_in_worker, fn, *args)
+        # Cache hits and cascade estimates return without touching the model
+        self.ready = self.ready or model_ready
+        return result
+
+    async def score_clips(self, clips, sr=None) -> list[dict]:
+        """Score clips with `audio_sentiment.score_clips` in a pool worker."""
+        clips = list(clips)
+        if self.kind == "process":
+            # memoryview frames from the stream can't be pickled
+            clips = [bytes(c) if isinstance(c, memoryview) else c for c in clips]
+        return await self._run(audio_sentiment.score_clips, clips, sr)
+
+    async def score_clip(self, clip, sr=None) -> dict:
+        """Score a single clip in a pool worker."""
+        return (await self.score_clips([clip], sr))[0]
+
+    async def warmup(self):
+        """
+        Load the model and run one dummy inference.
+
+        Thread workers share one model, so a single warmup covers them all.
+        In process mode one warmup is submitted per worker; a worker busy
+        loading its model doesn't take another, so each worker normally
+        warms its own copy, and any that didn't loads it on its first batch.
+        """
+        calls = self.workers if self.kind == "process" else 1
+        await asyncio.gather(*(self._run(audio_sentiment.warmup) for _ in range(calls)))
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool: Optional[InferencePool] = None
+
+
+def get_inference_pool() -> InferencePool:
+    """Return the process-wide inference pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = InferencePool()
+    return _pool
+
+
+def shutdown_inference_pool(wait: bool = True):
+    """Shut down the process-wide inference pool if it was started."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=wait)
+        _pool = None
+
+
+def is_inference_ready() -> bool:
+    """True once the model has run an inference in this process or the pool."""
+    return (_pool is not None and _pool.ready) or audio_sentiment.is_model_ready()
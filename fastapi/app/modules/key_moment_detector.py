@@ -5,39 +5,56 @@ Uses ONLY the streaming endpoints - no access to preprocessed files.
 """
 
 import asyncio
+import base64
 import logging
+import os
 from typing import List, Optional
-from dataclasses import dataclass
-from collections import deque
+from dataclasses import dataclass, field
 
-from .scoring import calculate_play_criticality_score
-from .audio_sentiment import score_clip
+from .game_state import GameStateTracker
+from .play_score_cache import score_play_cached
+from .audio_buffer import AudioRingBuffer
+from .audio_sentiment import MAX_BATCH_SIZE
+from .checkpoint import KEY_MOMENT_CHECKPOINT_SECONDS, load_checkpoint, save_checkpoint
+from .inference_pool import InferencePool, get_inference_pool
+from .moment_store import KeyMoment, MomentStore
+from .play_audio_join import PlayAudioJoin
+from .wav_decode import WavFormatError, wav_duration
+from .wav_framer import WavFramer
 from .stream import listen_to_events_stream, listen_to_audio_stream
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when the snapshot layout changes
+SNAPSHOT_VERSION = 1
 
-@dataclass
+# Wall-clock seconds a play may wait past the expected arrival of its audio
+# before being scored anyway
+DEFAULT_JOIN_MAX_WAIT = float(os.getenv("KEY_MOMENT_JOIN_MAX_WAIT", "5.0"))
+# Audio segment length assumed until the stream has delivered some
+DEFAULT_SEGMENT_SECONDS = float(os.getenv("KEY_MOMENT_SEGMENT_SECONDS", "5.0"))
+
+
+def expected_audio_wait(segment_seconds: float, context_segments: int, speed: float) -> float:
+    """
+    Wall-clock seconds from a play arriving until its after-context audio
+    has: `context_segments` segments past the play's own (which may be the
+    one after it), each paced at its audio time / speed.
+    """
+    return (context_segments + 1) * segment_seconds / max(speed, 1e-9)
+
+
+@dataclass(slots=True)
 class AudioSegment:
     """Audio segment received from stream."""
     index: int
-    timestamp: float  # Time relative to stream start
-    data: bytes  # Raw audio data
+    timestamp: float  # Start time relative to stream start
+    data: Optional[bytes]  # Raw WAV data (bytes or a memoryview); dropped once scored
+    duration: float = 0.0  # Seconds, from the WAV header
     audio_score: Optional[float] = None
-
-
-@dataclass
-class KeyMoment:
-    """Detected key moment."""
-    timestamp: float
-    play_score: float
-    play_category: str
-    audio_score: float
-    combined_score: float
-    is_key_moment: bool
-    play_data: dict
-    audio_segments_used: List[int]
+    # Resolves when an in-flight scoring batch containing this segment finishes
+    scoring: Optional[asyncio.Future] = field(default=None, repr=False, compare=False)
 
 
 class KeyMomentDetector:
@@ -49,6 +66,14 @@ class KeyMomentDetector:
     2. Store in sliding window buffer
     3. When play event arrives, analyze nearby segments
     4. Combine play + audio scores for key moment detection
+    
+    With `eager_scoring`, segments are scored in the background as they
+    arrive, so by the time a play needs them their scores are usually ready.
+    
+    Moments go to a bounded `MomentStore` (all key moments plus recent plays).
+    Without an `inference_pool`, the process-wide pool is fetched the first
+    time a segment is scored, so a detector that never scores audio (offline
+    mode) never starts one.
     """
     
     def __init__(
@@ -57,39 +82,96 @@ class KeyMomentDetector:
         audio_weight: float = 0.3,
         key_moment_threshold: float = 50.0,
         context_segments: int = 2,
-        max_buffer_segments: int = 50
+        max_buffer_segments: int = 50,
+        inference_pool: Optional[InferencePool] = None,
+        eager_scoring: bool = False,
+        eager_batch_size: int = MAX_BATCH_SIZE,
+        moment_store: Optional[MomentStore] = None
     ):
         self.play_weight = play_weight
         self.audio_weight = audio_weight
         self.key_moment_threshold = key_moment_threshold
         self.context_segments = context_segments
+        self._inference_pool = inference_pool
         
-        # Sliding window of audio segments
-        self.audio_segments: deque[AudioSegment] = deque(maxlen=max_buffer_segments)
-        self.detected_moments: List[KeyMoment] = []
+        # Background scoring of segments as they arrive
+        self.eager_scoring = eager_scoring
+        self.eager_batch_size = max(1, eager_batch_size)
+        self._eager_queue: Optional[asyncio.Queue] = None
+        self._eager_task: Optional[asyncio.Task] = None
+        
+        # Sliding window of audio segments, indexed by timestamp
+        self.audio_segments: AudioRingBuffer[AudioSegment] = AudioRingBuffer(max_buffer_segments)
+        self.detected_moments: MomentStore = moment_store if moment_store is not None else MomentStore()
+        
+        # Clock, score, possession and drive context from the plays seen so far
+        self.game_state = GameStateTracker()
         
         self.segment_count = 0
         self.current_audio_time = 0.0
+        self.audio_watermark = 0.0  # End time of the newest segment
         
         logger.info(
             f"Detector initialized: play_weight={play_weight}, "
-            f"audio_weight={audio_weight}, threshold={key_moment_threshold}"
+            f"audio_weight={audio_weight}, threshold={key_moment_threshold}, "
+            f"eager_scoring={eager_scoring}"
         )
     
-    def add_audio_segment(self, audio_data: bytes, timestamp: float):
+    @property
+    def inference_pool(self) -> InferencePool:
+        if self._inference_pool is None:
+            self._inference_pool = get_inference_pool()
+        return self._inference_pool
+    
+    def add_audio_segment(self, audio_data: bytes, timestamp: float, duration: float = 0.0):
         """Store audio segment from stream."""
         segment = AudioSegment(
             index=self.segment_count,
             timestamp=timestamp,
-            data=audio_data
+            data=audio_data,
+            duration=duration
         )
-        self.audio_segments.append(segment)
+        self.audio_segments.append(segment, timestamp)
         self.segment_count += 1
         self.current_audio_time = timestamp
+        self.audio_watermark = max(self.audio_watermark, timestamp + duration)
         
+        if self.eager_scoring:
+            self._enqueue_for_scoring(segment)
     
+    def _enqueue_for_scoring(self, segment: AudioSegment):
+        """Queue a segment for the background scorer, starting it if needed."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop (sync use) - segments are scored on demand
+        
+        if self._eager_queue is None:
+            self._eager_queue = asyncio.Queue()
+        if self._eager_task is None or self._eager_task.done():
+            self._eager_task = asyncio.create_task(self._eager_scoring_loop())
+        self._eager_queue.put_nowait(segment)
     
-    def get_audio_score_for_play(self, play_timestamp: float) -> tuple[float, List[int]]:
+    async def _eager_scoring_loop(self):
+        """Score queued segments in batches of whatever has arrived so far."""
+        while True:
+            batch = [await self._eager_queue.get()]
+            while len(batch) < self.eager_batch_size and not self._eager_queue.empty():
+                batch.append(self._eager_queue.get_nowait())
+            await self.score_segments(batch)
+    
+    async def close(self):
+        """Stop the background scorer."""
+        if self._eager_task is not None:
+            self._eager_task.cancel()
+            try:
+                await self._eager_task
+            except asyncio.CancelledError:
+                pass
+            self._eager_task = None
+        self.detected_moments.close()
+    
+    async def get_audio_score_for_play(self, play_timestamp: float) -> tuple[float, List[int]]:
         """
         Analyze audio segments near play timestamp.
         Returns: (average_score, segment_indices_used)
@@ -98,76 +180,125 @@ class KeyMomentDetector:
             logger.warning("No audio segments available for analysis")
             return 0.0, []
         
-        # Find segment closest to play timestamp
-        closest_idx = None
-        min_diff = float('inf')
-        
-        for i, seg in enumerate(self.audio_segments):
-            diff = abs(seg.timestamp - play_timestamp)
-            if diff < min_diff:
-                min_diff = diff
-                closest_idx = i
+        # Find segment closest to play timestamp (binary search)
+        closest_idx = self.audio_segments.nearest_index(play_timestamp)
         
         if closest_idx is None:
             logger.warning("No closest segment found")
             return 0.0, []
         
         # Get ±context_segments around the closest one
-        start_idx = max(0, closest_idx - self.context_segments)
-        end_idx = min(len(self.audio_segments) - 1, closest_idx + self.context_segments)
+        window = self.audio_segments.window(closest_idx, self.context_segments)
+        
+        # Wait on segments already being scored, score the rest now. The shared
+        # futures are shielded so cancelling this play doesn't cancel them for
+        # other plays; segments whose scoring was interrupted are claimed again.
+        while any(seg.audio_score is None for seg in window):
+            in_flight = {
+                seg.scoring for seg in window
+                if seg.audio_score is None and seg.scoring is not None
+            }
+            claimed = self._claim(window)
+            await asyncio.gather(self._score_claimed(claimed), *(asyncio.shield(f) for f in in_flight))
         
-        scores = []
-        indices_used = []
+        scores = [seg.audio_score or 0.0 for seg in window]
+        indices_used = [seg.index for seg in window]
         
-        for i in range(start_idx, end_idx + 1):
-            segment = list(self.audio_segments)[i]
-            
-            # Analyze audio if not yet scored
-            if segment.audio_score is None:
+        avg_score = sum(scores) / len(scores) if scores else 0.0
+        return avg_score, indices_used
+    
+    def has_audio_context(self, play_timestamp: float) -> bool:
+        """
+        True once audio has been received past the play and the full
+        ±context_segments window around it is buffered.
+        """
+        if not self.audio_segments or self.audio_watermark <= play_timestamp:
+            return False
+        closest_idx = self.audio_segments.nearest_index(play_timestamp)
+        return len(self.audio_segments) - 1 - closest_idx >= self.context_segments
+    
+    async def score_segments(self, segments: List[AudioSegment]):
+        """
+        Score unscored segments in a single batched inference call,
+        awaited on the inference pool so the event loop stays free.
+        
+        Segments that are already scored or in flight are skipped. Falls back
+        to scoring one clip at a time if the batch fails, so a single bad clip
+        doesn't zero out the whole window.
+        """
+        await self._score_claimed(self._claim(segments))
+    
+    def _claim(self, segments: List[AudioSegment]) -> List[AudioSegment]:
+        """
+        Mark unscored, idle segments as in flight under one shared future.
+        Synchronous, so concurrent plays see the claim before anything awaits.
+        """
+        claimed = [seg for seg in segments if seg.audio_score is None and seg.scoring is None]
+        if claimed:
+            done = asyncio.get_running_loop().create_future()
+            for segment in claimed:
+                segment.scoring = done
+        return claimed
+    
+    async def _score_claimed(self, segments: List[AudioSegment]):
+        if not segments:
+            return
+        done = segments[0].scoring
+        try:
+            await self._score_batch(segments)
+        finally:
+            for segment in segments:
+                if segment.audio_score is None:
+                    segment.scoring = None  # Interrupted - allow a retry
+            if not done.done():
+                done.set_result(None)
+    
+    async def _score_batch(self, segments: List[AudioSegment]):
+        try:
+            results = await self.inference_pool.score_clips([seg.data for seg in segments])
+        except Exception as e:
+            logger.error(f"Error batch scoring {len(segments)} segments: {e}")
+            results = []
+            for segment in segments:
                 try:
-                    result = score_clip(segment.data)
-                    # Use excitement as the primary metric, scaled to 0-100
-                    segment.audio_score = result.get('excited_audio', 0.0) * 100
-                    
-                    logger.debug(f"Segment {segment.index} scored: {segment.audio_score:.1f}")
-                    
+                    results.append(await self.inference_pool.score_clip(segment.data))
                 except Exception as e:
                     logger.error(f"Error scoring segment {segment.index}: {e}")
-                    segment.audio_score = 0.0
-            
-            scores.append(segment.audio_score)
-            indices_used.append(segment.index)
+                    results.append({})
         
-        avg_score = sum(scores) / len(scores) if scores else 0.0
-        return avg_score, indices_used
+        for segment, result in zip(segments, results):
+            # Use excitement as the primary metric, scaled to 0-100
+            segment.audio_score = result.get('excited_audio', 0.0) * 100
+            segment.data = None  # Only the score is needed from here on
+            logger.debug(f"Segment {segment.index} scored: {segment.audio_score:.1f}")
     
-    def process_play_event(self, play_data: dict) -> KeyMoment:
+    async def process_play_event(self, play_data: dict) -> KeyMoment:
         """Process incoming play event with nearby audio."""
         play_timestamp = play_data.get('absoluteAudioTimestamp', 0.0)
         
-        # Normalize play data to match what scoring function expects
-        normalized_play = {
-            'Down': play_data.get('Down'),
-            'Distance': play_data.get('Distance'),
-            'Quarter': play_data.get('quarter'),  # lowercase in stream, uppercase in scoring
-            'YardLine': play_data.get('YardLine'),
-            'YardsGained': play_data.get('YardsGained', 0),
-            'PlayType': play_data.get('Type', ''),  # 'Type' in stream, 'PlayType' in scoring
-            'Description': play_data.get('Description', ''),
-            'Time': play_data.get('PlayTime', ''),
-            # Add any other fields that might be needed
-            'ScoreHome': play_data.get('ScoreHome'),
-            'ScoreAway': play_data.get('ScoreAway'),
-        }
+        # Get audio score from nearby segments
+        audio_score, segments_used = await self.get_audio_score_for_play(play_timestamp)
         
-        # Calculate play criticality
-        play_score, _, _ = calculate_play_criticality_score(normalized_play)
+        return self.build_moment(play_data, audio_score, segments_used)
+    
+    def build_moment(self, play_data: dict, audio_score: float, segments_used: List[int]) -> KeyMoment:
+        """
+        Score a play and combine it with an already-computed audio score.
+        Shared by the streaming detector and offline batch mode; plays must
+        arrive in game order, since each one updates the game state.
+        """
+        play_timestamp = play_data.get('absoluteAudioTimestamp', 0.0)
+        
+        # Calculate play criticality in the context of the game so far. Every
+        # client replays the same events, so scores are memoized per play.
+        game_state = self.game_state.update(play_data)
+        play_score, _, _ = score_play_cached(play_data, game_state, stream=True)
         
         if play_score == 0.0:
             logger.warning(
-                f"Play is 0! Normalized data: Down={normalized_play.get('Down')}, "
-                f"Distance={normalized_play.get('Distance')}, Quarter={normalized_play.get('Quarter')}, "
-                f"PlayType='{normalized_play.get('PlayType')}', Description='{normalized_play.get('Description')}'"
+                f"Play is 0! Stream data: Down={play_data.get('Down')}, "
+                f"Distance={play_data.get('Distance')}, Quarter={play_data.get('quarter')}, "
+                f"Type='{play_data.get('Type', '')}', Description='{play_data.get('Description', '')}'"
             )
         
         # Categorize
@@ -180,12 +311,9 @@ class KeyMomentDetector:
         else:
             play_category = "LOW"
         
-        # Get audio score from nearby segments
-        audio_score, segments_used = self.get_audio_score_for_play(play_timestamp)
-        
         # DEBUG: Print details about this play
         logger.info(
-            f"Play #{len(self.detected_moments)+1} at {play_timestamp:.1f}s: "
+            f"Play #{self.detected_moments.total_count + 1} at {play_timestamp:.1f}s: "
             f"Play={play_score:.1f}, Audio={audio_score:.1f}, "
             f"Segments={len(self.audio_segments)}, Used={segments_used}"
         )
@@ -205,8 +333,13 @@ class KeyMomentDetector:
             audio_score=audio_score,
             combined_score=combined_score,
             is_key_moment=is_key,
-            play_data=play_data,
-            audio_segments_used=segments_used
+            description=play_data.get('Description', 'N/A'),
+            play_type=play_data.get('Type', 'N/A'),
+            quarter=play_data.get('quarter'),
+            down=play_data.get('Down'),
+            distance=play_data.get('Distance'),
+            yard_line=play_data.get('YardLine'),
+            audio_segments_used=tuple(segments_used)
         )
         
         if is_key:
@@ -217,26 +350,77 @@ class KeyMomentDetector:
         
         return moment
     
+    def snapshot(self) -> dict:
+        """
+        Detector state as a JSON-serializable dict, for checkpoints.
+        
+        Scored segments keep only their score; unscored ones keep their WAV
+        bytes so they can still be scored after a resume.
+        """
+        segments = []
+        for seg in self.audio_segments:
+            data = None
+            if seg.audio_score is None and seg.data is not None:
+                data = base64.b64encode(bytes(seg.data)).decode('ascii')
+            segments.append([seg.index, seg.timestamp, seg.duration, seg.audio_score, data])
+        
+        return {
+            'version': SNAPSHOT_VERSION,
+            'config': {
+                'play_weight': self.play_weight,
+                'audio_weight': self.audio_weight,
+                'key_moment_threshold': self.key_moment_threshold,
+                'context_segments': self.context_segments,
+                'max_buffer_segments': self.audio_segments.capacity,
+            },
+            'segment_count': self.segment_count,
+            'current_audio_time': self.current_audio_time,
+            'audio_watermark': self.audio_watermark,
+            'segments': segments,
+            'moments': self.detected_moments.snapshot(),
+            'game_state': self.game_state.snapshot(),
+        }
+    
+    @classmethod
+    def from_snapshot(cls, state: dict, **kwargs) -> "KeyMomentDetector":
+        """
+        Rebuild a detector from `snapshot()`. Keyword arguments (e.g.
+        inference_pool, eager_scoring, moment_store) are passed to the
+        constructor; scoring config comes from the snapshot.
+        """
+        if state.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported detector snapshot version: {state.get('version')}")
+        
+        detector = cls(**state['config'], **kwargs)
+        for index, timestamp, duration, audio_score, data in state['segments']:
+            segment = AudioSegment(
+                index=index,
+                timestamp=timestamp,
+                data=base64.b64decode(data) if data is not None else None,
+                duration=duration,
+                audio_score=audio_score
+            )
+            detector.audio_segments.append(segment, timestamp)
+        detector.segment_count = state['segment_count']
+        detector.current_audio_time = state['current_audio_time']
+        detector.audio_watermark = state['audio_watermark']
+        detector.detected_moments.restore(state['moments'])
+        if 'game_state' in state:  # Older checkpoints start the game state over
+            detector.game_state = GameStateTracker.from_snapshot(state['game_state'])
+        
+        logger.info(
+            f"Detector restored: {detector.segment_count} segments, "
+            f"{detector.detected_moments.total_count} plays, watermark {detector.audio_watermark:.1f}s"
+        )
+        return detector
+    
     def get_top_moments(self, n: int = 10) -> List[KeyMoment]:
         """Get top N moments by combined score."""
-        return sorted(self.detected_moments, key=lambda m: m.combined_score, reverse=True)[:n]
+        return self.detected_moments.top(n)
     
     def export_moments_summary(self) -> List[dict]:
-        """Export as JSON-serializable list."""
-        return [
-            {
-                'timestamp': m.timestamp,
-                'combined_score': round(m.combined_score, 2),
-                'play_score': round(m.play_score, 2),
-                'audio_score': round(m.audio_score, 2),
-                'play_category': m.play_category,
-                'is_key_moment': m.is_key_moment,
-                'description': m.play_data.get('Description', 'N/A'),
-                'quarter': m.play_data.get('quarter'),
-                'segments_used': m.audio_segments_used
-            }
-            for m in self.detected_moments
-        ]
+        """Export retained moments as a JSON-serializable list."""
+        return [m.to_dict() for m in self.detected_moments]
 
 
 async def process_streams_for_key_moments(
@@ -245,110 +429,95 @@ async def process_streams_for_key_moments(
     play_weight: float = 0.7,
     key_moment_threshold: float = 50.0,
     context_segments: int = 2,
+    max_buffer_segments: int = 50,
+    eager_scoring: bool = False,
+    join_max_wait: float = DEFAULT_JOIN_MAX_WAIT,
     key_moment_callback=None,  # NEW: Callback for real-time key moments
+    base_url: Optional[str] = None,
+    detector: Optional[KeyMomentDetector] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_interval: float = KEY_MOMENT_CHECKPOINT_SECONDS,
     **kwargs  # Ignore unused params like audio_segments_dir
-) -> List[KeyMoment]:
+) -> MomentStore:
     """
     Process streams in real-time for key moment detection.
     
     Uses only the streaming endpoints - no file system access.
+    
+    Audio segments are timestamped by the cumulative duration in their WAV
+    headers. Plays wait until the audio watermark has passed them and their
+    full context window has arrived, for at most the time that audio should
+    take to stream in at `speed` (`expected_audio_wait`, using the mean
+    segment length so far) plus `join_max_wait` wall-clock seconds of slack;
+    after that they are scored with whatever audio is buffered.
+    
+    `base_url` selects the stream server (defaults to STREAM_API_URI). Pass a
+    prebuilt `detector` to watch its moments while the streams run; the
+    scoring parameters are then taken from it.
+    
+    With `checkpoint_path`, detector state is saved every
+    `checkpoint_interval` seconds and when the run ends or is cancelled. If
+    no detector is passed and the checkpoint exists, detection resumes from
+    it. Streams always start from the detector's position (segments received,
+    plays processed), so a restored detector picks up where it stopped.
     """
-    detector = KeyMomentDetector(
-        play_weight=play_weight,
-        audio_weight=audio_weight,
-        key_moment_threshold=key_moment_threshold,
-        context_segments=context_segments
-    )
+    if detector is None and checkpoint_path:
+        state = load_checkpoint(checkpoint_path)
+        if state is not None:
+            detector = KeyMomentDetector.from_snapshot(state['detector'], eager_scoring=eager_scoring)
+    if detector is None:
+        detector = KeyMomentDetector(
+            play_weight=play_weight,
+            audio_weight=audio_weight,
+            key_moment_threshold=key_moment_threshold,
+            context_segments=context_segments,
+            max_buffer_segments=max_buffer_segments,
+            eager_scoring=eager_scoring
+        )
+    context_segments = detector.context_segments
     
     logger.info(f"Starting real-time detection at {speed}x speed...")
     logger.info(f"Analyzing with ±{context_segments} audio segments per play")
     
-    # Track progress
-    play_count = 0
+    # Track progress; a restored detector carries on numbering from its checkpoint
+    play_count = detector.detected_moments.total_count
     audio_chunk_count = 0
-    audio_buffer = bytearray()  # Buffer for accumulating stream data
-    stream_start_time = None  # Track when stream started
-    
-    def extract_wav_files(buffer: bytearray) -> list[bytes]:
-        """
-        Extract complete WAV files from buffer.
-        Returns list of complete WAV files found.
-        """
-        wav_files = []
-        
-        while True:
-            # Find RIFF header
-            riff_idx = buffer.find(b'RIFF')
-            
-            if riff_idx == -1:
-                # No more RIFF headers
-                break
-            
-            # Remove any garbage before RIFF
-            if riff_idx > 0:
-                logger.debug(f"Skipping {riff_idx} bytes of garbage before RIFF")
-                buffer[:] = buffer[riff_idx:]
-            
-            # Need at least 8 bytes to read header
-            if len(buffer) < 8:
-                break
-            
-            # Read file size from RIFF header (little-endian, bytes 4-7)
-            chunk_size = int.from_bytes(buffer[4:8], 'little')
-            total_size = chunk_size + 8
-            
-            
-            # Check if we have the complete file
-            if len(buffer) < total_size:
-                break
-            
-            # Extract this WAV file
-            wav_data = bytes(buffer[:total_size])
-            wav_files.append(wav_data)
-            
-            # Remove it from buffer
-            buffer[:] = buffer[total_size:]
-        
-        return wav_files
+    framer = WavFramer()  # Splits the audio stream into whole WAV files
     
     def process_audio_chunk(chunk: bytes):
         """Handle incoming audio chunks from stream."""
-        nonlocal audio_chunk_count, audio_buffer, stream_start_time
-        
-        # Set start time on first chunk
-        if stream_start_time is None:
-            import time
-            stream_start_time = time.time()
-        
+        nonlocal audio_chunk_count
         audio_chunk_count += 1
         
+        # Extract any WAV files this chunk completed
+        wav_files = framer.feed(chunk)
         
-        # Add chunk to buffer
-        audio_buffer.extend(chunk)
-        
-        # Try to extract complete WAV files
-        wav_files = extract_wav_files(audio_buffer)
-        
-        # Store each extracted WAV file as a segment with better timestamp estimation
-        for i, wav_data in enumerate(wav_files):
-            # Better timestamp estimation: Use actual elapsed time since stream start
-            import time
-            elapsed_since_start = time.time() - stream_start_time
-            # Each WAV segment is roughly 1 second, so estimate based on segment count
-            estimated_timestamp = detector.segment_count * 1.0
+        # Segments are contiguous, so each one starts where the last ended
+        for wav_data in wav_files:
+            try:
+                duration = wav_duration(wav_data)
+            except WavFormatError as e:
+                logger.warning(f"Could not read WAV duration, assuming 1s: {e}")
+                duration = 1.0
             
-            detector.add_audio_segment(wav_data, estimated_timestamp)
+            detector.add_audio_segment(wav_data, detector.audio_watermark, duration)
         
- 
+        if wav_files:
+            join.max_wait = join_wait()
+            join.notify_audio()
     
-    
-    
-    def process_event(event: dict):
-        """Handle incoming play events."""
+    async def process_event(event: dict, partial_audio: bool = False):
+        """Score a play once its audio is in (or the join gave up waiting)."""
         nonlocal play_count
         play_count += 1
         
-        moment = detector.process_play_event(event)
+        if partial_audio:
+            logger.warning(
+                f"Play at {event.get('absoluteAudioTimestamp', 0.0):.1f}s scored with partial audio "
+                f"(watermark {detector.audio_watermark:.1f}s)"
+            )
+        
+        moment = await detector.process_play_event(event)
         detector.detected_moments.append(moment)
         
         # Log key moments immediately
@@ -363,20 +532,87 @@ async def process_streams_for_key_moments(
                 key_moment_callback(moment)
         
         if play_count % 25 == 0:
-            key_count = sum(1 for m in detector.detected_moments if m.is_key_moment)
+            key_count = detector.detected_moments.key_count
             logger.info(
                 f"Event progress: {play_count} plays processed, "
                 f"{key_count} key moments detected, "
                 f"{detector.segment_count} audio segments available"
             )
     
-    # Process both streams concurrently
-    await asyncio.gather(
-        listen_to_audio_stream(chunk_callback=process_audio_chunk, speed=speed),
-        listen_to_events_stream(event_callback=process_event, speed=speed)
+    def join_wait() -> float:
+        """Max wait for a play's audio: expected arrival at this speed, plus slack."""
+        segment_seconds = DEFAULT_SEGMENT_SECONDS
+        if detector.segment_count:
+            segment_seconds = detector.audio_watermark / detector.segment_count
+        return expected_audio_wait(segment_seconds, context_segments, speed) + join_max_wait
+    
+    join = PlayAudioJoin(
+        is_ready=lambda event: detector.has_audio_context(event.get('absoluteAudioTimestamp', 0.0)),
+        emit=process_event,
+        max_wait=join_wait()
     )
     
-    key_count = sum(1 for m in detector.detected_moments if m.is_key_moment)
+    # Resume position (zero for a fresh detector)
+    start_segment = detector.segment_count
+    start_index = detector.detected_moments.total_count
+    if start_segment or start_index:
+        logger.info(f"Resuming at audio segment {start_segment}, play {start_index}")
+    
+    async def run_audio():
+        await listen_to_audio_stream(
+            chunk_callback=process_audio_chunk, speed=speed, base_url=base_url,
+            start_segment=start_segment
+        )
+        join.audio_finished()  # No more audio - stop holding plays back
+    
+    async def run_events():
+        await listen_to_events_stream(
+            event_callback=join.submit, speed=speed, base_url=base_url,
+            start_index=start_index, start_time=detector.audio_watermark
+        )
+        join.close()
+    
+    def checkpoint_state(completed: bool = False) -> dict:
+        return {
+            'detector': detector.snapshot(),
+            'stream': {
+                'base_url': base_url,
+                'speed': speed,
+                'join_max_wait': join_max_wait,
+                'eager_scoring': detector.eager_scoring,
+            },
+            'completed': completed,
+        }
+    
+    async def checkpoint_loop():
+        while True:
+            await asyncio.sleep(checkpoint_interval)
+            try:
+                # Snapshot on the loop (consistent), write off it
+                await asyncio.to_thread(save_checkpoint, checkpoint_state(), checkpoint_path)
+            except OSError as e:
+                logger.error(f"Checkpoint to {checkpoint_path} failed: {e}")
+    
+    checkpoint_task = asyncio.create_task(checkpoint_loop()) if checkpoint_path else None
+    completed = False
+    
+    # Process both streams concurrently, joining plays to audio as it arrives
+    try:
+        await asyncio.gather(run_audio(), run_events(), join.run())
+        completed = True
+    finally:
+        if checkpoint_task is not None:
+            checkpoint_task.cancel()
+            try:
+                save_checkpoint(checkpoint_state(completed), checkpoint_path)
+            except OSError as e:
+                logger.error(f"Final checkpoint to {checkpoint_path} failed: {e}")
+        await detector.close()
+    
+    if join.released_partial:
+        logger.info(f"{join.released_partial} plays were scored before their audio arrived")
+    
+    key_count = detector.detected_moments.key_count
     logger.info(f"Finished! {play_count} plays, {key_count} key moments detected")
     
     return detector.detected_moments
@@ -0,0 +1,194 @@
+"""
+Leverage Lookup Table
+
+How much a play can swing the game, precomputed for every situation instead
+of approximated with close-game / two-minute bonuses. Leverage is the
+difference in win probability between the offense moving the chains and
+failing (next down, or a turnover on downs on 4th), so it reflects field
+position, down and distance as well as clock and score.
+
+The table is built offline (`build_leverage_table.py`) into a dense float32
+array indexed by quarter, clock bucket, score differential, down, distance
+bucket and yards to goal, saved as .npy and memory-mapped at runtime. A
+lookup is a handful of integer ops and one array read.
+
+Win probability uses the usual normal approximation: the final margin is
+the current lead plus the possession's expected points, with a standard
+deviation that shrinks with the square root of the time left. Plays only
+carry the absolute score differential, so leverage is averaged over the
+offense leading and trailing by it.
+
+Set KEY_MOMENT_LEVERAGE_TABLE to the built file to add
+`leverage * KEY_MOMENT_LEVERAGE_POINTS` to each play's score (unset or
+missing file = no leverage term).
+"""
+
+import logging
+import os
+from bisect import bisect_right
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Leverage table file from build_leverage_table.py (unset = no leverage term)
+KEY_MOMENT_LEVERAGE_TABLE = os.getenv("KEY_MOMENT_LEVERAGE_TABLE", "")
+# Points for a play that swings win probability from 0 to 1
+KEY_MOMENT_LEVERAGE_POINTS = float(os.getenv("KEY_MOMENT_LEVERAGE_POINTS", "40"))
+
+QUARTERS = 5  # 1-4 and overtime
+CLOCK_BUCKET_SECONDS = 60
+CLOCK_BUCKETS = 16  # 0:00-0:59 ... 15:00
+MAX_SCORE_DIFF = 28  # Larger differentials share the last bucket
+DOWNS = 4
+DISTANCE_EDGES = (2, 3, 4, 7, 11)  # Buckets: 1, 2, 3, 4-6, 7-10, 11+
+YARD_BUCKET = 5  # Yards to goal 1-5, 6-10, ... 96-99
+YARD_BUCKETS = 20
+SHAPE = (QUARTERS, CLOCK_BUCKETS, MAX_SCORE_DIFF + 1, DOWNS, len(DISTANCE_EDGES) + 1, YARD_BUCKETS)
+
+# Standard deviation of the final margin over a full game, in points
+MARGIN_STDEV = 13.45
+# Points a failed down costs the offense in expected points (2nd, 3rd, 4th)
+DOWN_COST = {2: 0.6, 3: 1.4, 4: 2.2}
+
+
+def _win_probability(margin: np.ndarray, seconds_left: np.ndarray) -> np.ndarray:
+    """P(final margin > 0); logistic approximation of the normal CDF."""
+    z = margin / (MARGIN_STDEV * np.sqrt(np.maximum(seconds_left, 10.0) / 3600.0))
+    return 1.0 / (1.0 + np.exp(-1.702 * z))
+
+
+def _expected_points(yards_to_goal: np.ndarray) -> np.ndarray:
+    """Expected points of 1st and 10 at this distance from the goal (linear fit)."""
+    return 6.4 - 0.075 * yards_to_goal
+
+
+def build_leverage_table() -> np.ndarray:
+    """Leverage for every cell of SHAPE, evaluated at bucket midpoints."""
+    quarter = np.arange(1, QUARTERS + 1).reshape(-1, 1, 1, 1, 1, 1)
+    clock = np.minimum(np.arange(CLOCK_BUCKETS) * CLOCK_BUCKET_SECONDS + CLOCK_BUCKET_SECONDS / 2, 900)
+    clock = clock.reshape(1, -1, 1, 1, 1, 1)
+    score_diff = np.arange(MAX_SCORE_DIFF + 1).reshape(1, 1, -1, 1, 1, 1)
+    down = np.arange(1, DOWNS + 1).reshape(1, 1, 1, -1, 1, 1)
+    distance = np.array([1, 2, 3, 5, 8.5, 15]).reshape(1, 1, 1, 1, -1, 1)
+    yards_to_goal = np.minimum(np.arange(YARD_BUCKETS) * YARD_BUCKET + YARD_BUCKET / 2 + 0.5, 99)
+    yards_to_goal = yards_to_goal.reshape(1, 1, 1, 1, 1, -1)
+
+    # Regulation quarters leave the later quarters' time too; overtime is just its clock
+    seconds_left = np.where(quarter <= 4, (4 - quarter) * 900 + clock, clock)
+
+    # Success: first down further on, or a touchdown if the distance reaches the goal
+    success = np.where(distance >= yards_to_goal, 7.0, _expected_points(np.maximum(yards_to_goal - distance, 1)))
+    # Failure: the next down from the same spot, or the opponent's ball there on 4th
+    next_down_cost = np.select([down == 1, down == 2, down == 3], [DOWN_COST[2], DOWN_COST[3], DOWN_COST[4]], 0.0)
+    failure = np.where(
+        down == 4,
+        -_expected_points(100 - yards_to_goal),
+        _expected_points(yards_to_goal) - next_down_cost
+    )
+
+    leverage = np.zeros(SHAPE)
+    for lead in (score_diff, -score_diff):
+        swing = _win_probability(lead + success, seconds_left) - _win_probability(lead + failure, seconds_left)
+        leverage = leverage + np.abs(swing) / 2
+    return leverage.astype(np.float32)
+
+
+def save_leverage_table(table: np.ndarray, path: Union[str, Path]):
+    """Write the table as .npy atomically (temp file + rename)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp, path)
+
+
+def load_leverage_table(path: Union[str, Path]) -> np.ndarray:
+    """Memory-map a saved table (ValueError if it doesn't match SHAPE)."""
+    table = np.load(path, mmap_mode='r')
+    if table.shape != SHAPE:
+        raise ValueError(f"Leverage table {path} has shape {table.shape}, expected {SHAPE}")
+    return table
+
+
+_table = None
+_table_loaded = False
+
+
+def get_leverage_table() -> Optional[np.ndarray]:
+    """The table at KEY_MOMENT_LEVERAGE_TABLE, read once; None if unset, missing or invalid."""
+    global _table, _table_loaded
+    if not _table_loaded:
+        _table_loaded = True
+        if KEY_MOMENT_LEVERAGE_TABLE:
+            try:
+                _table = load_leverage_table(KEY_MOMENT_LEVERAGE_TABLE)
+                logger.info(f"Loaded leverage table from {KEY_MOMENT_LEVERAGE_TABLE}")
+            except (OSError, ValueError) as e:
+                logger.error(f"Scoring without leverage, can't load {KEY_MOMENT_LEVERAGE_TABLE}: {e}")
+    return _table
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float))  # As in the batch path, which only keeps real numbers
+
+
+def leverage_points(features) -> Optional[float]:
+    """
+    Leverage scoring term for a `PlayFeatures`, or None without a table or
+    when the play lacks quarter, clock, score, down, distance or field position.
+    """
+    table = get_leverage_table()
+    if table is None:
+        return None
+
+    quarter, clock, diff = features.quarter, features.clock_seconds, features.score_diff
+    down, distance, yards_to_goal = features.down, features.distance, features.yards_to_goal
+    if not (
+        quarter in (1, 2, 3, 4, 5) and down in (1, 2, 3, 4)
+        and clock is not None and clock >= 0
+        and diff is not None and _is_number(diff) and diff >= 0
+        and _is_number(distance) and distance >= 0
+        and yards_to_goal is not None and 1 <= yards_to_goal <= 99
+    ):
+        return None
+
+    index = (
+        int(quarter) - 1,
+        min(int(clock // CLOCK_BUCKET_SECONDS), CLOCK_BUCKETS - 1),
+        int(min(diff, MAX_SCORE_DIFF)),
+        int(down) - 1,
+        bisect_right(DISTANCE_EDGES, distance),
+        (yards_to_goal - 1) // YARD_BUCKET,
+    )
+    return float(table[index]) * KEY_MOMENT_LEVERAGE_POINTS
+
+
+def leverage_points_batch(quarter, clock, score_diff, down, distance, yards_to_goal) -> Optional[np.ndarray]:
+    """`leverage_points` over float arrays (NaN = missing, scores 0); None without a table."""
+    table = get_leverage_table()
+    if table is None:
+        return None
+
+    with np.errstate(invalid='ignore'):
+        valid = (
+            np.isin(quarter, (1, 2, 3, 4, 5)) & np.isin(down, (1, 2, 3, 4))
+            & (clock >= 0) & (score_diff >= 0) & (distance >= 0)
+            & (yards_to_goal >= 1) & (yards_to_goal <= 99)
+        )
+
+    def index(values, transform):
+        return np.where(valid, transform(np.where(valid, values, 0)), 0).astype(np.intp)
+
+    values = table[
+        index(quarter, lambda q: q - 1),
+        index(clock, lambda c: np.minimum(c // CLOCK_BUCKET_SECONDS, CLOCK_BUCKETS - 1)),
+        index(score_diff, lambda d: np.minimum(d, MAX_SCORE_DIFF)),
+        index(down, lambda d: d - 1),
+        index(distance, lambda d: np.searchsorted(DISTANCE_EDGES, d, side='right')),
+        index(yards_to_goal, lambda y: (y - 1) // YARD_BUCKET),
+    ]
+    return np.where(valid, values.astype(np.float64) * KEY_MOMENT_LEVERAGE_POINTS, 0.0)
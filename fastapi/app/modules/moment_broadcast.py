@@ -0,0 +1,144 @@
+"""
+Key Moment Broadcasts
+
+Shares one detection run between every client watching the same game with
+the same parameters. The first subscriber starts the pipeline (upstream
+streams, audio inference, scoring); later ones attach to it and first get the
+events published so far, then the live ones. When the last subscriber leaves
+the pipeline is cancelled, and a finished run is dropped so the next
+subscriber starts a fresh one.
+
+Events are SSE-formatted once and the same string is handed to every
+subscriber, so N viewers cost N queue puts per key moment, not N pipelines.
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Starts a run: called with the key moment callback, returns the detection coroutine
+PipelineFactory = Callable[[Callable], Awaitable]
+
+
+def sse_event(data: dict) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
+
+class MomentBroadcast:
+    """One running pipeline, its event history and its subscribers."""
+
+    def __init__(self, key: Hashable):
+        self.key = key
+        self.history: List[str] = []
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.key_moment_count = 0
+        self.finished = False
+        self.task: Optional[asyncio.Task] = None
+
+    def publish_moment(self, moment):
+        """Key moment callback for the detector."""
+        self.key_moment_count += 1
+        self.publish(sse_event({**moment.to_dict(), 'detected_at': self.key_moment_count}))
+
+    def publish(self, event: str):
+        self.history.append(event)
+        for queue in self.subscribers:
+            queue.put_nowait(event)  # Unbounded: a game has at most a few hundred key moments
+
+    def finish(self, event: Optional[str]):
+        """Publish a final event (if any) and end every subscriber's stream."""
+        if event is not None:
+            self.publish(event)
+        self.finished = True
+        for queue in self.subscribers:
+            queue.put_nowait(None)
+
+    def add_subscriber(self) -> asyncio.Queue:
+        """A queue holding the history so far, then live events; None ends it."""
+        queue = asyncio.Queue()
+        for event in self.history:
+            queue.put_nowait(event)
+        if self.finished:
+            queue.put_nowait(None)
+        self.subscribers.add(queue)
+        return queue
+
+
+class MomentBroadcastHub:
+    """Runs at most one pipeline per key and fans its events out."""
+
+    def __init__(self):
+        self.broadcasts: Dict[Hashable, MomentBroadcast] = {}
+
+    @asynccontextmanager
+    async def subscribe(self, key: Hashable, start: PipelineFactory) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to the run for `key`, starting it with `start(callback)` if
+        none is running. Yields the subscriber's event queue (None = end).
+        """
+        broadcast = self.broadcasts.get(key)
+        if broadcast is None:
+            broadcast = self._start(key, start)
+        else:
+            logger.info(f"Joining running broadcast ({len(broadcast.subscribers)} subscribers)")
+
+        queue = broadcast.add_subscriber()
+        try:
+            yield queue
+        finally:
+            broadcast.subscribers.discard(queue)
+            if not broadcast.subscribers and not broadcast.task.done():
+                logger.info("Last subscriber left, stopping broadcast")
+                self._drop(broadcast)
+                broadcast.task.cancel()
+
+    def _start(self, key: Hashable, start: PipelineFactory) -> MomentBroadcast:
+        broadcast = MomentBroadcast(key)
+        broadcast.task = asyncio.create_task(start(broadcast.publish_moment))
+        broadcast.task.add_done_callback(lambda task: self._on_done(broadcast, task))
+        self.broadcasts[key] = broadcast
+        logger.info(f"Started broadcast ({len(self.broadcasts)} running)")
+        return broadcast
+
+    def _drop(self, broadcast: MomentBroadcast):
+        if self.broadcasts.get(broadcast.key) is broadcast:
+            del self.broadcasts[broadcast.key]
+
+    def _on_done(self, broadcast: MomentBroadcast, task: asyncio.Task):
+        self._drop(broadcast)
+        if task.cancelled():
+            broadcast.finish(None)
+        elif task.exception() is not None:
+            logger.error(f"Broadcast pipeline failed: {task.exception()}")
+            broadcast.finish(sse_event({'status': 'error', 'message': str(task.exception())}))
+        else:
+            moments = task.result()
+            count = broadcast.key_moment_count
+            broadcast.finish(sse_event({
+                'status': 'completed',
+                'total_moments_analyzed': moments.total_count,
+                'key_moments_detected': count,
+                'message': f'Analysis complete! Streamed {count} key moments in real-time.'
+            }))
+
+    async def shutdown(self):
+        """Cancel every running pipeline."""
+        tasks = [b.task for b in self.broadcasts.values() if not b.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_hub: Optional[MomentBroadcastHub] = None
+
+
+def get_broadcast_hub() -> MomentBroadcastHub:
+    """Process-wide broadcast hub."""
+    global _hub
+    if _hub is None:
+        _hub = MomentBroadcastHub()
+    return _hub
@@ -0,0 +1,273 @@
+"""
+Key Moment Storage
+
+Compact moment records and a bounded store for them. A `KeyMoment` keeps only
+the fields we export (no raw stream dict), in a slotted dataclass. The store
+keeps every key moment plus a ring of the most recent other plays; plays that
+fall out of the ring are optionally appended to a JSONL spill file so a long
+game's full history survives without growing memory. The file holds exactly
+this store's spilled plays: a stale tail (an earlier run of the game, or
+plays spilled after the checkpoint being resumed) is cut off.
+
+A fixed-size min-heap leaderboard is updated as each moment arrives, so the
+current top N never requires a scan or sort of history.
+"""
+
+import heapq
+import json
+import logging
+import os
+from collections import deque
+from dataclasses import astuple, dataclass
+from operator import itemgetter
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Non-key plays kept in memory per detector
+KEY_MOMENT_RECENT_LIMIT = int(os.getenv("KEY_MOMENT_RECENT_LIMIT", "500"))
+# Directory for per-game JSONL spill files (unset = evicted plays are dropped)
+KEY_MOMENT_SPILL_DIR = os.getenv("KEY_MOMENT_SPILL_DIR", "")
+# Moments tracked by the live leaderboard
+KEY_MOMENT_LEADERBOARD_SIZE = int(os.getenv("KEY_MOMENT_LEADERBOARD_SIZE", "10"))
+
+
+@dataclass(slots=True)
+class KeyMoment:
+    """Detected key moment."""
+    timestamp: float
+    play_score: float
+    play_category: str
+    audio_score: float
+    combined_score: float
+    is_key_moment: bool
+    description: str
+    play_type: str
+    quarter: Optional[int]
+    down: Optional[int]
+    distance: Optional[int]
+    yard_line: Optional[str]
+    audio_segments_used: Tuple[int, ...] = ()
+
+    def to_dict(self) -> dict:
+        """JSON-serializable export."""
+        return {
+            'timestamp': self.timestamp,
+            'combined_score': round(self.combined_score, 2),
+            'play_score': round(self.play_score, 2),
+            'audio_score': round(self.audio_score, 2),
+            'play_category': self.play_category,
+            'is_key_moment': self.is_key_moment,
+            'description': self.description,
+            'play_type': self.play_type,
+            'quarter': self.quarter,
+            'down': self.down,
+            'distance': self.distance,
+            'yard_line': self.yard_line,
+            'segments_used': list(self.audio_segments_used)
+        }
+
+    def to_state(self) -> list:
+        """Lossless, compact form for checkpoints (field values in order)."""
+        return list(astuple(self))
+
+    @classmethod
+    def from_state(cls, values: list) -> "KeyMoment":
+        *fields, segments_used = values
+        return cls(*fields, tuple(segments_used))
+
+
+def spill_path_for(name: str) -> Optional[Path]:
+    """Spill file for a game under KEY_MOMENT_SPILL_DIR, or None if spilling is off."""
+    if not KEY_MOMENT_SPILL_DIR:
+        return None
+    return Path(KEY_MOMENT_SPILL_DIR) / f"{name}.jsonl"
+
+
+def delete_spill(path: Optional[Path]):
+    if path is not None:
+        Path(path).unlink(missing_ok=True)
+
+
+class Leaderboard:
+    """
+    Top `size` moments by combined score, maintained incrementally.
+
+    Min-heap keyed on (score, -arrival) so on equal scores the earlier
+    moment ranks higher. Each push is O(log size); the sorted view is cached
+    until the next change, so repeated reads are free.
+    """
+
+    def __init__(self, size: int = KEY_MOMENT_LEADERBOARD_SIZE):
+        self.size = max(1, size)
+        self._heap: List[Tuple[float, int, KeyMoment]] = []
+        self._seq = 0
+        self._sorted: Optional[List[KeyMoment]] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, moment: KeyMoment) -> bool:
+        """Offer a moment; returns True if it made the board."""
+        entry = (moment.combined_score, -self._seq, moment)
+        self._seq += 1
+
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return False
+
+        self._sorted = None
+        return True
+
+    def top(self, n: Optional[int] = None) -> List[KeyMoment]:
+        """Best first; at most `size` moments."""
+        if self._sorted is None:
+            self._sorted = [m for *_, m in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+        return self._sorted if n is None else self._sorted[:n]
+
+    def snapshot(self) -> dict:
+        return {
+            'seq': self._seq,
+            'entries': [[score, neg_seq, m.to_state()] for score, neg_seq, m in self._heap],
+        }
+
+    def restore(self, state: dict):
+        self._seq = state['seq']
+        self._heap = [(score, neg_seq, KeyMoment.from_state(m)) for score, neg_seq, m in state['entries']]
+        heapq.heapify(self._heap)
+        while len(self._heap) > self.size:
+            heapq.heappop(self._heap)
+        self._sorted = None
+
+
+class MomentStore:
+    """
+    Bounded moment retention: all key moments + the last `recent_limit` others.
+
+    Iterating yields retained moments in arrival order. `total_count` counts
+    every moment appended, including those evicted.
+    """
+
+    def __init__(
+        self,
+        recent_limit: int = KEY_MOMENT_RECENT_LIMIT,
+        spill_path: Optional[Path] = None,
+        leaderboard_size: int = KEY_MOMENT_LEADERBOARD_SIZE
+    ):
+        self.recent_limit = max(0, recent_limit)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.leaderboard = Leaderboard(leaderboard_size)
+
+        # (arrival sequence, moment) so the two lists can be merged in order
+        self._key: List[Tuple[int, KeyMoment]] = []
+        self._recent: Deque[Tuple[int, KeyMoment]] = deque()
+        self._spill_file = None
+        self._spill_bytes = 0  # Length of the spill file this store has written
+
+        self.total_count = 0
+        self.spilled_count = 0
+
+    def __len__(self) -> int:
+        return len(self._key) + len(self._recent)
+
+    def __iter__(self) -> Iterator[KeyMoment]:
+        for _, moment in heapq.merge(self._key, self._recent, key=itemgetter(0)):
+            yield moment
+
+    @property
+    def key_count(self) -> int:
+        return len(self._key)
+
+    @property
+    def key_moments(self) -> List[KeyMoment]:
+        return [moment for _, moment in self._key]
+
+    def append(self, moment: KeyMoment):
+        entry = (self.total_count, moment)
+        self.total_count += 1
+        self.leaderboard.push(moment)
+
+        if moment.is_key_moment:
+            self._key.append(entry)
+            return
+
+        self._recent.append(entry)
+        if len(self._recent) > self.recent_limit:
+            _, evicted = self._recent.popleft()
+            self._spill(evicted)
+
+    def top(self, n: int = 10) -> List[KeyMoment]:
+        """
+        Top N moments by combined score. Served from the leaderboard (which
+        also covers evicted plays) when it is big enough, else from retained moments.
+        """
+        if n <= self.leaderboard.size:
+            return self.leaderboard.top(n)
+        return heapq.nlargest(n, self, key=lambda m: m.combined_score)
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state for checkpoints."""
+        return {
+            'total_count': self.total_count,
+            'spilled_count': self.spilled_count,
+            'spill_bytes': self._spill_bytes,
+            'key': [[seq, m.to_state()] for seq, m in self._key],
+            'recent': [[seq, m.to_state()] for seq, m in self._recent],
+            'leaderboard': self.leaderboard.snapshot(),
+        }
+
+    def restore(self, state: dict):
+        """Load state from `snapshot()` (retention settings stay as configured)."""
+        self.total_count = state['total_count']
+        self.spilled_count = state['spilled_count']
+        # Older checkpoints don't record it: keep the file as it is
+        self._spill_bytes = state.get('spill_bytes', self._spill_file_size())
+        self._truncate_spill()
+        self._key = [(seq, KeyMoment.from_state(m)) for seq, m in state['key']]
+        self._recent = deque((seq, KeyMoment.from_state(m)) for seq, m in state['recent'])
+        while len(self._recent) > self.recent_limit:
+            self._spill(self._recent.popleft()[1])
+        self.leaderboard.restore(state['leaderboard'])
+
+    def _spill(self, moment: KeyMoment):
+        if self.spill_path is None:
+            return
+        try:
+            if self._spill_file is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                self._truncate_spill()
+                self._spill_file = open(self.spill_path, "a", encoding="utf-8")
+            line = json.dumps(moment.to_dict()) + "\n"
+            self._spill_file.write(line)
+            self._spill_file.flush()
+            self._spill_bytes += len(line.encode("utf-8"))
+            self.spilled_count += 1
+        except OSError as e:
+            logger.error(f"Could not spill moment to {self.spill_path}: {e}")
+
+    def _spill_file_size(self) -> int:
+        try:
+            return self.spill_path.stat().st_size if self.spill_path else 0
+        except OSError:
+            return 0
+
+    def _truncate_spill(self):
+        """Cut the spill file back to what this store has written."""
+        size = self._spill_file_size()
+        if size > self._spill_bytes:
+            try:
+                os.truncate(self.spill_path, self._spill_bytes)
+            except OSError as e:
+                logger.error(f"Could not truncate spill file {self.spill_path}: {e}")
+        elif size < self._spill_bytes:
+            logger.warning(f"Spill file {self.spill_path} is shorter than its checkpoint, appending after it")
+            self._spill_bytes = size
+
+    def close(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
@@ -0,0 +1,293 @@
+"""
+Offline Key Moment Detection
+
+Post-game batch mode. Reads the play-by-play JSON and the game audio (the
+segments directory or one full-game WAV) straight from disk, aligns plays to
+audio the same way the stream server does, scores every audio segment any
+play needs in large batches, and builds moments with the streaming
+detector's scoring. No HTTP and no replay pacing, so a game is bound only by
+CPU.
+"""
+
+import json
+import logging
+import mmap
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from . import audio_sentiment
+from .audio_buffer import AudioRingBuffer
+from .key_moment_detector import KeyMomentDetector
+from .moment_store import MomentStore
+from .wav_decode import decode_wav, parse_wav_header
+
+logger = logging.getLogger(__name__)
+
+# Quarter start/end times in the game audio (same defaults as /stream/events)
+DEFAULT_QUARTER_INTERVALS = [365, 1670, 1739, 3785, 3830, 5381, 5391, 7251]
+# Clip length when slicing a full-game WAV
+OFFLINE_SEGMENT_SECONDS = float(os.getenv("OFFLINE_SEGMENT_SECONDS", "5.0"))
+# Clips decoded and handed to the scorer at once (bounds memory)
+OFFLINE_CHUNK_CLIPS = int(os.getenv("OFFLINE_CHUNK_CLIPS", "256"))
+
+
+def load_play_by_play(path: Union[str, Path]) -> List[dict]:
+    """Plays from a play-by-play JSON file."""
+    with open(path, 'r') as f:
+        return json.load(f).get('Plays', [])
+
+
+def align_plays_to_audio(plays: List[dict], intervals: Sequence[float]) -> List[dict]:
+    """
+    Give each play an audio timestamp, exactly as the stream server's
+    process_plays_with_audio_sync does (test_offline_alignment.py checks the
+    two agree).
+
+    Within each quarter, play-clock time minus timeouts is stretched to fit
+    the quarter's audio interval.
+
+    Args:
+        plays: Raw plays from the play-by-play file
+        intervals: [q1_start, q1_end, q2_start, q2_end, q3_start, q3_end, q4_start, q4_end]
+
+    Returns:
+        Play dicts with 'absoluteAudioTimestamp', 'secondsSinceQuarterStarted'
+        and 'quarter' added (timeouts dropped), in stream order
+    """
+    quarter_intervals = [
+        (1, intervals[0], intervals[1]),
+        (2, intervals[2], intervals[3]),
+        (3, intervals[4], intervals[5]),
+        (4, intervals[6], intervals[7])
+    ]
+
+    all_processed_plays = []
+
+    for quarter_num, audio_start, audio_end in quarter_intervals:
+        quarter_plays = [p for p in plays if p.get('QuarterName') == str(quarter_num)]
+
+        if not quarter_plays:
+            continue
+
+        audio_duration = audio_end - audio_start
+
+        first_play_time = datetime.fromisoformat(quarter_plays[0]['PlayTime'])
+        last_play_time = datetime.fromisoformat(quarter_plays[-1]['PlayTime'])
+        playbyplay_duration = (last_play_time - first_play_time).total_seconds()
+
+        processed_plays = []
+        timeout_accumulated = 0.0
+
+        for i, play in enumerate(quarter_plays):
+            play_time = datetime.fromisoformat(play['PlayTime'])
+
+            if play.get('Type', '').lower() == 'timeout':
+                if i + 1 < len(quarter_plays):
+                    next_play_time = datetime.fromisoformat(quarter_plays[i + 1]['PlayTime'])
+                    timeout_accumulated += (next_play_time - play_time).total_seconds()
+                continue
+
+            relative_time = (play_time - first_play_time).total_seconds()
+            processed_plays.append((play, relative_time - timeout_accumulated))
+
+        adjusted_duration = playbyplay_duration - timeout_accumulated
+        scaling_factor = audio_duration / adjusted_duration if adjusted_duration > 0 else 1.0
+
+        for play, relative_time in processed_plays:
+            scaled_time = relative_time * scaling_factor
+
+            play_data = play.copy()
+            play_data['secondsSinceQuarterStarted'] = round(scaled_time, 2)
+            play_data['absoluteAudioTimestamp'] = round(audio_start + scaled_time, 2)
+            play_data['quarter'] = quarter_num
+
+            all_processed_plays.append(play_data)
+
+    return all_processed_plays
+
+
+def parse_segment_timestamp(filename: str) -> float:
+    """
+    Start time in seconds from a segment filename like
+    0001_00-00-05.279_description (same parsing as the stream server).
+    """
+    parts = filename.split('-')
+    if len(parts) < 3:
+        return 0.0
+
+    hours = int(parts[0].split('_')[-1])
+    minutes = int(parts[1])
+    seconds = float(parts[2][:6])
+    return hours * 3600 + minutes * 60 + seconds
+
+
+class SegmentDirSource:
+    """Audio from the per-segment WAV files, ordered by filename timestamp."""
+
+    sr = None  # Each clip carries its own rate in its WAV header
+
+    def __init__(self, directory: Union[str, Path]):
+        files = [
+            (parse_segment_timestamp(path.name), path)
+            for path in Path(directory).iterdir() if path.is_file()
+        ]
+        files.sort(key=lambda f: f[0])
+        self.timestamps = [ts for ts, _ in files]
+        self.paths = [path for _, path in files]
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def clip(self, i: int) -> bytes:
+        return self.paths[i].read_bytes()
+
+    def close(self):
+        pass
+
+
+class WavFileSource:
+    """
+    Fixed-length clips from one full-game WAV. The file is memory-mapped and
+    only the clips that are scored are ever decoded.
+    """
+
+    def __init__(self, path: Union[str, Path], segment_seconds: float = OFFLINE_SEGMENT_SECONDS):
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, channels, self.sr, bits, _, data_size = parse_wav_header(self._mmap)
+        total_frames = data_size // max(1, channels * (bits // 8))
+        self.frames_per_clip = max(1, int(round(segment_seconds * self.sr)))
+        n_clips = -(-total_frames // self.frames_per_clip)
+        self.timestamps = [i * self.frames_per_clip / self.sr for i in range(n_clips)]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def clip(self, i: int) -> np.ndarray:
+        audio, _ = decode_wav(self._mmap, i * self.frames_per_clip, self.frames_per_clip)
+        return audio
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+
+def plan_audio_windows(
+    plays: List[dict],
+    timestamps: Sequence[float],
+    context_segments: int
+) -> List[List[int]]:
+    """
+    Segment indices each play would use in the streaming detector: the
+    nearest segment and ±context_segments around it.
+    """
+    if not len(timestamps):
+        return [[] for _ in plays]
+
+    ring: AudioRingBuffer[int] = AudioRingBuffer(len(timestamps))
+    for i, ts in enumerate(timestamps):
+        ring.append(i, ts)
+
+    return [
+        ring.window(ring.nearest_index(play.get('absoluteAudioTimestamp', 0.0)), context_segments)
+        for play in plays
+    ]
+
+
+def score_audio_segments(
+    source,
+    indices: Sequence[int],
+    max_batch_size: Optional[int] = None,
+    chunk_clips: int = OFFLINE_CHUNK_CLIPS
+) -> Dict[int, float]:
+    """
+    Score segments by index (excitement, 0-100), in chunks of `chunk_clips`.
+    A failed chunk falls back to one clip at a time; clips that still fail
+    score 0.
+    """
+    scores: Dict[int, float] = {}
+    indices = sorted(set(indices))
+
+    for start in range(0, len(indices), chunk_clips):
+        chunk = indices[start:start + chunk_clips]
+        clips = [source.clip(i) for i in chunk]
+        try:
+            results = audio_sentiment.score_clips(clips, sr=source.sr, max_batch_size=max_batch_size)
+        except Exception as e:
+            logger.error(f"Error batch scoring {len(clips)} segments: {e}")
+            results = []
+            for i, clip in zip(chunk, clips):
+                try:
+                    results.append(audio_sentiment.score_clip(clip, sr=source.sr))
+                except Exception as e:
+                    logger.error(f"Error scoring segment {i}: {e}")
+                    results.append({})
+
+        for i, result in zip(chunk, results):
+            scores[i] = result.get('excited_audio', 0.0) * 100
+
+        logger.info(f"Scored {min(start + chunk_clips, len(indices))}/{len(indices)} segments")
+
+    return scores
+
+
+def run_offline_detection(
+    play_by_play_path: Union[str, Path],
+    segments_dir: Optional[Union[str, Path]] = None,
+    audio_file: Optional[Union[str, Path]] = None,
+    intervals: Sequence[float] = DEFAULT_QUARTER_INTERVALS,
+    segment_seconds: float = OFFLINE_SEGMENT_SECONDS,
+    audio_weight: float = 0.3,
+    play_weight: float = 0.7,
+    key_moment_threshold: float = 50.0,
+    context_segments: int = 2,
+    max_batch_size: Optional[int] = None
+) -> KeyMomentDetector:
+    """
+    Detect key moments for a whole game from files on disk.
+
+    Pass either `segments_dir` (per-segment WAVs, as served by /stream/audio)
+    or `audio_file` (one WAV for the game, sliced into `segment_seconds`
+    clips). Segment timestamps are absolute game-audio times, matching the
+    plays' 'absoluteAudioTimestamp'.
+
+    Returns:
+        The detector holding every moment; use export_moments_summary() or
+        get_top_moments() on it
+    """
+    if (segments_dir is None) == (audio_file is None):
+        raise ValueError("Pass exactly one of segments_dir or audio_file")
+
+    plays = align_plays_to_audio(load_play_by_play(play_by_play_path), intervals)
+    source = SegmentDirSource(segments_dir) if segments_dir else WavFileSource(audio_file, segment_seconds)
+
+    detector = KeyMomentDetector(
+        play_weight=play_weight,
+        audio_weight=audio_weight,
+        key_moment_threshold=key_moment_threshold,
+        context_segments=context_segments,
+        moment_store=MomentStore(recent_limit=len(plays))  # Keep the whole game
+    )
+
+    try:
+        logger.info(f"Offline detection: {len(plays)} plays, {len(source)} audio segments")
+        windows = plan_audio_windows(plays, source.timestamps, context_segments)
+        needed = {i for window in windows for i in window}
+        scores = score_audio_segments(source, needed, max_batch_size=max_batch_size)
+    finally:
+        source.close()
+
+    for play, window in zip(plays, windows):
+        audio_score = sum(scores[i] for i in window) / len(window) if window else 0.0
+        detector.detected_moments.append(detector.build_moment(play, audio_score, window))
+
+    logger.info(
+        f"Offline detection finished: {detector.detected_moments.total_count} plays, "
+        f"{detector.detected_moments.key_count} key moments"
+    )
+    return detector
@@ -0,0 +1,103 @@
+"""
+Play/Audio Join
+
+Plays can arrive before the audio around them. Instead of scoring whatever
+happens to be buffered, plays are parked in a FIFO until the audio watermark
+covers them (the readiness check passes), or until a wall-clock max wait
+expires, after which they are emitted with whatever audio is available.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PlayAudioJoin:
+    """
+    Bounded-wait join of play events against the audio watermark.
+
+    Args:
+        is_ready: Returns True once enough audio has arrived for a play
+        emit: Coroutine called as emit(play, partial) in arrival order;
+            `partial` is True if the play was released before it was ready
+        max_wait: Seconds a play may wait for audio before being emitted anyway
+    """
+
+    def __init__(
+        self,
+        is_ready: Callable[[dict], bool],
+        emit: Callable[[dict, bool], Awaitable[None]],
+        max_wait: float = 5.0
+    ):
+        self.is_ready = is_ready
+        self.emit = emit
+        self.max_wait = max_wait
+
+        self._pending: Deque[Tuple[float, dict]] = deque()
+        self._wakeup = asyncio.Event()
+        self._audio_done = False
+        self._closed = False
+
+        self.released_partial = 0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def submit(self, play: dict):
+        """Park a play until its audio arrives (or max_wait passes)."""
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        self._pending.append((deadline, play))
+        self._wakeup.set()
+
+    def notify_audio(self):
+        """New audio arrived - re-check parked plays."""
+        if self._pending:
+            self._wakeup.set()
+
+    def audio_finished(self):
+        """No more audio is coming - release everything as soon as possible."""
+        self._audio_done = True
+        self._wakeup.set()
+
+    def close(self):
+        """No more plays are coming; `run` returns once the queue drains."""
+        self._closed = True
+        self._wakeup.set()
+
+    async def run(self):
+        """Release plays in order as they become ready or time out."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            # Clear before releasing so wakeups during emit() aren't lost
+            self._wakeup.clear()
+            await self._release(loop.time())
+
+            if self._closed and not self._pending:
+                return
+
+            timeout = None
+            if self._pending:
+                timeout = max(0.0, self._pending[0][0] - loop.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _release(self, now: float):
+        while self._pending:
+            deadline, play = self._pending[0]
+            ready = self.is_ready(play)
+            if not (ready or self._audio_done or now >= deadline):
+                break  # FIFO: later plays need even more audio
+
+            self._pending.popleft()
+            if not ready:
+                self.released_partial += 1
+                logger.debug(f"Releasing play without full audio ({len(self._pending)} still pending)")
+            await self.emit(play, not ready)
+            now = asyncio.get_running_loop().time()
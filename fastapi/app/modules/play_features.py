@@ -0,0 +1,136 @@
+"""
+Play Features
+
+One normalized, slotted record per play with everything the scoring rules
+read: numeric fields, the parsed yard line and clock, the score
+differential, the lowercased play text and its keyword bits. It is built
+once from whatever shape the play arrived in (a `Play` model, a scoring dict
+or a stream server event) and passed to the scoring code from there.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from .models import Play
+from .play_keywords import keyword_text, match_keywords
+from .scoring_rules import situation_flags
+
+
+def _parse_int(text: str) -> Optional[int]:
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def parse_yard_line(yard_line) -> Tuple[Optional[int], bool]:
+    """
+    Yards to the opponent's goal from 'OPP n' / 'OWN n' (None if it can't be
+    parsed), and whether the play is in the red zone ('OPP n' with n <= 20).
+    """
+    if yard_line is None:
+        return None, False
+    text = str(yard_line)
+    if 'OPP' in text:
+        yards = _parse_int(text.replace('OPP', ''))
+        return yards, yards is not None and yards <= 20
+    if 'OWN' in text:
+        yards = _parse_int(text.replace('OWN', ''))
+        return (None if yards is None else 100 - yards), False
+    return None, False
+
+
+def parse_clock(time_str) -> Optional[int]:
+    """Seconds left in the quarter from a 'MM:SS' clock, None if unparseable."""
+    if not time_str or not isinstance(time_str, str):
+        return None
+    parts = time_str.split(':')
+    if len(parts) != 2:
+        return None
+    minutes, seconds = _parse_int(parts[0]), _parse_int(parts[1])
+    if minutes is None or seconds is None:
+        return None
+    return minutes * 60 + seconds
+
+
+@dataclass(slots=True)
+class PlayFeatures:
+    down: Optional[int]
+    distance: Optional[int]
+    quarter: Optional[int]
+    yards_gained: Optional[int]
+    yard_line: Optional[str]
+    yards_to_goal: Optional[int]
+    redzone: bool
+    clock_seconds: Optional[int]
+    score_diff: Optional[int]
+    play_type: str
+    description: str
+    text: str  # Lowercased '<play type> <description>' the keywords came from
+    keywords: int  # play_keywords.Keyword bits
+    flags: int  # keywords | scoring_rules.Situation bits
+
+    @property
+    def time_remaining(self) -> Optional[int]:
+        """Clock seconds in the 4th quarter (the only quarter scoring uses it)."""
+        return self.clock_seconds if self.quarter == 4 else None
+
+    @classmethod
+    def build(
+        cls, down=None, distance=None, quarter=None, yards_gained=0, yard_line=None,
+        play_type=None, description=None, time=None, score_home=None, score_away=None
+    ) -> "PlayFeatures":
+        yards_to_goal, redzone = parse_yard_line(yard_line)
+        clock_seconds = parse_clock(time)
+        score_diff = abs(score_home - score_away) if score_home is not None and score_away is not None else None
+        text, type_end = keyword_text(play_type, description)
+        keywords = match_keywords(text, type_end)
+        time_remaining = clock_seconds if quarter == 4 else None
+
+        return cls(
+            down=down,
+            distance=distance,
+            quarter=quarter,
+            yards_gained=yards_gained,
+            yard_line=yard_line,
+            yards_to_goal=yards_to_goal,
+            redzone=redzone,
+            clock_seconds=clock_seconds,
+            score_diff=score_diff,
+            play_type=play_type or '',
+            description=description or '',
+            text=text,
+            keywords=keywords,
+            flags=keywords | situation_flags(
+                down, distance, quarter, yards_gained, redzone, score_diff, time_remaining
+            )
+        )
+
+    @classmethod
+    def from_play(cls, play) -> "PlayFeatures":
+        """From a `Play` model or a dict with the same field names."""
+        if isinstance(play, PlayFeatures):
+            return play
+        if isinstance(play, Play):
+            return cls.build(
+                down=play.Down, distance=play.Distance, quarter=play.Quarter,
+                yards_gained=play.YardsGained or 0, yard_line=play.YardLine,
+                play_type=play.PlayType, description=play.Description, time=play.Time,
+                score_home=play.ScoreHome, score_away=play.ScoreAway
+            )
+        return cls.build(
+            down=play.get('Down'), distance=play.get('Distance'), quarter=play.get('Quarter'),
+            yards_gained=play.get('YardsGained', 0), yard_line=play.get('YardLine'),
+            play_type=play.get('PlayType'), description=play.get('Description'), time=play.get('Time'),
+            score_home=play.get('ScoreHome'), score_away=play.get('ScoreAway')
+        )
+
+    @classmethod
+    def from_stream_play(cls, play: dict) -> "PlayFeatures":
+        """From a /stream/events play ('Type', lowercase 'quarter', 'PlayTime')."""
+        return cls.build(
+            down=play.get('Down'), distance=play.get('Distance'), quarter=play.get('quarter'),
+            yards_gained=play.get('YardsGained', 0), yard_line=play.get('YardLine'),
+            play_type=play.get('Type'), description=play.get('Description'), time=play.get('PlayTime'),
+            score_home=play.get('ScoreHome'), score_away=play.get('ScoreAway')
+        )
@@ -0,0 +1,160 @@
+"""
+Play Keyword Matching
+
+Every keyword the play scoring rules look for, compiled once into a single
+regex. A play's text is lowercased and scanned once, and the result is a
+bit set of `Keyword` flags the rules test with `&`.
+
+Keywords match at word starts: full words may carry a suffix ('sack' also
+matches 'sacked', 'fumble' matches 'fumbles'), abbreviations must be the
+whole word ('int' no longer matches 'point' or 'intended', 'pat' no longer
+matches 'patriots'). CamelCase play types from the stream ('FieldGoal',
+'PassIntercepted') are split into words first.
+"""
+
+import re
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class Keyword:
+    """Bit flags for matched keywords (plain ints so `&` tests stay cheap)."""
+    TOUCHDOWN = 1 << 0
+    TD = 1 << 1  # Only counted in the play type
+    INTERCEPTION = 1 << 2
+    INT = 1 << 3
+    FUMBLE = 1 << 4
+    FORCED = 1 << 5
+    RECOVERY = 1 << 6
+    SACK = 1 << 7
+    TACKLE_FOR_LOSS = 1 << 8
+    TFL = 1 << 9
+    SAFETY = 1 << 10
+    PUNT = 1 << 11
+    KICKOFF = 1 << 12
+    FIELD_GOAL = 1 << 13
+    EXTRA_POINT = 1 << 14
+    FG = 1 << 15
+    PAT = 1 << 16
+
+
+# Category groups (same keywords as the old per-category lists; 'forced
+# fumble', 'fumble recovery' and 'strip sack' are covered by FUMBLE/SACK)
+DEFENSIVE = (Keyword.INTERCEPTION | Keyword.INT | Keyword.FUMBLE | Keyword.SACK
+             | Keyword.TACKLE_FOR_LOSS | Keyword.SAFETY)
+SPECIAL_TEAMS = (Keyword.PUNT | Keyword.KICKOFF | Keyword.FIELD_GOAL | Keyword.EXTRA_POINT
+                 | Keyword.FG | Keyword.PAT)
+
+# Words that raise each flag; full words take suffixes, abbreviations don't
+_WORDS = [
+    (Keyword.TOUCHDOWN, 'touchdown'),
+    (Keyword.INTERCEPTION, 'interception'),
+    (Keyword.INTERCEPTION, 'intercepted'),
+    (Keyword.FUMBLE, 'fumble'),
+    (Keyword.FORCED, 'forced'),
+    (Keyword.RECOVERY, 'recovery'),
+    (Keyword.SACK, 'sack'),
+    (Keyword.TACKLE_FOR_LOSS, 'tackle for loss'),
+    (Keyword.SAFETY, 'safety'),
+    (Keyword.PUNT, 'punt'),
+    (Keyword.KICKOFF, 'kickoff'),
+    (Keyword.FIELD_GOAL, 'field goal'),
+    (Keyword.EXTRA_POINT, 'extra point'),
+]
+_ABBREVIATIONS = [
+    (Keyword.TD, 'td'),
+    (Keyword.INT, 'int'),
+    (Keyword.TFL, 'tfl'),
+    (Keyword.FG, 'fg'),
+    (Keyword.PAT, 'pat'),
+]
+
+
+def _compile():
+    """
+    One alternation per first letter, each branch starting with a literal so
+    the regex engine can skip to candidate letters; `(?<!\\w.)` after the
+    first letter makes it a word start.
+    """
+    entries = [(flag, word, r'\w*') for flag, word in _WORDS]
+    entries += [(flag, word, r'\b') for flag, word in _ABBREVIATIONS]
+
+    by_letter = {}
+    for i, (_, word, suffix) in enumerate(entries):
+        by_letter.setdefault(word[0], []).append(f"(?P<k{i}>{re.escape(word[1:])}{suffix})")
+
+    pattern = '|'.join(
+        f"{re.escape(letter)}(?<!\\w.)(?:{'|'.join(branches)})"
+        for letter, branches in by_letter.items()
+    )
+    return re.compile(pattern), {f"k{i}": flag for i, (flag, _, _) in enumerate(entries)}
+
+
+_PATTERN, _GROUP_FLAGS = _compile()
+_CAMEL_CASE = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+
+def keyword_text(play_type: Optional[str], description: Optional[str]) -> Tuple[str, int]:
+    """
+    The lowercased text the matcher scans ('<play type> <description>', with
+    CamelCase types split into words) and where the play type part ends.
+    """
+    play_type = _CAMEL_CASE.sub(' ', play_type or '')
+    return f"{play_type} {description or ''}".lower(), len(play_type)
+
+
+def match_keywords(text: str, type_end: int) -> int:
+    """Keyword bit set for text from `keyword_text`, in one scan."""
+    flags = 0
+    for match in _PATTERN.finditer(text):
+        flag = _GROUP_FLAGS[match.lastgroup]
+        if flag != Keyword.TD or match.start() < type_end:
+            flags |= flag
+    return flags
+
+
+def match_play_keywords(play_type: Optional[str], description: Optional[str]) -> int:
+    """
+    All scoring keywords in a play's type and description, in one scan.
+
+    Args:
+        play_type: Play type ('Rush', 'PassIntercepted', ...), may be None
+        description: Play description, may be None
+
+    Returns:
+        Bit set of matched `Keyword` flags
+    """
+    return match_keywords(*keyword_text(play_type, description))
+
+
+def match_play_keywords_batch(play_types: Sequence[Optional[str]], descriptions: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    `match_play_keywords` for many plays: one regex scan over all play texts
+    joined by newlines, with matches mapped back to rows by offset.
+
+    Returns:
+        int64 array of keyword bit sets, one per play
+    """
+    # Play types repeat, so split CamelCase once per distinct type
+    split_types = {t: _CAMEL_CASE.sub(' ', t or '') for t in set(play_types)}
+    types = [split_types[t] for t in play_types]
+    texts = [f"{t} {d or ''}".lower() for t, d in zip(types, descriptions)]
+
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+    type_ends = starts + np.fromiter(map(len, types), dtype=np.int64, count=len(types))
+
+    positions, values = [], []
+    for match in _PATTERN.finditer('\n'.join(texts)):
+        positions.append(match.start())
+        values.append(_GROUP_FLAGS[match.lastgroup])
+
+    flags = np.zeros(len(texts), dtype=np.int64)
+    if positions:
+        positions = np.array(positions, dtype=np.int64)
+        values = np.array(values, dtype=np.int64)
+        rows = np.searchsorted(starts, positions, side='right') - 1
+        keep = (values != Keyword.TD) | (positions < type_ends[rows])
+        np.bitwise_or.at(flags, rows[keep], values[keep])
+    return flags
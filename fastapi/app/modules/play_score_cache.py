@@ -0,0 +1,112 @@
+"""
+Play Score Cache
+
+Memoizes `calculate_play_criticality_score` for plays that get scored over
+and over: every /getkeymoments client replays the same game events, and the
+UI posts the same play to /score-play repeatedly. Hits skip parsing the play
+and evaluating the rules.
+
+A play is keyed by its PlayID when it has one, otherwise by the raw values of
+the fields scoring reads. The key also holds the active rule table (so a
+reloaded table misses instead of serving old scores) and, when a game state
+is passed, the parts of it scoring uses.
+"""
+
+import os
+import threading
+from typing import Hashable, Optional
+
+from .game_state import GameState
+from .lru import LRUCache
+from .models import Play
+from .play_features import PlayFeatures
+from .scoring import calculate_play_criticality_score
+from .scoring_rules import get_scoring_rules
+
+# Play scores kept in memory (0 = no caching)
+KEY_MOMENT_SCORE_CACHE_ITEMS = int(os.getenv("KEY_MOMENT_SCORE_CACHE_ITEMS", "16384"))
+
+# Fields scoring reads from a scoring dict / `Play`, and from a stream event
+PLAY_FIELDS = ('Down', 'Distance', 'Quarter', 'YardsGained', 'YardLine', 'PlayType', 'Description', 'Time',
+               'ScoreHome', 'ScoreAway')
+STREAM_FIELDS = ('Down', 'Distance', 'quarter', 'YardsGained', 'YardLine', 'Type', 'Description', 'PlayTime',
+                 'ScoreHome', 'ScoreAway')
+
+_MISSING = object()  # A missing field scores differently from an explicit None
+
+
+def play_key(play, stream: bool = False) -> Optional[Hashable]:
+    """Cache key for a play dict or `Play`; None if it can't be keyed."""
+    if isinstance(play, Play):
+        return ('model',) + tuple(play.__dict__.get(name) for name in PLAY_FIELDS)
+    if not isinstance(play, dict):
+        return None
+    kind = 'stream' if stream else 'dict'
+    play_id = play.get('PlayID')
+    if play_id is not None:
+        return (kind, 'id', play_id)
+    return (kind,) + tuple(play.get(name, _MISSING) for name in (STREAM_FIELDS if stream else PLAY_FIELDS))
+
+
+def _state_key(game_state: Optional[GameState]) -> Optional[tuple]:
+    """What `GameState.apply` reads, frozen (the state itself changes every play)."""
+    if game_state is None:
+        return None
+    return (game_state.quarter, game_state.clock_seconds, game_state.score_diff, game_state.flags)
+
+
+class PlayScoreCache:
+    """Bounded LRU of (score, play_category, breakdown) with hit/miss counters."""
+
+    def __init__(self, maxsize: int = KEY_MOMENT_SCORE_CACHE_ITEMS):
+        self.memory = LRUCache(maxsize)
+
+    def score(self, play, game_state: Optional[GameState] = None, stream: bool = False):
+        """
+        `calculate_play_criticality_score(play, game_state)`, memoized. With
+        `stream`, `play` is a /stream/events play.
+
+        Returns:
+            (score, play_category, breakdown); the breakdown is a fresh dict
+        """
+        key = play_key(play, stream)
+        if key is not None:
+            try:
+                key = (get_scoring_rules(), key, _state_key(game_state))
+                cached = self.memory.get(key)
+            except TypeError:  # Unhashable field values
+                key = cached = None
+            if cached is not None:
+                score, play_category, breakdown = cached
+                return score, play_category, dict(breakdown)
+
+        features = PlayFeatures.from_stream_play(play) if stream else play
+        score, play_category, breakdown = calculate_play_criticality_score(features, game_state)
+        if key is not None:
+            self.memory.put(key, (score, play_category, dict(breakdown)))
+        return score, play_category, breakdown
+
+    def stats(self) -> dict:
+        return self.memory.stats()
+
+    def clear(self):
+        self.memory.clear()
+
+
+_cache: Optional[PlayScoreCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_play_score_cache() -> PlayScoreCache:
+    """The process-wide play score cache (size 0 = every call is a miss)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PlayScoreCache()
+    return _cache
+
+
+def score_play_cached(play, game_state: Optional[GameState] = None, stream: bool = False):
+    """`PlayScoreCache.score` on the process-wide cache."""
+    return get_play_score_cache().score(play, game_state, stream)
@@ -0,0 +1,332 @@
+"""
+Scoring Rule Table
+
+The play criticality points as data instead of if-chains. Each rule is a
+breakdown key, a point value and a list of conditions on play features; the
+table is compiled once into bit masks, so a play is one feature bit set and
+every rule test is an integer `&`, for a single play or a NumPy array of
+them.
+
+Features are the `play_keywords.Keyword` flags (lowercased: 'touchdown',
+'int', 'punt', ...) plus the game situation flags in `Situation`. A
+condition is a feature name, '!name' (must not be set) or 'a|b' (either).
+Rules sharing a `group` form an if/elif chain: only the first match scores.
+
+Set KEY_MOMENT_SCORING_RULES to a JSON file with the same shape as
+DEFAULT_RULES to override the table; it is reloaded when the file changes.
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .play_keywords import Keyword
+
+logger = logging.getLogger(__name__)
+
+# JSON rule table overriding DEFAULT_RULES (unset = built-in table)
+KEY_MOMENT_SCORING_RULES = os.getenv("KEY_MOMENT_SCORING_RULES", "")
+# Seconds between checks of the rule file for changes
+KEY_MOMENT_SCORING_RULES_CHECK_SECONDS = float(os.getenv("KEY_MOMENT_SCORING_RULES_CHECK_SECONDS", "5"))
+
+
+class Situation:
+    """Game situation flags (above the keyword bits)."""
+    THIRD_DOWN = 1 << 32
+    FOURTH_DOWN = 1 << 33
+    HAS_DISTANCE = 1 << 34
+    LONG_DISTANCE = 1 << 35  # 7+ yards to go
+    CONVERTED = 1 << 36  # Gained at least the distance
+    LOSS = 1 << 37
+    GAIN_10 = 1 << 38
+    GAIN_15 = 1 << 39
+    GAIN_25 = 1 << 40
+    REDZONE = 1 << 41
+    FOURTH_QUARTER = 1 << 42
+    FINAL_TWO_MINUTES = 1 << 43
+    CLOSE_GAME = 1 << 44  # Within 7 points
+    # Only set when scoring with a game_state.GameState
+    LONG_DRIVE = 1 << 45  # 8+ plays into the drive
+    STOP_STREAK = 1 << 46  # Offense stopped on its last 3+ drives
+
+
+FEATURES: Dict[str, int] = {
+    name.lower(): value
+    for cls in (Keyword, Situation)
+    for name, value in vars(cls).items() if name.isupper()
+}
+
+DEFAULT_RULES = {
+    "offensive": [
+        {"key": "touchdown", "points": 50, "when": ["touchdown|td"]},
+        {"key": "third_down_long", "points": 20, "when": ["third_down", "long_distance"], "group": "third_down"},
+        {"key": "third_down", "points": 15, "when": ["third_down", "has_distance"], "group": "third_down"},
+        {"key": "third_down_conversion", "points": 15, "when": ["third_down", "converted"]},
+        {"key": "fourth_down_attempt", "points": 30, "when": ["fourth_down", "!punt"]},
+        {"key": "fourth_down_conversion", "points": 20, "when": ["fourth_down", "!punt", "converted"]},
+        {"key": "redzone", "points": 15, "when": ["redzone"]},
+        {"key": "big_gain_25plus", "points": 20, "when": ["gain_25"], "group": "gain"},
+        {"key": "big_gain_15plus", "points": 12, "when": ["gain_15"], "group": "gain"},
+        {"key": "gain_10plus", "points": 6, "when": ["gain_10"], "group": "gain"},
+        {"key": "fourth_quarter", "points": 5, "when": ["fourth_quarter"]},
+        {"key": "final_two_minutes", "points": 15, "when": ["fourth_quarter", "final_two_minutes"]},
+        {"key": "close_game", "points": 15, "when": ["fourth_quarter", "close_game"]},
+        {"key": "field_goal", "points": 10, "when": ["field_goal|fg"]},
+        {"key": "fg_from_redzone", "points": 5, "when": ["field_goal|fg", "redzone"]},
+        {"key": "long_drive_score", "points": 5, "when": ["long_drive", "touchdown|td|field_goal|fg"]},
+    ],
+    "defensive": [
+        {"key": "interception", "points": 45, "when": ["interception|int"]},
+        {"key": "pick_six", "points": 30, "when": ["interception|int", "touchdown"]},
+        {"key": "fumble_recovery", "points": 40, "when": ["fumble", "forced|recovery"]},
+        {"key": "fumble_td", "points": 30, "when": ["fumble", "forced|recovery", "touchdown"]},
+        {"key": "sack", "points": 20, "when": ["sack"]},
+        {"key": "strip_sack", "points": 15, "when": ["sack", "fumble"]},
+        {"key": "tackle_for_loss", "points": 12, "when": ["tackle_for_loss|tfl"]},
+        {"key": "safety", "points": 50, "when": ["safety"]},
+        {"key": "third_down_stop_loss", "points": 10, "when": ["third_down", "loss"]},
+        {"key": "third_down_stop", "points": 8, "when": ["third_down"]},
+        {"key": "fourth_down_stop", "points": 25, "when": ["fourth_down"]},
+        {"key": "fourth_quarter", "points": 8, "when": ["fourth_quarter"]},
+        {"key": "final_two_minutes", "points": 20, "when": ["fourth_quarter", "final_two_minutes"]},
+        {"key": "close_game", "points": 15, "when": ["fourth_quarter", "close_game"]},
+        {"key": "stop_streak", "points": 5, "when": ["stop_streak"]},
+    ],
+}
+
+
+def situation_flags(down, distance, quarter, yards_gained, redzone, score_diff, time_remaining) -> int:
+    """Situation bits for one play (None = unknown, never matches)."""
+    flags = 0
+    if down == 3:
+        flags |= Situation.THIRD_DOWN
+    elif down == 4:
+        flags |= Situation.FOURTH_DOWN
+    if distance is not None:
+        flags |= Situation.HAS_DISTANCE
+        if distance >= 7:
+            flags |= Situation.LONG_DISTANCE
+        if yards_gained is not None and yards_gained >= distance:
+            flags |= Situation.CONVERTED
+    if yards_gained is not None:
+        if yards_gained < 0:
+            flags |= Situation.LOSS
+        if yards_gained >= 10:
+            flags |= Situation.GAIN_10
+        if yards_gained >= 15:
+            flags |= Situation.GAIN_15
+        if yards_gained >= 25:
+            flags |= Situation.GAIN_25
+    if redzone:
+        flags |= Situation.REDZONE
+    if quarter == 4:
+        flags |= Situation.FOURTH_QUARTER
+    if time_remaining is not None and time_remaining <= 120:
+        flags |= Situation.FINAL_TWO_MINUTES
+    if score_diff is not None and score_diff <= 7:
+        flags |= Situation.CLOSE_GAME
+    return flags
+
+
+def situation_flags_batch(down, distance, quarter, yards_gained, redzone, score_diff, time_remaining) -> np.ndarray:
+    """
+    `situation_flags` over float arrays (NaN = unknown, never matches).
+    There is no game state here, so LONG_DRIVE and STOP_STREAK are never set.
+    """
+    conditions = [
+        (down == 3, Situation.THIRD_DOWN),
+        (down == 4, Situation.FOURTH_DOWN),
+        (~np.isnan(distance), Situation.HAS_DISTANCE),
+        (distance >= 7, Situation.LONG_DISTANCE),
+        (yards_gained >= distance, Situation.CONVERTED),
+        (yards_gained < 0, Situation.LOSS),
+        (yards_gained >= 10, Situation.GAIN_10),
+        (yards_gained >= 15, Situation.GAIN_15),
+        (yards_gained >= 25, Situation.GAIN_25),
+        (redzone, Situation.REDZONE),
+        (quarter == 4, Situation.FOURTH_QUARTER),
+        (time_remaining <= 120, Situation.FINAL_TWO_MINUTES),
+        (score_diff <= 7, Situation.CLOSE_GAME),
+    ]
+    flags = np.zeros(len(down), dtype=np.int64)
+    for mask, flag in conditions:
+        flags |= np.where(mask, flag, 0)
+    return flags
+
+
+@dataclass(frozen=True)
+class ScoringRule:
+    key: str
+    points: float
+    when: Tuple[str, ...]
+    group: Optional[str] = None
+
+
+class CompiledRules:
+    """
+    One side's rules (offensive or defensive) as feature bit masks.
+
+    `evaluate(features, breakdown)` is generated Python (one `if` per rule,
+    like a hand-written chain), so a single play pays no interpretation
+    overhead; `evaluate_batch` applies the same masks to arrays.
+    """
+
+    def __init__(self, rules: List[ScoringRule]):
+        self.rules = rules
+        groups = {}
+        self._compiled = []
+        for rule in rules:
+            required = forbidden = 0
+            any_of = []
+            for condition in rule.when:
+                if condition.startswith('!'):
+                    forbidden |= _feature(condition[1:], rule.key)
+                elif '|' in condition:
+                    mask = 0
+                    for name in condition.split('|'):
+                        mask |= _feature(name, rule.key)
+                    any_of.append(mask)
+                else:
+                    required |= _feature(condition, rule.key)
+            group_bit = groups.setdefault(rule.group, 1 << len(groups)) if rule.group else 0
+            self._compiled.append((rule.key, rule.points, required, forbidden, tuple(any_of), group_bit))
+        self.evaluate = self._build_evaluator()
+
+    def _build_evaluator(self):
+        """Generate `evaluate(features, breakdown) -> score` for this table."""
+        lines = ["def evaluate(features, breakdown):", "    score = 0.0", "    taken = 0"]
+        for key, points, required, forbidden, any_of, group_bit in self._compiled:
+            tests = [f"features & {required} == {required}"] if required else []
+            if forbidden:
+                tests.append(f"not features & {forbidden}")
+            tests += [f"features & {mask}" for mask in any_of]
+            if group_bit:
+                tests.append(f"not taken & {group_bit}")
+            lines.append(f"    if {' and '.join(tests) or 'True'}:")
+            lines.append(f"        score += {points!r}")
+            lines.append(f"        breakdown[{key!r}] = {points!r}")
+            if group_bit:
+                lines.append(f"        taken |= {group_bit}")
+        lines.append("    return score")
+
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        return namespace["evaluate"]
+
+    def evaluate_batch(self, features: np.ndarray) -> np.ndarray:
+        """Scores for an int64 array of feature bits."""
+        score = np.zeros(len(features))
+        taken = {}
+        for key, points, required, forbidden, any_of, group_bit in self._compiled:
+            match = ((features & required) == required) & ((features & forbidden) == 0)
+            for mask in any_of:
+                match &= (features & mask) != 0
+            if group_bit:
+                done = taken.get(group_bit, np.zeros(len(features), dtype=bool))
+                match &= ~done
+                taken[group_bit] = done | match
+            score += points * match
+        return score
+
+
+def _feature(name: str, key: str) -> int:
+    try:
+        return FEATURES[name.strip()]
+    except KeyError:
+        raise ValueError(f"Unknown feature '{name}' in scoring rule '{key}'") from None
+
+
+@dataclass(frozen=True)
+class ScoringRules:
+    offensive: CompiledRules
+    defensive: CompiledRules
+
+    @classmethod
+    def from_dict(cls, table: dict) -> "ScoringRules":
+        """Compile a rule table shaped like DEFAULT_RULES (ValueError if invalid)."""
+        if not isinstance(table, dict):
+            raise ValueError("Scoring rules must be an object with 'offensive' and 'defensive' lists")
+        sides = {}
+        for side in ("offensive", "defensive"):
+            if not isinstance(table.get(side), list):
+                raise ValueError(f"Scoring rules missing '{side}' list")
+            rules = []
+            for rule in table[side]:
+                if not isinstance(rule, dict) or "key" not in rule:
+                    raise ValueError(f"Scoring rule {rule!r} in '{side}' must be an object with a 'key'")
+                if not isinstance(rule.get("points"), (int, float)) or not math.isfinite(rule["points"]):
+                    raise ValueError(f"Scoring rule '{rule['key']}' needs numeric points")
+                when = rule.get("when", [])
+                if not isinstance(when, list) or not all(isinstance(c, str) for c in when):
+                    raise ValueError(f"Scoring rule '{rule['key']}' needs 'when' as a list of strings")
+                group = rule.get("group")
+                if group is not None and not isinstance(group, str):
+                    raise ValueError(f"Scoring rule '{rule['key']}' has a non-string group")
+                rules.append(ScoringRule(
+                    key=str(rule["key"]),
+                    points=rule["points"],
+                    when=tuple(when),
+                    group=group
+                ))
+            sides[side] = CompiledRules(rules)
+        return cls(**sides)
+
+
+def load_scoring_rules(path: Union[str, Path]) -> ScoringRules:
+    """Compile a JSON rule table file."""
+    with open(path, 'r') as f:
+        table = json.load(f)
+    try:
+        return ScoringRules.from_dict(table)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid scoring rules in {path}: {e}") from e
+
+
+_rules = ScoringRules.from_dict(DEFAULT_RULES)
+_rules_mtime = None
+_next_check = 0.0
+_reload_lock = threading.Lock()
+
+
+def get_scoring_rules() -> ScoringRules:
+    """
+    The active rule table. With KEY_MOMENT_SCORING_RULES set, the file is
+    checked for changes at most every KEY_MOMENT_SCORING_RULES_CHECK_SECONDS
+    and recompiled when it changes; a bad file keeps the previous table.
+    """
+    global _rules, _rules_mtime, _next_check
+
+    if not KEY_MOMENT_SCORING_RULES or time.monotonic() < _next_check:
+        return _rules
+
+    with _reload_lock:
+        if time.monotonic() < _next_check:
+            return _rules
+        _next_check = time.monotonic() + KEY_MOMENT_SCORING_RULES_CHECK_SECONDS
+
+        try:
+            mtime = os.stat(KEY_MOMENT_SCORING_RULES).st_mtime_ns
+        except OSError as e:
+            if _rules_mtime != -1:
+                logger.error(f"Can't read scoring rules {KEY_MOMENT_SCORING_RULES}: {e}")
+                _rules_mtime = -1
+            return _rules
+
+        if mtime != _rules_mtime:
+            try:
+                _rules = load_scoring_rules(KEY_MOMENT_SCORING_RULES)
+                # Only a good load is remembered, so a bad file is retried (and logged) each check
+                _rules_mtime = mtime
+                logger.info(f"Loaded scoring rules from {KEY_MOMENT_SCORING_RULES}")
+            except (OSError, ValueError) as e:
+                logger.error(f"Keeping previous scoring rules, {KEY_MOMENT_SCORING_RULES} is invalid: {e}")
+
+    return _rules
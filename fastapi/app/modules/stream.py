@@ -1,6 +1,7 @@
 import httpx
 import asyncio
-from typing import Callable, Optional
+import inspect
+from typing import Awaitable, Callable, Optional, Union
 import json
 import os
 from dotenv import load_dotenv
@@ -8,12 +9,53 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Stream servers for named games, as JSON: {"KC-BUF": "http://streams-1:8001"}.
+# Only these and STREAM_API_URI are ever connected to.
+STREAM_SERVERS = json.loads(os.getenv("STREAM_SERVERS", "{}"))
+
+
+class UnknownStreamServerError(ValueError):
+    """A game or stream server that isn't in the server config."""
+
+
+def default_stream_server() -> str:
+    return os.getenv("STREAM_API_URI", "http://localhost:8000")
+
+
+def stream_server_for(game_id: Optional[str] = None) -> str:
+    """
+    Stream server for a configured game; no game means STREAM_API_URI.
+
+    Raises:
+        UnknownStreamServerError: If the game isn't in STREAM_SERVERS
+    """
+    if game_id is None:
+        return default_stream_server()
+    try:
+        return STREAM_SERVERS[game_id]
+    except KeyError:
+        raise UnknownStreamServerError(f"Unknown game {game_id!r}") from None
+
+
+def check_stream_server(base_url: str) -> str:
+    """
+    Return `base_url` if it is a configured stream server.
+
+    Raises:
+        UnknownStreamServerError: For any other URL
+    """
+    allowed = {url.rstrip('/') for url in (*STREAM_SERVERS.values(), default_stream_server())}
+    if base_url.rstrip('/') not in allowed:
+        raise UnknownStreamServerError(f"Stream server {base_url!r} is not configured")
+    return base_url
+
 
 async def listen_to_audio_stream(
     base_url: str = None,
-    chunk_callback: Optional[Callable[[bytes], None]] = None,
+    chunk_callback: Optional[Callable[[bytes], Union[None, Awaitable[None]]]] = None,
     speed: float = 1.0,
-    timeout: float = 300.0
+    timeout: float = 300.0,
+    start_segment: int = 0
 ) -> None:
     """
     Listen to the audio stream from the streaming API.
@@ -21,9 +63,10 @@ async def listen_to_audio_stream(
     
     Args:
         base_url: Base URL of the streaming API (defaults to STREAM_API_URI env var)
-        chunk_callback: Optional callback function to process each audio chunk
+        chunk_callback: Optional callback (sync or async) to process each audio chunk
         speed: Playback speed multiplier (1.0 = real-time, 2.0 = 2x speed, etc.)
         timeout: Timeout in seconds for the stream connection
+        start_segment: Skip this many segments (resume from a checkpoint)
     
     Example:
         async def save_chunk(chunk: bytes):
@@ -37,6 +80,8 @@ async def listen_to_audio_stream(
     
     url = f"{base_url}/stream/audio"
     params = {"speed": speed}
+    if start_segment:
+        params["start_segment"] = start_segment
     
     async with httpx.AsyncClient(timeout=timeout) as client:
         try:
@@ -58,7 +103,9 @@ async def listen_to_audio_stream(
                         elapsed = asyncio.get_event_loop().time() - start_time
                         
                         if chunk_callback:
-                            chunk_callback(chunk)
+                            result = chunk_callback(chunk)
+                            if inspect.isawaitable(result):
+                                await result
                         else:
                             # Default: print periodic updates (every 100 chunks)
                             if segment_count % 100 == 0:
@@ -79,26 +126,32 @@ async def listen_to_audio_stream(
 
 async def listen_to_events_stream(
     base_url: str = None,
-    event_callback: Optional[Callable[[dict], None]] = None,
+    event_callback: Optional[Callable[[dict], Union[None, Awaitable[None]]]] = None,
     speed: float = 1.0,
     quarter_intervals: Optional[dict] = None,
-    timeout: float = 300.0
+    timeout: float = 300.0,
+    start_index: int = 0,
+    start_time: float = 0.0
 ) -> None:
     """
     Listen to the Server-Sent Events (SSE) stream from the streaming API.
     
     Args:
         base_url: Base URL of the streaming API (defaults to STREAM_API_URI env var)
-        event_callback: Optional callback function to process each event
+        event_callback: Optional callback (sync or async) to process each event
         speed: Playback speed multiplier (1.0 = real-time, 2.0 = 2x speed, etc.)
         quarter_intervals: Optional dict with custom quarter time intervals
         timeout: Timeout in seconds for the stream connection
+        start_index: Skip this many plays (resume from a checkpoint)
+        start_time: Audio time the resumed stream starts at, for pacing
     """
     if base_url is None:
         base_url = os.getenv("STREAM_API_URI", "http://localhost:8000")
     
     # Build query parameters
     params = {"speed": speed}
+    if start_index:
+        params.update({"start_index": start_index, "start_time": start_time})
     
     if quarter_intervals:
         params.update(quarter_intervals)
@@ -149,7 +202,9 @@ async def listen_to_events_stream(
                                     continue
                                 
                                 if event_callback:
-                                    event_callback(event_data)
+                                    result = event_callback(event_data)
+                                    if inspect.isawaitable(result):
+                                        await result
                                 else:
                                     # Default: print event info
                                     print(f"\nQuarter {event_data.get('quarter')} - "
@@ -0,0 +1,206 @@
+"""
+Fast WAV Decoding
+
+Decodes stream WAV segments straight from a memoryview: the RIFF header is
+parsed in place, PCM is converted to float32 and downmixed in one vectorized
+pass, and resampling uses a polyphase filter that is designed once per
+(source rate, target rate) pair and cached.
+"""
+
+import struct
+from functools import lru_cache
+from math import gcd
+from typing import Optional
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Kaiser-windowed sinc: half-length per unit of max(up, down), and beta
+FILTER_HALF_WIDTH = 10
+KAISER_BETA = 5.0
+
+
+class WavFormatError(ValueError):
+    """Raised when bytes are not a decodable RIFF/WAVE file."""
+
+
+def parse_wav_header(buf) -> tuple[int, int, int, int, int, int]:
+    """
+    Walk the RIFF chunks without copying.
+
+    Returns:
+        (format_tag, channels, sample_rate, bits_per_sample, data_offset, data_size)
+    """
+    view = memoryview(buf).cast("B")
+    if len(view) < 12 or view[0:4] != b"RIFF" or view[8:12] != b"WAVE":
+        raise WavFormatError("Not a RIFF/WAVE file")
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(view):
+        chunk_id = view[pos:pos + 4]
+        (chunk_size,) = struct.unpack_from("<I", view, pos + 4)
+        body = pos + 8
+
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate = struct.unpack_from("<HHI", view, body)
+            (bits,) = struct.unpack_from("<H", view, body + 14)
+            if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                # Real format lives in the first two bytes of the SubFormat GUID
+                (format_tag,) = struct.unpack_from("<H", view, body + 24)
+            fmt = (format_tag, channels, sample_rate, bits)
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise WavFormatError("data chunk before fmt chunk")
+            # Streams sometimes leave the size unset; clamp to what we have
+            data_size = min(chunk_size, len(view) - body)
+            return (*fmt, body, data_size)
+
+        # Chunks are word aligned
+        pos = body + chunk_size + (chunk_size & 1)
+
+    raise WavFormatError("No data chunk found")
+
+
+def wav_duration(buf) -> float:
+    """Duration in seconds of a WAV file, from its header alone."""
+    _, channels, sample_rate, bits, _, data_size = parse_wav_header(buf)
+    frame_bytes = channels * (bits // 8)
+    if not frame_bytes or not sample_rate:
+        return 0.0
+    return data_size / frame_bytes / sample_rate
+
+
+def decode_wav(buf, start_frame: int = 0, num_frames: Optional[int] = None) -> tuple[np.ndarray, int]:
+    """
+    Decode WAV bytes to mono float32 in [-1, 1].
+
+    Args:
+        buf: WAV bytes, memoryview or mmap
+        start_frame: First sample frame to decode
+        num_frames: Frames to decode (default: to the end)
+
+    Returns:
+        (audio, sample_rate)
+    """
+    format_tag, channels, sample_rate, bits, offset, size = parse_wav_header(buf)
+    view = memoryview(buf).cast("B")
+    channels = max(1, channels)
+
+    if format_tag == WAVE_FORMAT_PCM and bits == 16:
+        dtype, scale = "<i2", 1.0 / 32768.0
+    elif format_tag == WAVE_FORMAT_PCM and bits == 24:
+        dtype, scale = "<i3", 1.0 / 2147483648.0  # Widened to int32 below
+    elif format_tag == WAVE_FORMAT_PCM and bits == 32:
+        dtype, scale = "<i4", 1.0 / 2147483648.0
+    elif format_tag == WAVE_FORMAT_PCM and bits == 8:
+        dtype, scale = "u1", 1.0 / 128.0
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+        dtype, scale = "<f4", 1.0
+    else:
+        raise WavFormatError(f"Unsupported WAV encoding: format={format_tag:#06x}, bits={bits}")
+
+    itemsize = 3 if dtype == "<i3" else np.dtype(dtype).itemsize
+    frame_bytes = itemsize * channels
+    start_frame = min(max(0, start_frame), size // frame_bytes)
+    n_frames = size // frame_bytes - start_frame
+    if num_frames is not None:
+        n_frames = min(n_frames, max(0, num_frames))
+    if dtype == "<i3":
+        # Shift each 3-byte sample into the top of an int32 (sign comes along)
+        raw = np.frombuffer(
+            view, dtype="u1", count=n_frames * frame_bytes, offset=offset + start_frame * frame_bytes
+        )
+        widened = np.zeros((n_frames * channels, 4), dtype="u1")
+        widened[:, 1:] = raw.reshape(-1, 3)
+        samples = widened.view("<i4").ravel()
+    else:
+        samples = np.frombuffer(
+            view, dtype=dtype, count=n_frames * channels, offset=offset + start_frame * frame_bytes
+        )
+
+    if channels == 1:
+        # Convert and scale in a single pass
+        audio = np.multiply(samples, np.float32(scale), dtype=np.float32)
+    else:
+        # Sum channels straight into float32, then scale in place
+        audio = samples.reshape(n_frames, channels).sum(axis=1, dtype=np.float32)
+        audio *= np.float32(scale / channels)
+
+    if dtype == "u1":
+        audio -= np.float32(1.0)  # unsigned 8-bit is centred on 128
+
+    return audio, sample_rate
+
+
+class PolyphaseResampler:
+    """
+    Rational-rate resampler (up / down) with a precomputed polyphase filter.
+
+    Equivalent to zero-stuffing by `up`, low-pass filtering with a
+    Kaiser-windowed sinc and keeping every `down`-th sample, but only the
+    taps that touch real input samples are ever multiplied.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int):
+        divisor = gcd(src_rate, dst_rate)
+        self.up = dst_rate // divisor
+        self.down = src_rate // divisor
+
+        max_rate = max(self.up, self.down)
+        self.half_len = FILTER_HALF_WIDTH * max_rate
+        n = np.arange(-self.half_len, self.half_len + 1)
+        cutoff = 1.0 / max_rate
+        h = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), KAISER_BETA)
+        h *= self.up / h.sum()
+
+        # Split into `up` phases of equal length, reversed for sliding-window dot products
+        self.taps = -(-len(h) // self.up)
+        h = np.pad(h, (0, self.taps * self.up - len(h)))
+        self.phases = np.ascontiguousarray(
+            h.reshape(self.taps, self.up).T[:, ::-1], dtype=np.float32
+        )
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        up, down, taps = self.up, self.down, self.taps
+        if up == down:
+            return np.asarray(audio, dtype=np.float32)
+
+        audio = np.asarray(audio, dtype=np.float32)
+        n_out = -(-len(audio) * up // down)
+        if n_out == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        # Output n reads input positions (n*down + half_len)//up - k, k < taps
+        right_pad = taps + self.half_len // up + down + 1
+        padded = np.concatenate([
+            np.zeros(taps - 1, dtype=np.float32),
+            audio,
+            np.zeros(right_pad, dtype=np.float32),
+        ])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, taps)
+
+        out = np.empty(n_out, dtype=np.float32)
+        # Outputs r, r+up, r+2up... share a phase and step the input by `down`
+        for r in range(min(up, n_out)):
+            pos = r * down + self.half_len
+            count = len(range(r, n_out, up))
+            first = pos // up
+            out[r::up] = windows[first:first + count * down:down] @ self.phases[pos % up]
+        return out
+
+
+@lru_cache(maxsize=16)
+def get_resampler(src_rate: int, dst_rate: int) -> PolyphaseResampler:
+    """Cached resampler for a rate pair; the filter is designed once."""
+    return PolyphaseResampler(src_rate, dst_rate)
+
+
+def resample(audio: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Resample mono audio between integer sample rates."""
+    if src_rate == dst_rate:
+        return np.asarray(audio, dtype=np.float32)
+    return get_resampler(src_rate, dst_rate)(audio)
@@ -0,0 +1,140 @@
+"""
+Incremental WAV Framing
+
+Splits the /stream/audio byte stream (back-to-back WAV files) into whole WAV
+files without re-copying the backlog for every frame.
+
+Bytes are scanned for a header from a read offset into a small scan buffer
+that is only compacted occasionally. Once a RIFF/WAVE header gives the frame
+size, the rest of that frame is copied straight from incoming chunks into a
+dedicated buffer, so every byte is copied a bounded number of times and
+framing cost stays linear in stream size.
+"""
+
+import logging
+import struct
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Smallest plausible WAV: RIFF header (12) + fmt chunk header (8)
+MIN_WAV_BYTES = 20
+# Sizes above this are treated as a corrupt header and skipped
+MAX_WAV_BYTES = 64 * 1024 * 1024
+# Compact the scan buffer once this many consumed bytes sit in front of it
+COMPACT_THRESHOLD = 1024 * 1024
+
+
+class WavFramer:
+    """
+    Feed raw stream chunks, get back complete WAV files as memoryviews.
+
+    Example:
+        framer = WavFramer()
+        for wav in framer.feed(chunk):
+            detector.add_audio_segment(wav, ...)
+    """
+
+    def __init__(
+        self,
+        max_wav_bytes: int = MAX_WAV_BYTES,
+        compact_threshold: int = COMPACT_THRESHOLD
+    ):
+        self.max_wav_bytes = max_wav_bytes
+        self.compact_threshold = compact_threshold
+
+        self._scan = bytearray()
+        self._offset = 0  # read position in the scan buffer
+
+        self._frame: Optional[bytearray] = None  # frame being filled
+        self._filled = 0
+
+        self.frames_extracted = 0
+        self.skipped_bytes = 0  # garbage / invalid headers dropped while resyncing
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Bytes received but not yet handed out as a complete frame."""
+        return len(self._scan) - self._offset + self._filled
+
+    def feed(self, chunk) -> List[memoryview]:
+        """Consume a chunk and return any WAV files it completed."""
+        frames: List[memoryview] = []
+        data = memoryview(chunk).cast("B")
+
+        if self._frame is not None:
+            data = self._fill(data, frames)
+
+        if len(data):
+            self._scan += data
+            self._extract(frames)
+
+        self.frames_extracted += len(frames)
+        return frames
+
+    def _fill(self, data: memoryview, frames: List[memoryview]) -> memoryview:
+        """Copy bytes into the in-progress frame; return what's left over."""
+        take = min(len(data), len(self._frame) - self._filled)
+        self._frame[self._filled:self._filled + take] = data[:take]
+        self._filled += take
+
+        if self._filled == len(self._frame):
+            frames.append(memoryview(self._frame))
+            self._frame = None
+            self._filled = 0
+
+        return data[take:]
+
+    def _extract(self, frames: List[memoryview]):
+        """Pull complete frames out of the scan buffer, starting a partial one if needed."""
+        buf = self._scan
+
+        while True:
+            start = buf.find(b"RIFF", self._offset)
+            if start == -1:
+                # Keep a trailing partial "RIFF" for the next chunk
+                keep = max(self._offset, len(buf) - 3)
+                self.skipped_bytes += keep - self._offset
+                self._offset = keep
+                break
+
+            if start > self._offset:
+                logger.debug(f"Skipping {start - self._offset} bytes of garbage before RIFF")
+                self.skipped_bytes += start - self._offset
+                self._offset = start
+
+            if len(buf) - start < 12:
+                break  # Need the full RIFF/WAVE header
+
+            (chunk_size,) = struct.unpack_from("<I", buf, start + 4)
+            total = chunk_size + 8
+            if not buf.startswith(b"WAVE", start + 8) or not MIN_WAV_BYTES <= total <= self.max_wav_bytes:
+                # "RIFF" inside audio data or a corrupt header - resync past it
+                logger.debug(f"Invalid WAV header at offset {start}, resyncing")
+                self.skipped_bytes += 4
+                self._offset = start + 4
+                continue
+
+            available = len(buf) - start
+            with memoryview(buf) as view:
+                if available >= total:
+                    frames.append(memoryview(bytes(view[start:start + total])))
+                    self._offset = start + total
+                    continue
+
+                # Partial frame: move it to its own buffer and fill from later chunks
+                self._frame = bytearray(total)
+                self._frame[:available] = view[start:]
+                self._filled = available
+                self._offset = len(buf)
+            break
+
+        self._compact()
+
+    def _compact(self):
+        if self._offset == len(self._scan):
+            self._scan.clear()
+            self._offset = 0
+        elif self._offset >= self.compact_threshold:
+            del self._scan[:self._offset]
+            self._offset = 0
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: nearest-segment lookup vs. audio buffer size.
+
+Compares the previous deque approach (linear scan for the closest timestamp,
+then `list(deque)[i]` per context segment) with AudioRingBuffer's binary
+search and index arithmetic, for buffer sizes from 50 to 10,000 segments.
+
+Usage:
+    python benchmarks/bench_audio_buffer.py
+"""
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.modules.audio_buffer import AudioRingBuffer
+
+SIZES = [50, 200, 1000, 5000, 10000]
+CONTEXT_SEGMENTS = 2
+LOOKUPS = 2000
+
+
+def deque_lookup(segments: deque, play_timestamp: float) -> list:
+    """The detector's original lookup."""
+    closest_idx = None
+    min_diff = float('inf')
+    for i, (timestamp, _) in enumerate(segments):
+        diff = abs(timestamp - play_timestamp)
+        if diff < min_diff:
+            min_diff = diff
+            closest_idx = i
+
+    start_idx = max(0, closest_idx - CONTEXT_SEGMENTS)
+    end_idx = min(len(segments) - 1, closest_idx + CONTEXT_SEGMENTS)
+    return [list(segments)[i] for i in range(start_idx, end_idx + 1)]
+
+
+def ring_lookup(ring: AudioRingBuffer, play_timestamp: float) -> list:
+    return ring.window(ring.nearest_index(play_timestamp), CONTEXT_SEGMENTS)
+
+
+def time_per_lookup(fn, buffer, queries) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(buffer, q)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    print("=" * 60)
+    print("AUDIO BUFFER LOOKUP BENCHMARK")
+    print("=" * 60)
+    print(f"{'segments':>10} {'deque (us)':>14} {'ring (us)':>12} {'speedup':>10}")
+
+    for size in SIZES:
+        # Fill past capacity so the ring has wrapped around
+        total = size + size // 3
+        segments = deque(maxlen=size)
+        ring = AudioRingBuffer(size)
+        for i in range(total):
+            segments.append((float(i), i))
+            ring.append((float(i), i), float(i))
+
+        queries = rng.uniform(total - size, total, LOOKUPS)
+        for q in queries[:50]:
+            assert deque_lookup(segments, q) == ring_lookup(ring, q)
+
+        # The deque path is quadratic-ish; fewer samples keep big sizes quick
+        deque_queries = queries[:max(20, LOOKUPS * 50 // size)]
+        deque_us = time_per_lookup(deque_lookup, segments, deque_queries) * 1e6
+        ring_us = time_per_lookup(ring_lookup, ring, queries) * 1e6
+        print(f"{size:>10} {deque_us:>14.1f} {ring_us:>12.2f} {deque_us / ring_us:>9.0f}x")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
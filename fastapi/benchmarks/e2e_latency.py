@@ -0,0 +1,276 @@
+"""
+End-to-end latency benchmark: stream server play emit -> /getkeymoments.
+
+Starts the research stream server (research/src/stream.py) and this API on
+localhost with a synthetic game (noise audio segments + play-by-play), then
+drives /getkeymoments at several speeds and client counts with
+key_moment_threshold=0 so every play is emitted.
+
+Latency for a play is its SSE receive time minus the time the stream server
+sent it, i.e. client connect time + absoluteAudioTimestamp / speed (the
+events stream paces plays from 0). It includes the join wait for audio
+context, audio scoring and SSE delivery.
+
+Reports p50/p95/p99 latency, moments/s and process CPU time, writes them to
+JSON and compares p95/p99 against a stored baseline (exit code 1 on a
+regression beyond the tolerance).
+
+Usage:
+    python benchmarks/e2e_latency.py --save-baseline     # record a baseline
+    python benchmarks/e2e_latency.py                     # compare against it
+    python benchmarks/e2e_latency.py --speeds 100 200 --clients 1 4
+"""
+import argparse
+import asyncio
+import importlib.util
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import wave
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+FASTAPI_DIR = Path(__file__).resolve().parent.parent
+RESEARCH_STREAM = FASTAPI_DIR.parent / "research" / "src" / "stream.py"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "e2e_baseline.json"
+
+sys.path.insert(0, str(FASTAPI_DIR))
+
+# Q1 of the stream server's default quarter intervals; plays are mapped into it
+Q1_START, Q1_END = 365, 1670
+SEGMENT_SECONDS = 5.0
+AUDIO_RATE = 4000  # Low rate keeps the synthetic game small; it is resampled anyway
+
+
+def write_synthetic_game(data_dir: Path, n_plays: int, seed: int = 0):
+    """Noise audio segments covering Q1 plus `n_plays` Q1 plays."""
+    rng = np.random.default_rng(seed)
+    segments_dir = data_dir / "audio_segments"
+    segments_dir.mkdir(parents=True)
+
+    t = 0.0
+    i = 0
+    while t < Q1_END + 4 * SEGMENT_SECONDS:
+        # Louder stretches now and then so scores vary
+        level = 1000 if i % 7 else 8000
+        samples = (rng.standard_normal(int(SEGMENT_SECONDS * AUDIO_RATE)) * level).clip(-32767, 32767)
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(AUDIO_RATE)
+            w.writeframes(samples.astype("<i2").tobytes())
+        h, m, s = int(t // 3600), int(t % 3600 // 60), t % 60
+        (segments_dir / f"{i:04d}_{h:02d}-{m:02d}-{s:06.3f}_synthetic.wav").write_bytes(buf.getvalue())
+        t += SEGMENT_SECONDS
+        i += 1
+
+    kickoff = datetime(2024, 9, 5, 20, 20)
+    plays = []
+    for k in range(n_plays):
+        plays.append({
+            "QuarterName": "1",
+            "PlayTime": (kickoff + timedelta(seconds=30 * k)).isoformat(),
+            "Type": "PassingPlay" if k % 2 else "RushingPlay",
+            "Description": "pass complete for 25 yards" if k % 5 == 0 else "run for 3 yards",
+            "Down": 1 + k % 4,
+            "Distance": 10 - k % 8,
+            "YardLine": 20 + k % 60,
+            "YardsGained": 25 if k % 5 == 0 else 3,
+        })
+    (data_dir / "game_play_by_play.json").write_text(json.dumps({"Plays": plays}))
+
+
+def load_stream_app(data_dir: Path):
+    """Import the research stream server pointed at the synthetic game."""
+    spec = importlib.util.spec_from_file_location("research_stream", RESEARCH_STREAM)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.DATA_DIR = data_dir
+    module.PLAY_BY_PLAY_FILE = data_dir / "game_play_by_play.json"
+    return module.app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(app, port: int):
+    """Run an ASGI app with uvicorn on a background thread."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread
+
+
+async def wait_ready(api_url: str, timeout: float = 300.0):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            if (await client.get(f"{api_url}/ready")).status_code == 200:
+                return
+            await asyncio.sleep(0.5)
+    raise TimeoutError("Audio model did not become ready")
+
+
+async def run_client(api_url: str, speed: float, latencies: list):
+    """One /getkeymoments consumer; appends a latency per moment."""
+    import httpx
+
+    params = {"speed": speed, "key_moment_threshold": 0}
+    async with httpx.AsyncClient(timeout=None) as client:
+        connected = time.monotonic()
+        async with client.stream("GET", f"{api_url}/getkeymoments", params=params) as response:
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = json.loads(line[6:])
+                if "combined_score" in data:
+                    sent = connected + data["timestamp"] / speed
+                    latencies.append(time.monotonic() - sent)
+                elif data.get("status") in ("completed", "error"):
+                    break
+
+
+async def run_case(api_url: str, speed: float, clients: int) -> dict:
+    latencies: list = []
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(run_client(api_url, speed, latencies) for _ in range(clients)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    ms = np.array(latencies) * 1000
+    return {
+        "speed": speed,
+        "clients": clients,
+        "moments": len(latencies),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2) if len(ms) else None,
+        "p95_ms": round(float(np.percentile(ms, 95)), 2) if len(ms) else None,
+        "p99_ms": round(float(np.percentile(ms, 99)), 2) if len(ms) else None,
+        "throughput_per_s": round(len(latencies) / wall, 2),
+        "wall_s": round(wall, 2),
+        "cpu_s": round(cpu, 2),
+    }
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Regressions: p95/p99 above baseline * (1 + tolerance) for the same case."""
+    by_case = {(r["speed"], r["clients"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        base = by_case.get((r["speed"], r["clients"]))
+        if not base:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if r[metric] is None or base.get(metric) is None:
+                continue
+            r[f"{metric}_vs_baseline"] = round(r[metric] / base[metric], 3) if base[metric] else None
+            if r[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"speed={r['speed']} clients={r['clients']} {metric}: "
+                    f"{r[metric]:.1f} vs baseline {base[metric]:.1f}"
+                )
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="End-to-end key moment latency benchmark")
+    parser.add_argument("--speeds", type=float, nargs="+", default=[100.0, 200.0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--plays", type=int, default=40)
+    parser.add_argument("--output", type=Path, default=Path("e2e_latency_results.json"))
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95/p99 slowdown vs baseline")
+    parser.add_argument("--cache", action="store_true", help="Keep the clip score cache on (off by default)")
+    return parser.parse_args()
+
+
+async def main():
+    args = parse_args()
+
+    # Must be set before the API modules read them
+    os.environ["WARMUP_AUDIO_MODEL"] = "true"
+    if not args.cache:
+        os.environ["AUDIO_CACHE_ENABLED"] = "false"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        write_synthetic_game(data_dir, args.plays)
+
+        stream_port, api_port = free_port(), free_port()
+        os.environ["STREAM_API_URI"] = f"http://127.0.0.1:{stream_port}"
+        from app.main import app as api_app
+
+        servers = [serve(load_stream_app(data_dir), stream_port), serve(api_app, api_port)]
+        api_url = f"http://127.0.0.1:{api_port}"
+
+        try:
+            await wait_ready(api_url)
+
+            print("=" * 78)
+            print("END-TO-END LATENCY BENCHMARK")
+            print("=" * 78)
+            print(f"{'speed':>7} {'clients':>8} {'moments':>8} {'p50 ms':>9} {'p95 ms':>9} "
+                  f"{'p99 ms':>9} {'mom/s':>7} {'cpu s':>7}")
+
+            results = []
+            for speed in args.speeds:
+                for clients in args.clients:
+                    r = await run_case(api_url, speed, clients)
+                    results.append(r)
+                    print(f"{r['speed']:>7g} {r['clients']:>8} {r['moments']:>8} {r['p50_ms']:>9} "
+                          f"{r['p95_ms']:>9} {r['p99_ms']:>9} {r['throughput_per_s']:>7} {r['cpu_s']:>7}")
+        finally:
+            for server, thread in servers:
+                server.should_exit = True
+                thread.join(timeout=10)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "config": {"plays": args.plays, "cache": args.cache, "tolerance": args.tolerance},
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline.exists() and not args.save_baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        report["regressions"] = regressions
+
+    args.output.write_text(json.dumps(report, indent=2))
+    print("=" * 78)
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline saved to {args.baseline}")
+    elif not args.baseline.exists():
+        print(f"No baseline at {args.baseline} (run with --save-baseline to create one)")
+    elif regressions:
+        print("REGRESSIONS:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    else:
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,45 @@
+"""
+Build the win-probability leverage table used as a play scoring term.
+
+Writes a memory-mappable .npy file; point KEY_MOMENT_LEVERAGE_TABLE at it
+to turn the leverage term on.
+
+Usage:
+    python build_leverage_table.py
+    python build_leverage_table.py --output /data/leverage_table.npy
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.leverage import SHAPE, build_leverage_table, save_leverage_table
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the leverage lookup table")
+    parser.add_argument("--output", type=Path, default=Path("leverage_table.npy"))
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    start = time.perf_counter()
+    table = build_leverage_table()
+    save_leverage_table(table, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"✓ Wrote {args.output} ({'x'.join(map(str, SHAPE))} cells, "
+          f"{table.nbytes / 1e6:.1f} MB) in {elapsed:.1f}s")
+    print(f"  leverage: median {np.median(table):.3f}, max {table.max():.3f}")
+    print(f"\nEnable it with: export KEY_MOMENT_LEVERAGE_TABLE={args.output.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from pathlib import Path
 # Add app directory to path
 sys.path.insert(0, str(Path(__file__).parent / "app"))
 
-from app.modules.key_moment_detector import process_streams_for_key_moments, KeyMomentDetector
+from app.modules.key_moment_detector import process_streams_for_key_moments
 
 
 async def main():
@@ -20,7 +20,7 @@ async def main():
     print("Looking for high-criticality plays and exciting audio moments\n")
     
     # Run detection at 100x speed
-    key_moments = await process_streams_for_key_moments(
+    moments = await process_streams_for_key_moments(
         speed=50.0,
         audio_weight=0.2,
         play_weight=0.8,
@@ -29,30 +29,28 @@ async def main():
     
     # Print summary
     print("\n" + "="*60)
-    print(f"DETECTION COMPLETE - Found {len(key_moments)} key moments")
+    print(f"DETECTION COMPLETE - Found {moments.key_count} key moments in {moments.total_count} plays")
     print("="*60)
     
     # Show top 10 moments
-    detector = KeyMomentDetector()
-    detector.detected_moments = key_moments
-    top_moments = detector.get_top_moments(n=10)
+    top_moments = moments.top(n=10)
     
     print("\n🏆 TOP 10 KEY MOMENTS:")
     print("-"*60)
     for i, moment in enumerate(top_moments, 1):
-        print(f"\n{i}. Time: {moment.timestamp:.1f}s (Q{moment.play_data.get('quarter')})")
+        print(f"\n{i}. Time: {moment.timestamp:.1f}s (Q{moment.quarter})")
         print(f"   Combined Score: {moment.combined_score:.1f}")
         print(f"   Play: {moment.play_score:.1f} ({moment.play_category})")
         print(f"   Audio: {moment.audio_score:.1f}")
-        print(f"   {moment.play_data.get('Description', 'N/A')}")
+        print(f"   {moment.description}")
     
     # Export to file
-    summary = detector.export_moments_summary()
+    summary = [moment.to_dict() for moment in moments]
     import json
     with open('key_moments_detected.json', 'w') as f:
         json.dump(summary, f, indent=2)
     
-    print(f"\nExported {len(summary)} key moments to 'key_moments_detected.json'")
+    print(f"\nExported {len(summary)} moments to 'key_moments_detected.json'")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""
+Run key moment detection offline, straight from files on disk.
+
+Reads the play-by-play JSON and the audio segments directory (or a full game
+WAV) without the stream server, batch-scores the audio and writes the same
+summary as run_key_moment_detection.py.
+
+Usage:
+    python run_offline_detection.py
+    python run_offline_detection.py --audio-file ../research/data/RavensNFL_2024_Season.wav
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add app directory to path
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.offline_detection import DEFAULT_QUARTER_INTERVALS, OFFLINE_SEGMENT_SECONDS, run_offline_detection
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "research" / "data"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline key moment detection")
+    parser.add_argument("--play-by-play", default=DATA_DIR / "game_18684_play_by_play.json", type=Path)
+    audio = parser.add_mutually_exclusive_group()
+    audio.add_argument("--segments-dir", type=Path, help="Per-segment WAVs (default: research/data/audio_segments)")
+    audio.add_argument("--audio-file", type=Path, help="One WAV for the whole game")
+    parser.add_argument("--segment-seconds", type=float, default=OFFLINE_SEGMENT_SECONDS,
+                        help="Clip length when slicing --audio-file")
+    parser.add_argument("--intervals", type=float, nargs=8, default=DEFAULT_QUARTER_INTERVALS,
+                        metavar="T", help="Quarter start/end times in the audio (8 values)")
+    parser.add_argument("--audio-weight", type=float, default=0.2)
+    parser.add_argument("--play-weight", type=float, default=0.8)
+    parser.add_argument("--threshold", type=float, default=45.0)
+    parser.add_argument("--context-segments", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=None, help="Max clips per forward pass")
+    parser.add_argument("--output", type=Path, default=Path("key_moments_detected.json"))
+    return parser.parse_args()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    if args.audio_file is None and args.segments_dir is None:
+        args.segments_dir = DATA_DIR / "audio_segments"
+
+    print("="*60)
+    print("OFFLINE KEY MOMENT DETECTION")
+    print("="*60)
+
+    start = time.perf_counter()
+    detector = run_offline_detection(
+        args.play_by_play,
+        segments_dir=args.segments_dir,
+        audio_file=args.audio_file,
+        intervals=args.intervals,
+        segment_seconds=args.segment_seconds,
+        audio_weight=args.audio_weight,
+        play_weight=args.play_weight,
+        key_moment_threshold=args.threshold,
+        context_segments=args.context_segments,
+        max_batch_size=args.batch_size
+    )
+    elapsed = time.perf_counter() - start
+
+    moments = detector.detected_moments
+    print("\n" + "="*60)
+    print(f"DETECTION COMPLETE - Found {moments.key_count} key moments in "
+          f"{moments.total_count} plays ({elapsed:.1f}s)")
+    print("="*60)
+
+    print("\n🏆 TOP 10 KEY MOMENTS:")
+    print("-"*60)
+    for i, moment in enumerate(detector.get_top_moments(n=10), 1):
+        print(f"\n{i}. Time: {moment.timestamp:.1f}s (Q{moment.quarter})")
+        print(f"   Combined Score: {moment.combined_score:.1f}")
+        print(f"   Play: {moment.play_score:.1f} ({moment.play_category})")
+        print(f"   Audio: {moment.audio_score:.1f}")
+        print(f"   {moment.description}")
+
+    summary = detector.export_moments_summary()
+    with open(args.output, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\nExported {len(summary)} moments to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
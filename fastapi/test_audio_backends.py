@@ -0,0 +1,102 @@
+"""
+Test that alternative audio backends match the PyTorch reference.
+
+Runs the same synthetic clips through the fp32 PyTorch backend and each
+alternative backend, checks per-label probabilities stay within tolerance,
+and reports per-clip latency.
+
+Usage:
+    python test_audio_backends.py                 # all backends
+    python test_audio_backends.py onnx torch-int8  # selected backends
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.audio_backends import create_backend
+from app.modules.audio_sentiment import MODEL_ID, SAMPLE_RATE
+
+# Max absolute difference in any label probability vs. fp32 PyTorch
+TOLERANCES = {
+    "onnx": 1e-3,
+    "torch-int8": 0.08,
+    "onnx-int8": 0.08,
+}
+
+_backends = {}
+
+
+def make_clips(n: int = 8, seconds: float = 1.0) -> list[np.ndarray]:
+    """Deterministic mix of noise, tones and near-silence, like stream segments."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    clips = []
+    for i in range(n):
+        tone = 0.3 * np.sin(2 * np.pi * (150 + 60 * i) * t)
+        noise = rng.normal(0, 0.02 + 0.05 * (i % 3), t.shape)
+        clips.append((tone * (i % 2) + noise).astype(np.float32))
+    return clips
+
+
+def get_backend(name: str):
+    if name not in _backends:
+        _backends[name] = create_backend(name, MODEL_ID, SAMPLE_RATE)
+    return _backends[name]
+
+
+def time_per_clip(backend, clips, repeats: int = 3) -> float:
+    backend.predict(clips)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        backend.predict(clips)
+    return (time.perf_counter() - start) / (repeats * len(clips))
+
+
+def check_parity(name: str):
+    clips = make_clips()
+    reference = get_backend("torch").predict(clips)
+    candidate = get_backend(name).predict(clips)
+
+    max_diff = max(
+        abs(ref[label] - cand[label])
+        for ref, cand in zip(reference, candidate)
+        for label in ref
+    )
+    print(f"{name}: max label diff vs torch = {max_diff:.5f} (tolerance {TOLERANCES[name]})")
+    assert max_diff <= TOLERANCES[name], f"{name} drifted from torch by {max_diff:.5f}"
+
+
+def test_onnx_parity():
+    check_parity("onnx")
+
+
+def test_torch_int8_parity():
+    check_parity("torch-int8")
+
+
+def test_onnx_int8_parity():
+    check_parity("onnx-int8")
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(TOLERANCES)
+
+    print("=" * 60)
+    print("AUDIO BACKEND PARITY TEST")
+    print("=" * 60)
+
+    clips = make_clips()
+    baseline = time_per_clip(get_backend("torch"), clips)
+    print(f"torch: {baseline * 1000:.1f} ms/clip")
+
+    for name in names:
+        check_parity(name)
+        latency = time_per_clip(get_backend(name), clips)
+        print(f"{name}: {latency * 1000:.1f} ms/clip ({baseline / latency:.2f}x vs torch)")
+
+    print("=" * 60)
+    print("All backends within tolerance")
@@ -0,0 +1,78 @@
+"""
+Test the on-disk tier of the audio score cache: writing past the size limit
+evicts least recently used rows down to 90% of the budget, and entries (and
+the size bookkeeping) survive closing and reopening the database.
+
+Usage:
+    python test_audio_cache.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.audio_cache import AudioScoreCache, clip_key
+
+MAX_DISK_MB = 0.01  # ~10 KB, a few dozen entries
+
+
+def result(i: int) -> dict:
+    return {"happy": i / 100, "angry": 0.1, "neutral": 0.2, "sad": 0.3, "excited_audio": 0.4,
+            "calm_audio": 0.5, "energy": 0.01 * i, "filename": f"segment_{i:04d}.wav"}
+
+
+def key(i: int) -> str:
+    return clip_key(f"clip {i}".encode(), model_id="test")
+
+
+def open_cache(path: Path) -> AudioScoreCache:
+    # No memory tier, so every get goes to SQLite
+    return AudioScoreCache(str(path), memory_items=0, max_disk_mb=MAX_DISK_MB)
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+def test_eviction_and_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "scores.sqlite3"
+        cache = open_cache(path)
+        budget = cache.max_disk_bytes
+
+        sizes = []
+        for i in range(200):
+            cache.put(key(i), result(i))
+            if i >= 1:
+                cache.get(key(1))  # Keep one early entry recently used
+            sizes.append(cache.stats()["disk_bytes"])
+
+        check(f"disk stays within budget ({max(sizes)} <= {budget} bytes)", max(sizes) <= budget)
+        trims = [after for before, after in zip(sizes, sizes[1:]) if after < before]
+        check(f"evictions trim to 90% of budget ({len(trims)} trims)",
+              bool(trims) and all(after <= int(budget * 0.9) for after in trims))
+        check("least recently used entries evicted", cache.get(key(0)) is None and cache.get(key(2)) is None)
+        check("recently used and newest entries kept",
+              cache.get(key(1)) == result(1) and cache.get(key(199)) == result(199))
+
+        kept = [i for i in range(200) if cache.get(key(i)) is not None]
+        disk_bytes = cache.stats()["disk_bytes"]
+        cache.close()
+
+        reopened = open_cache(path)
+        check("size bookkeeping matches the table after reopen", reopened.stats()["disk_bytes"] == disk_bytes)
+        check(f"{len(kept)} entries survive a reopen",
+              all(reopened.get(key(i)) == result(i) for i in kept) and reopened.disk_hits == len(kept))
+        reopened.close()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("AUDIO SCORE CACHE")
+    print("=" * 60)
+    test_eviction_and_reopen()
+
+    print("=" * 60)
+    print("ALL PASSED")
@@ -9,34 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent / "app"))
 
 from app.modules.stream import listen_to_audio_stream
 from app.modules.audio_sentiment import score_clip
-
-
-def extract_wav_files(buffer: bytearray) -> list[bytes]:
-    """Extract complete WAV files from buffer."""
-    wav_files = []
-    
-    while True:
-        riff_idx = buffer.find(b'RIFF')
-        if riff_idx == -1:
-            break
-        
-        if riff_idx > 0:
-            buffer[:] = buffer[riff_idx:]
-        
-        if len(buffer) < 8:
-            break
-        
-        chunk_size = int.from_bytes(buffer[4:8], 'little')
-        total_size = chunk_size + 8
-        
-        if len(buffer) < total_size:
-            break
-        
-        wav_data = bytes(buffer[:total_size])
-        wav_files.append(wav_data)
-        buffer[:] = buffer[total_size:]
-    
-    return wav_files
+from app.modules.wav_framer import WavFramer
 
 
 async def test_audio_sentiment():
@@ -45,18 +18,17 @@ async def test_audio_sentiment():
     print("AUDIO SENTIMENT TEST")
     print("="*60)
     
-    audio_buffer = bytearray()
+    framer = WavFramer()
     tested_count = 0
     max_tests = 3  # Test first 3 WAV files
     
     def process_chunk(chunk: bytes):
-        nonlocal audio_buffer, tested_count
+        nonlocal tested_count
         
         if tested_count >= max_tests:
             return  # Stop processing
         
-        audio_buffer.extend(chunk)
-        wav_files = extract_wav_files(audio_buffer)
+        wav_files = framer.feed(chunk)
         
         for wav_data in wav_files:
             if tested_count >= max_tests:
@@ -0,0 +1,145 @@
+"""
+Test that the vectorized batch scorer matches the scalar scoring path.
+
+Scores hand-picked edge cases and a large randomized set of plays (dicts and
+`Play` models) both ways, checks score, criticality category, play category
+and key-play flag agree for every play, then times the batch path.
+
+Usage:
+    python test_batch_scoring.py
+    python test_batch_scoring.py 100000   # plays in the timing run
+"""
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.batch_scoring import score_plays_batch
+from app.modules.models import Play
+from app.modules.scoring import calculate_play_criticality_score, categorize_criticality, is_key_play
+
+PLAY_TYPES = ["Rush", "PassCompleted", "PassIncomplete", "PassIntercepted", "Punt", "FieldGoal",
+              "Field Goal", "Kickoff", "ExtraPoint", "TwoPointConversion", "Sack", "Interception",
+              "TD Pass", "PassTD", "Penalty", "", None]
+DESCRIPTIONS = [
+    "run up the middle for 3 yards", "pass complete for 27 yards, TOUCHDOWN",
+    "pass intercepted, returned for a touchdown", "strip sack, fumble recovery by defense",
+    "forced fumble recovered", "tackle for loss", "safety", "punt 45 yards",
+    "field goal is good", "fg attempt blocked", "pat good", "point after", "printed stats",
+    "pass short right intended for the tight end", "sacked at the 30, fumbles", "patriots ball",
+    "INTERCEPTED by the safety", "", None,
+]
+YARD_LINES = ["OPP 5", "OPP 20", "OPP 21", "OWN 30", "OPP x", "OPP -3", "50", "", None]
+TIMES = ["1:45", "2:00", "2:01", "12:30", "0:05", "bad", "1:2:3", "", None]
+
+EDGE_CASES = [
+    {},
+    {"PlayType": "Punt", "Down": 4, "Distance": 8, "YardsGained": 40},
+    {"PlayType": "Rush", "Down": 4, "Distance": 1, "YardsGained": 1, "YardLine": "OPP 2"},
+    {"PlayType": "FieldGoal", "Description": "field goal good", "YardLine": "OPP 15", "Quarter": 4},
+    {"PlayType": "Pass", "Description": "touchdown", "Quarter": 4, "Time": "0:30",
+     "ScoreHome": 21, "ScoreAway": 17},
+    {"PlayType": "Sack", "Description": "strip sack fumble", "Down": 3, "Distance": 9, "YardsGained": -8},
+    {"PlayType": "Rush", "Down": 3, "Distance": 2, "YardsGained": None},
+    {"PlayType": "Rush", "Quarter": "4", "Down": "3", "Distance": 5},
+    {"PlayType": "PassIntercepted", "Description": "pass intended for X, INTERCEPTED", "Down": 3},
+]
+
+
+def random_play(rng) -> dict:
+    def pick(values):
+        return values[rng.integers(len(values))]
+
+    def maybe(value, p=0.15):
+        return None if rng.random() < p else value
+
+    return {
+        "Quarter": maybe(int(rng.integers(1, 5))),
+        "Down": maybe(int(rng.integers(1, 5))),
+        "Distance": int(rng.integers(1, 20)),
+        "YardsGained": maybe(int(rng.integers(-10, 60))),
+        "YardLine": pick(YARD_LINES),
+        "PlayType": pick(PLAY_TYPES),
+        "Description": pick(DESCRIPTIONS),
+        "Time": pick(TIMES),
+        "ScoreHome": maybe(int(rng.integers(0, 40))),
+        "ScoreAway": maybe(int(rng.integers(0, 40))),
+    }
+
+
+def scalar_results(plays: list) -> list:
+    results = []
+    for play in plays:
+        score, play_category, _ = calculate_play_criticality_score(play)
+        category = categorize_criticality(score)
+        results.append((score, category, play_category, is_key_play(score, category)))
+    return results
+
+
+def check_parity(plays: list, label: str):
+    expected = scalar_results(plays)
+    batch = score_plays_batch(plays)
+    actual = list(zip(batch["score"], batch["category"], batch["play_category"], batch["is_key_play"]))
+
+    mismatches = [(i, e, a) for i, (e, a) in enumerate(zip(expected, actual)) if e != a]
+    status = "✓" if not mismatches else "✗"
+    print(f"{status} {label}: {len(plays) - len(mismatches)}/{len(plays)} plays match")
+    for i, e, a in mismatches[:5]:
+        print(f"    play {i}: scalar={e} batch={a}\n      {plays[i]}")
+    assert not mismatches, f"{label}: {len(mismatches)} plays differ from the scalar path"
+
+
+def test_parity():
+    rng = np.random.default_rng(0)
+    dict_plays = [random_play(rng) for _ in range(20000)]
+    models = [Play(**random_play(rng)) for _ in range(20000)]
+
+    check_parity(EDGE_CASES, "edge cases (dicts)")
+    check_parity(dict_plays, "random plays (dicts)")
+    check_parity(models, "random plays (Play models)")
+
+
+def test_timing(n: int = 50000):
+    rng = np.random.default_rng(1)
+    plays = [random_play(rng) for _ in range(n)]
+
+    start = time.perf_counter()
+    score_plays_batch(plays)
+    batch_s = time.perf_counter() - start
+
+    sample = plays[:5000]
+    start = time.perf_counter()
+    scalar_results(sample)
+    scalar_s = (time.perf_counter() - start) * n / len(sample)
+
+    print(f"{'✓' if batch_s < 1.0 else '✗'} {n} plays: batch {batch_s * 1000:.0f} ms, "
+          f"scalar ~{scalar_s * 1000:.0f} ms ({scalar_s / batch_s:.1f}x)")
+    assert batch_s < 1.0, f"batch scoring {n} plays took {batch_s:.2f} s"
+
+
+def test_import_is_lazy():
+    # app.main imports the batch scorer, so pandas must wait for the first batch
+    probe = "import sys, app.modules.batch_scoring; print('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=Path(__file__).parent,
+                            capture_output=True, text=True, check=True)
+    loaded = result.stdout.strip() == "True"
+    print(f"{'✗' if loaded else '✓'} importing the batch scorer doesn't load pandas")
+    assert not loaded, "batch_scoring imports pandas at module level"
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    print("=" * 60)
+    print("BATCH SCORING PARITY")
+    print("=" * 60)
+    test_parity()
+    test_timing(n)
+    test_import_is_lazy()
+
+    print("=" * 60)
+    print("ALL PASSED")
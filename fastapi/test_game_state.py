@@ -0,0 +1,108 @@
+"""
+Test the game state tracker on a short scripted game: drives, stop streaks,
+clock and score carried between plays, and the context it adds to scoring.
+
+Usage:
+    python test_game_state.py
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.game_state import GameStateTracker
+from app.modules.scoring import calculate_play_criticality_score
+
+
+def stream_play(team, minutes, seconds, quarter=1, play_type="Rush", description="", yards=0, **extra):
+    return {"Team": team, "quarter": quarter, "TimeRemainingMinutes": minutes,
+            "TimeRemainingSeconds": seconds, "Type": play_type, "PlayType": play_type,
+            "Description": description, "YardsGained": yards, **extra}
+
+
+# BAL scores on its first drive, then KC is stopped on four straight drives
+GAME = [
+    stream_play("KC", 15, 0, yards=3),
+    stream_play("KC", 14, 20, play_type="Punt", description="punts 45 yards"),
+    stream_play("BAL", 14, 5, yards=12),
+    stream_play("BAL", 13, 30, description="TOUCHDOWN", yards=20,
+                ScoringPlay={"HomeScore": 7, "AwayScore": 0}),
+    stream_play("KC", 13, 20, yards=2),
+    stream_play("KC", 12, 50, play_type="Punt", description="punts"),
+    stream_play("BAL", 12, 40, yards=1),
+    stream_play("BAL", 12, 0, play_type="Punt", description="punts"),
+    stream_play("KC", 11, 50, play_type="PassIntercepted", description="pass INTERCEPTED"),
+    stream_play("BAL", 11, 40, yards=-2),
+    stream_play("BAL", 11, 0, play_type="Punt", description="punts"),
+    stream_play("KC", 10, 50, play_type="Punt", description="punts"),
+    stream_play("BAL", 10, 40, yards=4),
+    stream_play("BAL", 10, 0, play_type="Punt", description="punts"),
+    stream_play("KC", 1, 30, quarter=4, play_type="Sack", description="sacked for -8", yards=-8),
+]
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+def test_drives():
+    tracker = GameStateTracker()
+    states = []
+    for play in GAME[:4]:
+        tracker.update(play)
+        states.append(tracker.snapshot()["state"])
+
+    check("possession and drive counters",
+          [s["drive_number"] for s in states] == [1, 1, 2, 2]
+          and [s["drive_plays"] for s in states] == [1, 2, 1, 2]
+          and states[3]["drive_yards"] == 32 and states[3]["possession_changes"] == 1)
+    check("clock from TimeRemainingMinutes/Seconds", states[3]["clock_seconds"] == 13 * 60 + 30)
+    check("score from the scoring play", (states[3]["score_home"], states[3]["score_away"]) == (7, 0))
+
+    for play in GAME[4:]:
+        state = tracker.update(play)
+    check("KC stopped on 4 straight drives", state.possession == "KC" and state.consecutive_stops == 4)
+    check("score carried forward", state.score_diff == 7)
+
+    restored = GameStateTracker.from_snapshot(json.loads(json.dumps(tracker.snapshot())))
+    check("snapshot round trip", restored.update(GAME[4]).consecutive_stops == 4)
+
+
+def test_scoring_context():
+    tracker = GameStateTracker()
+    for play in GAME[:-1]:
+        tracker.update(play)
+    sack = GAME[-1]
+    state = tracker.update(sack)
+
+    _, _, alone = calculate_play_criticality_score(sack)
+    _, _, with_state = calculate_play_criticality_score(sack, state)
+    check("no game state: no clock or score context",
+          "final_two_minutes" not in alone and "close_game" not in alone)
+    check("game state fills in clock, score and stop streak",
+          {"final_two_minutes", "close_game", "stop_streak"} <= with_state.keys())
+
+
+def test_timing(n: int = 100000):
+    plays = (GAME * (n // len(GAME) + 1))[:n]
+    tracker = GameStateTracker()
+    start = time.perf_counter()
+    for play in plays:
+        tracker.update(play)
+    per_play_us = (time.perf_counter() - start) / n * 1e6
+    check(f"{n} updates at {per_play_us:.2f} µs/play", per_play_us < 20)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("GAME STATE TRACKER")
+    print("=" * 60)
+    test_drives()
+    test_scoring_context()
+    test_timing()
+
+    print("=" * 60)
+    print("ALL PASSED")
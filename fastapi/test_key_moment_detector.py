@@ -0,0 +1,231 @@
+"""
+Test the streaming detector against a scripted inference pool and scripted
+upstream streams: plays that share audio segments share one scoring call,
+cancelling one of them leaves the others with real scores, at real-time
+speed plays wait for their full audio window instead of timing out, and a
+run checkpointed mid-stream resumes without skipping or repeating plays.
+
+Usage:
+    python test_key_moment_detector.py
+"""
+import asyncio
+import io
+import logging
+import re
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules import key_moment_detector
+from app.modules.checkpoint import load_checkpoint
+from app.modules.key_moment_detector import KeyMomentDetector, process_streams_for_key_moments
+
+
+class ScriptedPool:
+    """Inference pool stand-in whose batches finish when `release` is set."""
+
+    def __init__(self, excitement: float = 0.5):
+        self.excitement = excitement
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def score_clips(self, clips, sr=None):
+        self.calls += 1
+        await self.release.wait()
+        return [{'excited_audio': self.excitement} for _ in clips]
+
+    async def score_clip(self, clip, sr=None):
+        return (await self.score_clips([clip], sr))[0]
+
+
+def wav_bytes(seconds: float, sr: int = 8000) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(b"\0\0" * int(seconds * sr))
+    return buf.getvalue()
+
+
+class ScriptedStreams:
+    """
+    Stand-ins for the upstream audio and event streams, paced like the
+    stream server: each segment is sent whole at its start time / speed,
+    each play at its audio timestamp / speed.
+    """
+
+    def __init__(self, segment_seconds: float, n_segments: int, play_times: list):
+        self.segment_seconds = segment_seconds
+        self.n_segments = n_segments
+        self.plays = [{"PlayID": i, "Type": "Rush", "Description": f"play {i}", "absoluteAudioTimestamp": t}
+                      for i, t in enumerate(play_times)]
+        self.requests = []
+
+    async def audio(self, chunk_callback, speed=1.0, base_url=None, start_segment=0, **kwargs):
+        self.requests.append(("audio", start_segment))
+        start = asyncio.get_running_loop().time()
+        first = start_segment * self.segment_seconds
+        for i in range(start_segment, self.n_segments):
+            await self.sleep_until(start, (i * self.segment_seconds - first) / speed)
+            chunk_callback(wav_bytes(self.segment_seconds))
+
+    async def events(self, event_callback, speed=1.0, base_url=None, start_index=0, start_time=0.0, **kwargs):
+        self.requests.append(("events", start_index, start_time))
+        start = asyncio.get_running_loop().time()
+        for play in self.plays[start_index:]:
+            await self.sleep_until(start, (play["absoluteAudioTimestamp"] - start_time) / speed)
+            event_callback(play)
+
+    @staticmethod
+    async def sleep_until(start: float, offset: float):
+        await asyncio.sleep(max(0.0, start + offset - asyncio.get_running_loop().time()))
+
+    def install(self):
+        """Point the detector module at these streams; returns an undo function."""
+        original = (key_moment_detector.listen_to_audio_stream, key_moment_detector.listen_to_events_stream)
+        key_moment_detector.listen_to_audio_stream = self.audio
+        key_moment_detector.listen_to_events_stream = self.events
+
+        def undo():
+            key_moment_detector.listen_to_audio_stream, key_moment_detector.listen_to_events_stream = original
+        return undo
+
+
+def detector_with_segments(pool, n: int = 5) -> KeyMomentDetector:
+    detector = KeyMomentDetector(context_segments=1, inference_pool=pool)
+    for i in range(n):
+        detector.add_audio_segment(b"RIFF", timestamp=i * 5.0, duration=5.0)
+    return detector
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+async def cancel_play_sharing_segments(cancel_first: bool):
+    pool = ScriptedPool()
+    detector = detector_with_segments(pool)
+    # Both windows are segments 1-3
+    first = asyncio.create_task(detector.get_audio_score_for_play(10.0))
+    await settle()
+    second = asyncio.create_task(detector.get_audio_score_for_play(11.0))
+    await settle()
+
+    cancelled, survivor = (first, second) if cancel_first else (second, first)
+    cancelled.cancel()
+    await settle()
+    pool.release.set()
+    score, used = await asyncio.wait_for(survivor, 1.0)
+
+    who = "claiming" if cancel_first else "waiting"
+    check(f"cancelling the {who} play leaves the other with real scores",
+          cancelled.cancelled() and score == 50.0 and used == [1, 2, 3])
+    check(f"segments scored ({pool.calls} scoring calls)",
+          all(detector.audio_segments[i].audio_score == 50.0 for i in (1, 2, 3)))
+    await detector.close()
+
+
+def test_cancel_waiting_play():
+    asyncio.run(cancel_play_sharing_segments(cancel_first=False))
+
+
+def test_cancel_claiming_play():
+    asyncio.run(cancel_play_sharing_segments(cancel_first=True))
+
+
+async def full_windows_at_real_time():
+    # 0.2s segments at speed 1: the after-context (2 segments) takes ~0.4s to
+    # arrive, far longer than the 0.05s of slack on its own
+    streams = ScriptedStreams(0.2, 12, [0.5, 0.9, 1.3, 1.7])
+    pool = ScriptedPool()
+    pool.release.set()
+    undo = streams.install()
+    try:
+        detector = KeyMomentDetector(context_segments=2, inference_pool=pool)
+        moments = await asyncio.wait_for(
+            process_streams_for_key_moments(speed=1.0, join_max_wait=0.05, detector=detector), 10.0)
+    finally:
+        undo()
+
+    windows = [m.audio_segments_used for m in moments]
+    check(f"speed 1: every play waits for its full window {windows}",
+          len(windows) == 4 and all(len(w) == 5 for w in windows))
+
+
+def test_full_windows_at_real_time():
+    asyncio.run(full_windows_at_real_time())
+
+
+async def checkpoint_and_resume():
+    streams = ScriptedStreams(0.2, 30, [0.3 + 0.25 * i for i in range(20)])
+    pool = ScriptedPool()
+    pool.release.set()
+    numbers = []
+    handler = logging.Handler()
+    handler.emit = lambda record: numbers.extend(
+        int(n) for n in re.findall(r"KEY MOMENT #(\d+)", record.getMessage()))
+    key_moment_detector.logger.addHandler(handler)
+    level = key_moment_detector.logger.level
+    key_moment_detector.logger.setLevel(logging.INFO)
+    undo = streams.install()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/game.json.gz"
+            detector = KeyMomentDetector(key_moment_threshold=0.0, context_segments=1, inference_pool=pool)
+            run = asyncio.create_task(process_streams_for_key_moments(
+                speed=2.0, join_max_wait=0.05, detector=detector, checkpoint_path=path))
+            while detector.detected_moments.total_count < 6:
+                await asyncio.sleep(0.01)
+            run.cancel()  # Process dies mid-stream; the final checkpoint is written
+            await asyncio.gather(run, return_exceptions=True)
+
+            state = load_checkpoint(path)["detector"]
+            streams.requests.clear()
+            first_run_numbers = list(numbers)
+            restored = KeyMomentDetector.from_snapshot(state, inference_pool=pool)
+            moments = await asyncio.wait_for(process_streams_for_key_moments(
+                speed=2.0, join_max_wait=0.05, detector=restored, checkpoint_path=path), 10.0)
+    finally:
+        undo()
+        key_moment_detector.logger.removeHandler(handler)
+        key_moment_detector.logger.setLevel(level)
+
+    plays = state["moments"]["total_count"]
+    check(f"checkpointed mid-stream ({plays} plays, {state['segment_count']} segments)",
+          0 < plays < len(streams.plays) and state["segment_count"] < streams.n_segments)
+    check("streams resumed from the checkpoint position",
+          sorted(streams.requests) == [("audio", state["segment_count"]),
+                                       ("events", plays, state["audio_watermark"])])
+    check("every play exactly once, in order",
+          [m.description for m in moments] == [p["Description"] for p in streams.plays])
+    check("segments continue after the checkpoint",
+          restored.segment_count == streams.n_segments and moments.total_count == len(streams.plays))
+    check("key moment numbering continues after the resume",
+          numbers[len(first_run_numbers):] == list(range(plays + 1, len(streams.plays) + 1)))
+
+
+def test_checkpoint_and_resume():
+    asyncio.run(checkpoint_and_resume())
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("KEY MOMENT DETECTOR")
+    print("=" * 60)
+    test_cancel_waiting_play()
+    test_cancel_claiming_play()
+    test_full_windows_at_real_time()
+    test_checkpoint_and_resume()
+
+    print("=" * 60)
+    print("ALL PASSED")
@@ -0,0 +1,118 @@
+"""
+Test the key moment broadcast hub with a scripted pipeline: subscribers to
+the same key share one run, late joiners replay the history, the run is
+cancelled when the last subscriber leaves, and a finished run is replaced.
+
+Usage:
+    python test_moment_broadcast.py
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.moment_broadcast import MomentBroadcastHub
+from app.modules.moment_store import KeyMoment, MomentStore
+
+
+def moment(i: int) -> KeyMoment:
+    return KeyMoment(timestamp=float(i), play_score=80.0, play_category="CRITICAL", audio_score=60.0,
+                     combined_score=74.0, is_key_moment=True, description=f"play {i}", play_type="Rush",
+                     quarter=1, down=3, distance=2, yard_line="OPP 10")
+
+
+class ScriptedPipeline:
+    """Publishes a key moment each time `step` is set, `n` times."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.runs = 0
+        self.cancelled = 0
+        self.step = asyncio.Event()
+
+    async def run(self, callback):
+        self.runs += 1
+        store = MomentStore()
+        try:
+            for i in range(self.n):
+                await self.step.wait()
+                self.step.clear()
+                m = moment(i)
+                store.append(m)
+                callback(m)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return store
+
+    async def advance(self):
+        self.step.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+
+async def drain(queue) -> list:
+    events = []
+    while (event := await queue.get()) is not None:
+        events.append(json.loads(event[len("data: "):]))
+    return events
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+async def shared_run():
+    hub, pipeline = MomentBroadcastHub(), ScriptedPipeline(3)
+    async with hub.subscribe("game", pipeline.run) as first:
+        await pipeline.advance()
+        async with hub.subscribe("game", pipeline.run) as late:
+            await pipeline.advance()
+            await pipeline.advance()
+            first_events, late_events = await drain(first), await drain(late)
+
+    check("one pipeline run for two subscribers", pipeline.runs == 1)
+    check("late joiner gets the history", late_events == first_events)
+    check("moments numbered once, then completion",
+          [e.get('detected_at') for e in first_events] == [1, 2, 3, None]
+          and first_events[-1]['status'] == 'completed'
+          and first_events[-1]['key_moments_detected'] == 3)
+    check("finished run is dropped", not hub.broadcasts)
+
+
+async def last_subscriber_stops_run():
+    hub, pipeline = MomentBroadcastHub(), ScriptedPipeline(10)
+    async with hub.subscribe("game", pipeline.run):
+        async with hub.subscribe("game", pipeline.run):
+            await pipeline.advance()
+        check("run continues while a subscriber remains", pipeline.cancelled == 0)
+    await asyncio.sleep(0)
+    check("run cancelled when the last subscriber leaves", pipeline.cancelled == 1 and not hub.broadcasts)
+
+    async with hub.subscribe("game", pipeline.run):
+        async with hub.subscribe("other", pipeline.run):
+            await asyncio.sleep(0)
+            check("new and different keys start their own runs", pipeline.runs == 3)
+    await asyncio.sleep(0)
+
+
+def test_shared_run():
+    asyncio.run(shared_run())
+
+
+def test_last_subscriber_stops_run():
+    asyncio.run(last_subscriber_stops_run())
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("KEY MOMENT BROADCAST")
+    print("=" * 60)
+    test_shared_run()
+    test_last_subscriber_stops_run()
+
+    print("=" * 60)
+    print("ALL PASSED")
@@ -0,0 +1,135 @@
+"""
+Test key moment records and the moment store through a checkpoint: moments
+(with string or missing yard lines) survive `to_state`/`from_state`, and a
+store saved with `save_checkpoint` and reloaded keeps its key moments, recent
+plays, counters and leaderboard. The spill file holds each play once: a
+fresh run replaces an old file, a resumed run drops plays spilled after its
+checkpoint, and removing a game deletes it.
+
+Usage:
+    python test_moment_store.py
+"""
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.checkpoint import load_checkpoint, save_checkpoint
+from app.modules import moment_store
+from app.modules.game_sessions import GameSessionManager
+from app.modules.moment_store import KeyMoment, MomentStore, spill_path_for
+
+
+def moment(i: int, yard_line=None) -> KeyMoment:
+    key = i % 4 == 0
+    return KeyMoment(timestamp=float(i), play_score=40.0 + i, play_category="offensive",
+                     audio_score=30.0 + i % 7, combined_score=35.0 + i * 1.5, is_key_moment=key,
+                     description=f"play {i}", play_type="Rush", quarter=1 + i // 15, down=1 + i % 4,
+                     distance=10 - i % 10, yard_line=yard_line, audio_segments_used=(i, i + 1))
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+def test_moment_state_round_trip():
+    for yard_line in ("OPP 10", "50", None):
+        original = moment(3, yard_line)
+        restored = KeyMoment.from_state(original.to_state())
+        check(f"yard_line {yard_line!r} survives to_state/from_state",
+              restored == original and restored.to_dict() == original.to_dict())
+
+
+def test_store_checkpoint_round_trip():
+    store = MomentStore(recent_limit=5, leaderboard_size=3)
+    for i in range(40):
+        store.append(moment(i, f"OPP {i % 50}" if i % 3 else None))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.json.gz"
+        save_checkpoint({"moments": store.snapshot()}, path)
+        restored = MomentStore(recent_limit=5, leaderboard_size=3)
+        restored.restore(load_checkpoint(path)["moments"])
+
+    check("retained moments survive a checkpoint", list(restored) == list(store))
+    check("yard lines stay strings", {type(m.yard_line) for m in restored} == {str, type(None)})
+    check("counters survive a checkpoint",
+          (restored.total_count, restored.key_count) == (store.total_count, store.key_count))
+    check("leaderboard survives a checkpoint", restored.top(3) == store.top(3))
+
+    restored.append(moment(40, "OWN 20"))
+    store.append(moment(40, "OWN 20"))
+    check("restored store keeps appending in order", list(restored) == list(store))
+
+
+
+def spilled(path: Path) -> list:
+    return [json.loads(line)["description"] for line in path.read_text().splitlines()]
+
+
+def test_fresh_store_replaces_old_spill():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "game.jsonl"
+        path.write_text('{"description": "last run"}\n' * 3)
+        store = MomentStore(recent_limit=2, spill_path=path)
+        for i in range(1, 12, 2):  # Odd plays, never key moments
+            store.append(moment(i))
+        store.close()
+        check("fresh run replaces the old spill file", spilled(path) == ["play 1", "play 3", "play 5", "play 7"])
+
+
+def test_resume_drops_plays_spilled_after_checkpoint():
+    plays = [moment(i) for i in range(1, 60, 2)]
+    with tempfile.TemporaryDirectory() as tmp:
+        expected_path, path = Path(tmp) / "expected.jsonl", Path(tmp) / "game.jsonl"
+        straight = MomentStore(recent_limit=3, spill_path=expected_path)
+        for m in plays:
+            straight.append(m)
+        straight.close()
+
+        store = MomentStore(recent_limit=3, spill_path=path)
+        for m in plays[:15]:
+            store.append(m)
+        state = json.loads(json.dumps(store.snapshot()))
+        for m in plays[15:25]:  # Spilled after the checkpoint, then the process dies
+            store.append(m)
+        store.close()
+
+        resumed = MomentStore(recent_limit=3, spill_path=path)
+        resumed.restore(state)
+        check("restore cuts the spill file back to the checkpoint",
+              spilled(path) == spilled(expected_path)[:state["spilled_count"]])
+        for m in plays[15:]:  # Replayed from the checkpoint
+            resumed.append(m)
+        resumed.close()
+        check("resumed run spills each play once", spilled(path) == spilled(expected_path))
+
+
+def test_remove_game_deletes_spill():
+    original = moment_store.KEY_MOMENT_SPILL_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        moment_store.KEY_MOMENT_SPILL_DIR = tmp
+        try:
+            path = spill_path_for("KC-BUF")
+            path.write_text('{"description": "play 1"}\n')
+            GameSessionManager().remove_game("KC-BUF")
+            check("removing a game deletes its spill file", not path.exists())
+        finally:
+            moment_store.KEY_MOMENT_SPILL_DIR = original
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("MOMENT STORE CHECKPOINTS")
+    print("=" * 60)
+    test_moment_state_round_trip()
+    test_store_checkpoint_round_trip()
+    test_fresh_store_replaces_old_spill()
+    test_resume_drops_plays_spilled_after_checkpoint()
+    test_remove_game_deletes_spill()
+
+    print("=" * 60)
+    print("ALL PASSED")
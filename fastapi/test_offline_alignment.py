@@ -0,0 +1,102 @@
+"""
+Check that offline detection aligns plays to audio exactly like the stream
+server does: align_plays_to_audio against research/src/stream.py's
+process_plays_with_audio_sync, on a scripted game and (when research/data is
+present) on the real play-by-play file.
+
+Usage:
+    python test_offline_alignment.py
+"""
+import ast
+import json
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.offline_detection import DEFAULT_QUARTER_INTERVALS, align_plays_to_audio
+
+RESEARCH_STREAM = Path(__file__).parent.parent / "research" / "src" / "stream.py"
+RESEARCH_PLAY_BY_PLAY = Path(__file__).parent.parent / "research" / "data" / "game_18684_play_by_play.json"
+
+
+def load_stream_server_alignment(play_by_play_file: Path):
+    """
+    The stream server's process_plays_with_audio_sync, compiled on its own.
+    Importing research/src/stream.py would build its FastAPI app, which this
+    directory's `fastapi` package shadows under pytest.
+    """
+    tree = ast.parse(RESEARCH_STREAM.read_text())
+    func = next(node for node in tree.body
+                if isinstance(node, ast.FunctionDef) and node.name == "process_plays_with_audio_sync")
+    namespace = {"json": json, "datetime": datetime, "List": List, "Dict": Dict,
+                 "PLAY_BY_PLAY_FILE": play_by_play_file}
+    exec(compile(ast.Module(body=[func], type_ignores=[]), str(RESEARCH_STREAM), "exec"), namespace)
+    return namespace["process_plays_with_audio_sync"]
+
+
+def play(quarter, clock, play_type="Rush", **extra):
+    return {"QuarterName": str(quarter), "PlayTime": f"2024-09-05T{clock}",
+            "Type": play_type, **extra}
+
+
+# Timeouts mid-quarter and at the end of a quarter, a quarter with a single
+# play (no play-clock duration to stretch), one with no plays at all, and an
+# overtime play that belongs to no interval
+GAME = [
+    play(1, "20:20:00", Description="kickoff"),
+    play(1, "20:21:30"),
+    play(1, "20:22:10", "Timeout"),
+    play(1, "20:25:40", "PassCompleted"),
+    play(1, "20:31:05"),
+    play(1, "20:33:00", "Timeout"),
+    play(2, "20:50:00"),
+    play(2, "20:50:00", "Punt"),
+    play(2, "20:58:45", "Timeout"),
+    play(2, "21:02:15", "Sack"),
+    play(3, "21:40:00", "FieldGoal"),
+    play(5, "23:10:00"),
+]
+
+
+def compare(plays: List[dict], intervals) -> bool:
+    with tempfile.TemporaryDirectory() as tmp:
+        play_by_play_file = Path(tmp) / "play_by_play.json"
+        play_by_play_file.write_text(json.dumps({"Plays": plays}))
+        expected = load_stream_server_alignment(play_by_play_file)(list(intervals))
+    return align_plays_to_audio(plays, intervals) == expected
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+def test_scripted_game_matches_stream_server():
+    aligned = align_plays_to_audio(GAME, DEFAULT_QUARTER_INTERVALS)
+    check("timeouts and plays outside the intervals dropped",
+          len(aligned) == 8 and all(p["Type"] != "Timeout" for p in aligned))
+    check("same alignment as the stream server", compare(GAME, DEFAULT_QUARTER_INTERVALS))
+    check("same alignment with other intervals",
+          compare(GAME, [0, 600, 650, 1200, 1300, 1500, 1600, 2400]))
+
+
+def test_game_file_matches_stream_server():
+    if not RESEARCH_PLAY_BY_PLAY.exists():
+        print(f"- skipped: {RESEARCH_PLAY_BY_PLAY} not found")
+        return
+    plays = json.loads(RESEARCH_PLAY_BY_PLAY.read_text()).get("Plays", [])
+    check(f"same alignment as the stream server on {RESEARCH_PLAY_BY_PLAY.name}",
+          compare(plays, DEFAULT_QUARTER_INTERVALS))
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("OFFLINE PLAY/AUDIO ALIGNMENT")
+    print("=" * 60)
+    test_scripted_game_matches_stream_server()
+    test_game_file_matches_stream_server()
+    print("\nALL PASSED")
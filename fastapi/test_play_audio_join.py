@@ -0,0 +1,104 @@
+"""
+Test the play/audio join: plays are emitted in arrival order once the audio
+watermark covers them, a ready play waits behind an earlier one that isn't,
+and `max_wait` releases a play whose audio never arrives.
+
+Usage:
+    python test_play_audio_join.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.play_audio_join import PlayAudioJoin
+
+MAX_WAIT = 0.05
+
+
+class Harness:
+    """A join over a scripted audio watermark, recording what it emits."""
+
+    def __init__(self):
+        self.watermark = 0.0
+        self.emitted = []
+        self.join = PlayAudioJoin(lambda play: play["t"] <= self.watermark, self.emit, max_wait=MAX_WAIT)
+
+    async def emit(self, play: dict, partial: bool):
+        self.emitted.append((play["id"], partial))
+
+    async def audio(self, watermark: float):
+        self.watermark = watermark
+        self.join.notify_audio()
+        await settle()
+
+
+async def settle():
+    """Let the join's run loop wake up and release what it can."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+async def in_order_and_max_wait():
+    h = Harness()
+    runner = asyncio.create_task(h.join.run())
+
+    for i, t in enumerate([1.0, 2.0, 3.0]):
+        h.join.submit({"id": i, "t": t})
+    await settle()
+    check("nothing emitted before its audio", h.emitted == [] and h.join.pending_count == 3)
+
+    await h.audio(2.0)
+    check("covered plays emitted in order", h.emitted == [(0, False), (1, False)])
+
+    h.join.submit({"id": 3, "t": 1.5})  # Ready, but queued behind play 2
+    await h.audio(2.5)
+    check("ready play waits behind an earlier one", h.emitted == [(0, False), (1, False)])
+
+    await asyncio.sleep(MAX_WAIT * 3)
+    check("max_wait releases the stuck play as partial, then the one behind it",
+          h.emitted == [(0, False), (1, False), (2, True), (3, False)] and h.join.released_partial == 1)
+
+    h.join.close()
+    await asyncio.wait_for(runner, 1.0)
+    check("run returns once closed and drained", runner.done())
+
+
+async def audio_finished_releases_all():
+    h = Harness()
+    h.join.max_wait = 60.0
+    runner = asyncio.create_task(h.join.run())
+    for i in range(3):
+        h.join.submit({"id": i, "t": 10.0 + i})
+    await settle()
+
+    h.join.audio_finished()
+    h.join.close()
+    await asyncio.wait_for(runner, 1.0)
+    check("audio_finished releases everything in order without waiting",
+          h.emitted == [(0, True), (1, True), (2, True)])
+
+
+def test_in_order_and_max_wait():
+    asyncio.run(in_order_and_max_wait())
+
+
+def test_audio_finished_releases_all():
+    asyncio.run(audio_finished_releases_all())
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("PLAY/AUDIO JOIN")
+    print("=" * 60)
+    test_in_order_and_max_wait()
+    test_audio_finished_releases_all()
+
+    print("=" * 60)
+    print("ALL PASSED")
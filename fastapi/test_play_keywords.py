@@ -0,0 +1,86 @@
+"""
+Test the play keyword matcher: word boundaries, CamelCase play types and
+agreement between the per-play and batch matchers.
+
+Usage:
+    python test_play_keywords.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.play_keywords import Keyword, match_play_keywords, match_play_keywords_batch
+from app.modules.scoring import classify_play_category
+
+# (play type, description, expected category)
+CATEGORY_CASES = [
+    ("PassIncomplete", "pass short right intended for M.Andrews", "offensive"),
+    ("TwoPointConversion", "two-point conversion attempt, pass good", "offensive"),
+    ("Rush", "L.Jackson up the middle, Patriots challenge", "offensive"),
+    ("Rush", "run to the OPP 12, stdout", "offensive"),
+    ("Sack", "L.Jackson sacked at BAL 30, FUMBLES, forced by X", "defensive"),
+    ("PassIntercepted", "pass INTERCEPTED by K.Hamilton", "defensive"),
+    ("Rush", "INT returned 20 yards", "defensive"),
+    ("FieldGoal", "52 yard field goal is GOOD", "special_teams"),
+    ("ExtraPoint", "J.Tucker extra point is GOOD", "special_teams"),
+    ("Punt", "S.Koo punts 45 yards", "special_teams"),
+    (None, None, "offensive"),
+]
+
+# (play type, description, flags that must be set, flags that must not be)
+FLAG_CASES = [
+    ("PassTD", "", Keyword.TD, 0),
+    ("Rush", "TD", 0, Keyword.TD),
+    ("Rush", "fumble recovery, forced by X", Keyword.FUMBLE | Keyword.RECOVERY | Keyword.FORCED, 0),
+    ("Rush", "point after", 0, Keyword.INT | Keyword.PAT),
+    ("Rush", "tackle for loss of 3", Keyword.TACKLE_FOR_LOSS, 0),
+]
+
+
+def test_categories():
+    failures = []
+    for play_type, description, expected in CATEGORY_CASES:
+        got = classify_play_category({"PlayType": play_type, "Description": description})
+        status = "✓" if got == expected else "✗"
+        print(f"{status} {play_type!r:22} {description!r:52} -> {got}")
+        if got != expected:
+            failures.append((play_type, description, got))
+    assert not failures, f"wrong categories: {failures}"
+
+
+def test_flags():
+    failures = []
+    for play_type, description, present, absent in FLAG_CASES:
+        flags = match_play_keywords(play_type, description)
+        passed = (flags & present) == present and not flags & absent
+        print(f"{'✓' if passed else '✗'} flags for {play_type!r} {description!r}")
+        if not passed:
+            failures.append((play_type, description, flags))
+    assert not failures, f"wrong flags: {failures}"
+
+
+def test_batch_matches_scalar():
+    cases = CATEGORY_CASES + [(t, d, None) for t, d, _, _ in FLAG_CASES]
+    types = [t for t, _, _ in cases]
+    descriptions = [d for _, d, _ in cases]
+    # Newlines inside a description must not shift later rows
+    descriptions[0] = "first line\nsecond line " + descriptions[0]
+
+    batch = match_play_keywords_batch(types, descriptions)
+    scalar = [match_play_keywords(t, d) for t, d in zip(types, descriptions)]
+    passed = list(batch) == scalar
+    print(f"{'✓' if passed else '✗'} batch matcher agrees with per-play matcher ({len(cases)} plays)")
+    assert passed, f"batch {list(batch)} != scalar {scalar}"
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("PLAY KEYWORD MATCHER")
+    print("=" * 60)
+    test_categories()
+    test_flags()
+    test_batch_matches_scalar()
+
+    print("=" * 60)
+    print("ALL PASSED")
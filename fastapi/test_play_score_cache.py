@@ -0,0 +1,103 @@
+"""
+Test the play score cache: cached scores match uncached scoring for dicts,
+`Play` models and stream plays (with a game state), replays hit, and plays
+that differ only by a missing vs None field don't share an entry.
+
+Usage:
+    python test_play_score_cache.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.game_state import GameStateTracker
+from app.modules.models import Play
+from app.modules.play_features import PlayFeatures
+from app.modules.play_score_cache import PlayScoreCache
+from app.modules.scoring import calculate_play_criticality_score
+from test_batch_scoring import random_play
+
+
+def to_stream_play(play: dict, i: int) -> dict:
+    return {"PlayID": i, "Team": "BAL" if i % 7 < 4 else "KC", "quarter": play["Quarter"],
+            "Type": play["PlayType"], "PlayTime": play["Time"], "Down": play["Down"],
+            "Distance": play["Distance"], "YardLine": play["YardLine"],
+            "YardsGained": play["YardsGained"], "Description": play["Description"]}
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+def test_matches_uncached():
+    rng = np.random.default_rng(0)
+    plays = [random_play(rng) for _ in range(3000)]
+    models = [Play(**play) for play in plays]
+    cache = PlayScoreCache(maxsize=10000)
+
+    for label, items in (("dicts", plays), ("Play models", models)):
+        expected = [calculate_play_criticality_score(p) for p in items]
+        first = [cache.score(p) for p in items]
+        replay = [cache.score(p) for p in items]
+        check(f"{label}: cached scores match uncached", first == expected == replay)
+
+    stream = [to_stream_play(p, i) for i, p in enumerate(plays)]
+    tracker, expected = GameStateTracker(), []
+    for play in stream:
+        state = tracker.update(play)
+        expected.append(calculate_play_criticality_score(PlayFeatures.from_stream_play(play), state))
+    for _ in range(2):
+        tracker = GameStateTracker()
+        got = [cache.score(p, tracker.update(p), stream=True) for p in stream]
+        check("stream plays with game state: cached scores match uncached", got == expected)
+
+    stats = cache.stats()
+    check(f"replays hit ({stats['hits']} hits, {stats['misses']} misses)",
+          stats["hits"] >= 3 * len(plays) and stats["misses"] <= 3 * len(plays))
+
+
+def test_missing_vs_none():
+    cache = PlayScoreCache()
+    base = {"Down": 3, "Distance": 0}
+    missing = cache.score(base)
+    explicit_none = cache.score({**base, "YardsGained": None})
+    check("missing YardsGained (0) and None are cached separately",
+          missing == calculate_play_criticality_score(base)
+          and explicit_none == calculate_play_criticality_score({**base, "YardsGained": None})
+          and missing != explicit_none)
+
+
+def test_timing(n: int = 20000):
+    rng = np.random.default_rng(1)
+    plays = [random_play(rng) for _ in range(500)] * (n // 500)
+    cache = PlayScoreCache()
+    for play in plays[:500]:
+        cache.score(play)
+
+    start = time.perf_counter()
+    for play in plays:
+        calculate_play_criticality_score(play)
+    uncached = time.perf_counter() - start
+    start = time.perf_counter()
+    for play in plays:
+        cache.score(play)
+    cached = time.perf_counter() - start
+    check(f"{n} replayed plays: uncached {uncached * 1e6 / n:.1f} µs/play, "
+          f"cached {cached * 1e6 / n:.1f} µs/play", cached < uncached)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("PLAY SCORE CACHE")
+    print("=" * 60)
+    test_matches_uncached()
+    test_missing_vs_none()
+    test_timing()
+
+    print("=" * 60)
+    print("ALL PASSED")
@@ -0,0 +1,103 @@
+"""
+Test scoring rule file reloads: a malformed rules file is rejected with a
+logged error, play scoring keeps using the previous table, and a fixed file
+is picked up on the next check.
+
+Usage:
+    python test_scoring_rules.py
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules import scoring_rules
+from app.modules.scoring import calculate_play_criticality_score
+from app.modules.scoring_rules import DEFAULT_RULES, ScoringRules
+
+TOUCHDOWN = {"PlayType": "Rush", "Description": "TOUCHDOWN"}
+
+MALFORMED_TABLES = [
+    {"offensive": [1], "defensive": []},
+    {"offensive": [{"key": "td", "points": 50, "when": [3]}], "defensive": []},
+    {"offensive": [{"key": "td", "points": 50, "when": "touchdown"}], "defensive": []},
+    {"offensive": {"key": "td"}, "defensive": []},
+    [],
+]
+
+
+def write_rules(path: Path, table):
+    path.write_text(json.dumps(table))
+    # Distinct mtime for every write, even within the filesystem's timestamp resolution
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def reload_from(path: Path):
+    """Point the reloader at `path` and force a check on the next call."""
+    scoring_rules.KEY_MOMENT_SCORING_RULES = str(path)
+    scoring_rules._next_check = 0.0
+
+
+def test_from_dict_rejects_malformed_tables():
+    for table in MALFORMED_TABLES:
+        try:
+            ScoringRules.from_dict(table)
+        except ValueError as e:
+            print(f"✓ rejected {json.dumps(table)}: {e}")
+        else:
+            raise AssertionError(f"accepted malformed table {table!r}")
+
+
+def test_malformed_file_keeps_previous_rules():
+    original = (scoring_rules.KEY_MOMENT_SCORING_RULES, scoring_rules._rules, scoring_rules._rules_mtime)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rules.json"
+        custom = json.loads(json.dumps(DEFAULT_RULES))
+        custom["offensive"][0]["points"] = 99  # touchdown
+        try:
+            write_rules(path, custom)
+            reload_from(path)
+            assert calculate_play_criticality_score(TOUCHDOWN)[0] == 99
+            print("✓ custom rules loaded")
+
+            errors = []
+            handler = logging.Handler()
+            handler.emit = lambda record: errors.append(record.getMessage())
+            scoring_rules.logger.addHandler(handler)
+            try:
+                for table in MALFORMED_TABLES:
+                    write_rules(path, table)
+                    for _ in range(2):  # Still rejected (and logged) on the next check
+                        reload_from(path)
+                        assert calculate_play_criticality_score(TOUCHDOWN)[0] == 99, table
+            finally:
+                scoring_rules.logger.removeHandler(handler)
+            expected = 2 * len(MALFORMED_TABLES)
+            assert len(errors) == expected, errors
+            print(f"✓ malformed files keep the previous rules ({len(errors)} errors logged)")
+
+            custom["offensive"][0]["points"] = 60
+            write_rules(path, custom)
+            reload_from(path)
+            assert calculate_play_criticality_score(TOUCHDOWN)[0] == 60
+            print("✓ fixed file picked up")
+        finally:
+            (scoring_rules.KEY_MOMENT_SCORING_RULES, scoring_rules._rules,
+             scoring_rules._rules_mtime) = original
+            scoring_rules._next_check = 0.0
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("SCORING RULE RELOADS")
+    print("=" * 60)
+    test_from_dict_rejects_malformed_tables()
+    test_malformed_file_keeps_previous_rules()
+
+    print("=" * 60)
+    print("ALL PASSED")
@@ -0,0 +1,75 @@
+"""
+Test that the API only connects to configured stream servers: games resolve
+through STREAM_SERVERS, and unknown games or hosts are rejected (the API
+turns that into a 400) before any upstream connection is made.
+
+Usage:
+    python test_stream_servers.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules import stream
+from app.modules.game_sessions import GameSessionManager
+from app.modules.stream import UnknownStreamServerError, check_stream_server, stream_server_for
+
+SERVERS = {"KC-BUF": "http://streams-1:8001"}
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+def rejected(fn, *args) -> bool:
+    try:
+        fn(*args)
+    except UnknownStreamServerError:
+        return True
+    return False
+
+
+def with_servers(test):
+    def run():
+        original = dict(stream.STREAM_SERVERS)
+        stream.STREAM_SERVERS.clear()
+        stream.STREAM_SERVERS.update(SERVERS)
+        try:
+            test()
+        finally:
+            stream.STREAM_SERVERS.clear()
+            stream.STREAM_SERVERS.update(original)
+    run.__name__ = test.__name__
+    return run
+
+
+@with_servers
+def test_resolution():
+    check("configured game resolves to its server", stream_server_for("KC-BUF") == "http://streams-1:8001")
+    check("no game uses STREAM_API_URI", stream_server_for() == stream.default_stream_server())
+    check("unknown game rejected", rejected(stream_server_for, "NYJ-MIA"))
+    check("configured servers allowed",
+          check_stream_server("http://streams-1:8001/") == "http://streams-1:8001/"
+          and check_stream_server(stream.default_stream_server()))
+    check("other hosts rejected",
+          rejected(check_stream_server, "http://169.254.169.254") and rejected(check_stream_server, "http://streams-1:8002"))
+
+
+@with_servers
+def test_sessions_reject_unknown_servers():
+    manager = GameSessionManager()
+    check("session with an unconfigured base_url rejected",
+          rejected(manager.start_game, "KC-BUF", "http://attacker.example") and not manager.sessions)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("STREAM SERVER CONFIG")
+    print("=" * 60)
+    test_resolution()
+    test_sessions_reject_unknown_servers()
+
+    print("=" * 60)
+    print("ALL PASSED")
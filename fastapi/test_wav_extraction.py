@@ -8,52 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "app"))
 
 from app.modules.stream import listen_to_audio_stream
-
-
-def extract_wav_files(buffer: bytearray) -> list[bytes]:
-    """
-    Extract complete WAV files from buffer.
-    Returns list of complete WAV files found.
-    """
-    wav_files = []
-    
-    while True:
-        # Find RIFF header
-        riff_idx = buffer.find(b'RIFF')
-        
-        if riff_idx == -1:
-            # No more RIFF headers
-            break
-        
-        # Remove any garbage before RIFF
-        if riff_idx > 0:
-            print(f"Skipping {riff_idx} bytes of garbage before RIFF")
-            buffer[:] = buffer[riff_idx:]
-        
-        # Need at least 8 bytes to read header
-        if len(buffer) < 8:
-            break
-        
-        # Read file size from RIFF header (little-endian, bytes 4-7)
-        chunk_size = int.from_bytes(buffer[4:8], 'little')
-        total_size = chunk_size + 8
-        
-        print(f"📦 Found WAV file: chunk_size={chunk_size}, total_size={total_size}")
-        
-        # Check if we have the complete file
-        if len(buffer) < total_size:
-            print(f"⏳ Need more data: have {len(buffer)}, need {total_size}")
-            break
-        
-        # Extract this WAV file
-        wav_data = bytes(buffer[:total_size])
-        wav_files.append(wav_data)
-        print(f"Extracted WAV #{len(wav_files)}: {len(wav_data)} bytes")
-        
-        # Remove it from buffer
-        buffer[:] = buffer[total_size:]
-    
-    return wav_files
+from app.modules.wav_framer import WavFramer
 
 
 async def test_extraction():
@@ -62,12 +17,12 @@ async def test_extraction():
     print("WAV EXTRACTION TEST - PROCESSING ENTIRE STREAM")
     print("="*60)
     
-    audio_buffer = bytearray()
+    framer = WavFramer()
     chunk_count = 0
     wav_count = 0
     
     def process_chunk(chunk: bytes):
-        nonlocal chunk_count, wav_count, audio_buffer
+        nonlocal chunk_count, wav_count
         
         chunk_count += 1
         
@@ -81,19 +36,18 @@ async def test_extraction():
             else:
                 print(f"   No RIFF in first chunk")
         
-        # Add to buffer
-        audio_buffer.extend(chunk)
-        
-        # Try to extract WAV files
-        wav_files = extract_wav_files(audio_buffer)
+        # Extract any WAV files this chunk completed
+        wav_files = framer.feed(chunk)
         new_wavs = len(wav_files)
         if new_wavs > 0:
             wav_count += new_wavs
+            for wav_data in wav_files:
+                print(f"📦 Extracted WAV: {len(wav_data)} bytes")
             print(f"🎵 Extracted {new_wavs} new WAV file(s)! Total: {wav_count}")
         
         # Progress every 100 chunks
         if chunk_count % 100 == 0:
-            print(f"\n📊 Progress: {chunk_count} chunks, {wav_count} WAVs extracted, buffer: {len(audio_buffer)} bytes")
+            print(f"\n📊 Progress: {chunk_count} chunks, {wav_count} WAVs extracted, buffer: {framer.buffered_bytes} bytes")
     
     try:
         # Process the entire stream without cancelling
@@ -114,7 +68,8 @@ async def test_extraction():
     print(f"FINAL RESULTS:")
     print(f"  Total chunks processed: {chunk_count}")
     print(f"  Total WAV files extracted: {wav_count}")
-    print(f"  Remaining buffer: {len(audio_buffer)} bytes")
+    print(f"  Remaining buffer: {framer.buffered_bytes} bytes")
+    print(f"  Skipped garbage: {framer.skipped_bytes} bytes")
     
     if wav_count > 0:
         print("WAV extraction completed successfully!")
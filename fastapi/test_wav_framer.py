@@ -0,0 +1,109 @@
+"""
+Test the incremental WAV framer: headers split across chunk boundaries,
+several WAVs in one chunk, garbage before a header, bogus RIFF lengths and a
+truncated file at the end of the stream.
+
+Usage:
+    python test_wav_framer.py
+"""
+import io
+import struct
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "app"))
+
+from app.modules.wav_framer import WavFramer
+
+
+def make_wav(n_frames: int, seed: int) -> bytes:
+    samples = np.random.default_rng(seed).integers(-2000, 2000, n_frames, dtype=np.int16)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+WAVS = [make_wav(n, seed) for seed, n in enumerate([400, 37, 1200])]
+STREAM = b"".join(WAVS)
+
+
+def feed_in_chunks(framer: WavFramer, data: bytes, size: int) -> list:
+    frames = []
+    for start in range(0, len(data), size):
+        frames += [bytes(f) for f in framer.feed(data[start:start + size])]
+    return frames
+
+
+def check(label: str, passed: bool):
+    print(f"{'✓' if passed else '✗'} {label}")
+    assert passed, label
+
+
+def test_headers_split_across_chunks():
+    sizes = list(range(1, 50)) + [61, 97, 1000, 4096]
+    bad = [size for size in sizes if feed_in_chunks(WavFramer(compact_threshold=64), STREAM, size) != WAVS]
+    check(f"same frames for {len(sizes)} chunk sizes (headers split at every offset)", not bad)
+
+    # Split exactly inside the "RIFF" tag and inside the size field
+    framer = WavFramer()
+    cut = len(WAVS[0])
+    frames = []
+    for part in (STREAM[:cut + 2], STREAM[cut + 2:cut + 6], STREAM[cut + 6:]):
+        frames += [bytes(f) for f in framer.feed(part)]
+    check("header split inside RIFF tag and size field", frames == WAVS and framer.buffered_bytes == 0)
+
+
+def test_several_wavs_in_one_chunk():
+    framer = WavFramer()
+    frames = [bytes(f) for f in framer.feed(STREAM)]
+    check("three WAVs from one chunk", frames == WAVS and framer.frames_extracted == 3)
+
+
+def test_garbage_before_header():
+    garbage = b"\x00\x01junkRIFF\xff\xff" + b"RIF" + b"zz" * 10
+    framer = WavFramer()
+    frames = feed_in_chunks(framer, garbage + STREAM, 7)
+    check(f"garbage (incl. a stray RIFF) skipped ({framer.skipped_bytes} bytes)",
+          frames == WAVS and framer.skipped_bytes == len(garbage))
+
+
+def test_bogus_riff_lengths():
+    oversized = b"RIFF" + struct.pack("<I", 2 ** 32 - 1) + b"WAVEfmt "
+    undersized = b"RIFF" + struct.pack("<I", 4) + b"WAVE"
+    not_wave = b"RIFF" + struct.pack("<I", 100) + b"AVI "
+    framer = WavFramer(max_wav_bytes=64 * 1024)
+    frames = feed_in_chunks(framer, oversized + undersized + not_wave + STREAM, 5)
+    check("oversized, undersized and non-WAVE headers skipped, later WAVs kept", frames == WAVS)
+    check("nothing held back waiting on a bogus length", framer.buffered_bytes == 0)
+
+
+def test_truncated_trailing_file():
+    cut = len(STREAM) - len(WAVS[-1]) // 2
+    framer = WavFramer()
+    frames = feed_in_chunks(framer, STREAM[:cut], 256)
+    check("complete WAVs emitted, truncated last one held",
+          frames == WAVS[:-1] and framer.buffered_bytes == cut - len(WAVS[0]) - len(WAVS[1]))
+
+    frames = [bytes(f) for f in framer.feed(STREAM[cut:])]
+    check("truncated file completes if the rest arrives", frames == WAVS[-1:] and framer.buffered_bytes == 0)
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("WAV FRAMER")
+    print("=" * 60)
+    test_headers_split_across_chunks()
+    test_several_wavs_in_one_chunk()
+    test_garbage_before_header()
+    test_bogus_riff_lengths()
+    test_truncated_trailing_file()
+
+    print("=" * 60)
+    print("ALL PASSED")
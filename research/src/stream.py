@@ -109,11 +109,12 @@ def parse_timestamp_from_filename(filename: str) -> float:
 
 
 @app.get("/stream/audio")
-async def stream_audio(speed: float = 1.0):
+async def stream_audio(speed: float = 1.0, start_segment: int = 0):
     """
     Stream audio segments with timing synchronization and speed control.
     
     speed: Playback speed multiplier (1.0 = real-time, 2.0 = 2x speed, etc.)
+    start_segment: Index of the first segment to send (to resume a stream)
     """
     AUDIO_SEGMENTS_DIR = DATA_DIR / "audio_segments"
     
@@ -131,12 +132,13 @@ async def stream_audio(speed: float = 1.0):
                 'name': file_path.name
             })
     
-    # Sort by timestamp
-    files_list.sort(key=lambda x: x['timestamp'])
-    
     if not files_list:
         return Response(content="No audio files found in segments directory", status_code=404)
     
+    # Sort by timestamp; resuming past the last segment yields an empty stream
+    files_list.sort(key=lambda x: x['timestamp'])
+    files_list = files_list[max(0, start_segment):]
+    
     async def iterfile():
         if not files_list:
             return
@@ -180,12 +182,16 @@ async def stream_events(
     q3_end: float = 5381,
     q4_start: float = 5391,
     q4_end: float = 7251,
-    speed: float = 1.0
+    speed: float = 1.0,
+    start_index: int = 0,
+    start_time: float = 0.0
 ):
     """
     Stream play-by-play events synchronized with audio timestamps.
     
     speed: Playback speed multiplier (1.0 = real-time, 2.0 = 2x speed, etc.)
+    start_index: Index of the first play to send (to resume a stream)
+    start_time: Audio time the stream starts at; pacing counts from here
     """
     if not PLAY_BY_PLAY_FILE.exists():
         return Response(content="Play-by-play file not found", status_code=404)
@@ -196,9 +202,9 @@ async def stream_events(
         try:
             processed_plays = process_plays_with_audio_sync(intervals)
             
-            last_timestamp = 0.0
+            last_timestamp = start_time
             
-            for play in processed_plays:
+            for play in processed_plays[max(0, start_index):]:
                 current_timestamp = play['absoluteAudioTimestamp']
                 delay = (current_timestamp - last_timestamp) / speed
                 